@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+
+# Budgets checked with --check (seconds)
+BUDGETS = {
+    'time_to_first_step': 0.300,
+}
+
+def run_probe(code):
+    """Run a measurement in a fresh interpreter and return the JSON it prints.
+
+    Startup costs (imports, config parsing) only show up in a new process,
+    so every probe gets its own interpreter with src on the path and the
+    headless SDL driver.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    script = f"import sys, time\nstart = time.perf_counter()\nsys.path.insert(0, {SRC!r})\n" + textwrap.dedent(code)
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark_import_time():
+    """Time to import the simulation and koi modules."""
+    return run_probe("""
+        import simulation
+        print('{"seconds": %f}' % (time.perf_counter() - start))
+    """)['seconds']
+
+def benchmark_time_to_first_step():
+    """Time from interpreter start to the end of the first headless simulation step."""
+    return run_probe("""
+        import contextlib, io
+        from config_cache import load_neat_config, load_sim_config
+        from simulation import Simulation
+        import neat
+
+        sim_config = load_sim_config('config/simulation-config.json')
+        sim_config.update(render=False, video_dir=None, telemetry_dir=None,
+                          history_file=None, simulation_steps=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            config = load_neat_config('config/neat-config.ini')
+            simulation = Simulation(config, sim_config)
+            population = neat.Population(config)
+            simulation.population = population
+            simulation.eval_genomes(list(population.population.items()), config)
+        elapsed = time.perf_counter() - start
+        simulation.cleanup()
+        print('{"seconds": %f}' % elapsed)
+    """)['seconds']
+
+def benchmark_gc(mode):
+    """Garbage collection during a headless 100-step episode under a gc_mode (see gc_policy.py).
+
+    Reports the episode time, the total GC pause during it and the full
+    collection made between generations.
+    """
+    return run_probe(f"""
+        import contextlib, io
+        from config_cache import load_neat_config, load_sim_config
+        from simulation import Simulation
+        import neat
+
+        sim_config = load_sim_config('config/simulation-config.json')
+        sim_config.update(render=False, video_dir=None, telemetry_dir=None,
+                          history_file=None, simulation_steps=100, gc_mode={mode!r})
+        with contextlib.redirect_stdout(io.StringIO()):
+            config = load_neat_config('config/neat-config.ini')
+            simulation = Simulation(config, sim_config)
+            population = neat.Population(config)
+            simulation.population = population
+            policy = simulation.gc_policy
+            policy.startup()
+            policy.summary()
+            episode_start = time.perf_counter()
+            simulation.eval_genomes(list(population.population.items()), config)
+            episode = time.perf_counter() - episode_start
+            pauses = policy.summary()
+            between_generations = policy.collect()
+            simulation.cleanup()
+        print('{{"episode": %f, "gc_pause": %f, "between_generations": %f}}'
+              % (episode, pauses['total_pause'], between_generations))
+    """)
+
+BENCHMARKS = {
+    'import_time': benchmark_import_time,
+    'time_to_first_step': benchmark_time_to_first_step,
+    'gc_default': lambda: benchmark_gc('default'),
+    'gc_tuned': lambda: benchmark_gc('tuned'),
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the koi pond performance benchmarks")
+    parser.add_argument('names', nargs='*', help="Benchmarks to run (all by default)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark, the best is reported")
+    parser.add_argument('--check', action='store_true', help="Exit non-zero when a budget is exceeded")
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.names or list(BENCHMARKS):
+        # A benchmark returns seconds, or a dictionary of named timings
+        runs = [BENCHMARKS[name]() for _ in range(args.repeat)]
+        if isinstance(runs[0], dict):
+            results = {f"{name}.{metric}": min(run[metric] for run in runs) for metric in runs[0]}
+        else:
+            results = {name: min(runs)}
+        for label, best in results.items():
+            budget = BUDGETS.get(label)
+            status = ''
+            if budget is not None:
+                over = best > budget
+                failed |= over
+                status = f" (budget {budget * 1000:.0f} ms{', EXCEEDED' if over else ''})"
+            print(f"{label:32s} {best * 1000:8.1f} ms{status}")
+
+    sys.exit(1 if args.check and failed else 0)
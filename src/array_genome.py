@@ -0,0 +1,445 @@
+import random
+import struct
+
+import numpy as np
+from neat.genome import DefaultGenome
+from neat.graphs import creates_cycle, feed_forward_layers
+from neat.nn import FeedForwardNetwork
+
+from reproduction import AttributeMutator, mutate_structure
+
+# Node and connection genes as parallel arrays: (attribute, dtype)
+NODE_FIELDS = (('node_keys', np.int32), ('biases', np.float32), ('responses', np.float32),
+               ('activations', np.uint8), ('aggregations', np.uint8))
+CONN_FIELDS = (('conn_in', np.int32), ('conn_out', np.int32), ('weights', np.float32),
+               ('enabled', np.bool_))
+
+# to_bytes header: magic, version, key, fitness (NaN for None), node count, connection count
+_HEADER = struct.Struct('<4sHqdII')
+_MAGIC = b'KGEN'
+_VERSION = 1
+
+# Connection keys (in, out) are packed into one int64 that sorts like the tuple
+_KEY_OFFSET = 1 << 30
+
+
+def pack_connection_keys(conn_in, conn_out):
+    """Return the int64 keys of (in, out) connection pairs."""
+    return ((conn_in.astype(np.int64) + _KEY_OFFSET) << 32) | (conn_out.astype(np.int64) + _KEY_OFFSET)
+
+
+def _option_id(options, name):
+    try:
+        return options.index(name)
+    except ValueError:
+        raise ValueError(f"'{name}' is not one of the configured options {options}") from None
+
+
+class ArrayGenome:
+    """A NEAT genome that keeps its genes in parallel typed arrays.
+
+    Node genes are node_keys, biases, responses and the activation and
+    aggregation functions as indices into the config's options; connection
+    genes are conn_in, conn_out, weights and enabled. Both are kept sorted
+    by key. A genome is a dozen small numpy arrays instead of a dict of gene
+    objects per gene, so copying, pickling and holding tens of thousands of
+    genomes is cheap.
+
+    It implements the DefaultGenome interface neat.Population, the
+    reproduction classes and the species sets use (configure_new,
+    configure_crossover, mutate, distance, size and the structural
+    mutations) and reads the [DefaultGenome] config section. Code written
+    against DefaultGenome's gene dictionaries can use node_genes,
+    connection_genes or to_genome. feed_forward_network builds the network
+    straight from the arrays.
+    """
+
+    __slots__ = ('key', 'fitness') + tuple(name for name, _ in NODE_FIELDS + CONN_FIELDS)
+
+    def __init__(self, key):
+        self.key = key
+        self.fitness = None
+        for name, dtype in NODE_FIELDS + CONN_FIELDS:
+            setattr(self, name, np.empty(0, dtype=dtype))
+
+    @classmethod
+    def parse_config(cls, param_dict):
+        return DefaultGenome.parse_config(param_dict)
+
+    @classmethod
+    def write_config(cls, f, config):
+        DefaultGenome.write_config(f, config)
+
+    # Conversion
+
+    @classmethod
+    def from_genome(cls, genome, config):
+        """Build an ArrayGenome from a DefaultGenome (or anything with nodes/connections dicts)."""
+        array_genome = cls(genome.key)
+        array_genome.fitness = genome.fitness
+        nodes = sorted(genome.nodes.items())
+        connections = sorted(genome.connections.items())
+        array_genome.node_keys = np.array([key for key, _ in nodes], dtype=np.int32)
+        array_genome.biases = np.array([node.bias for _, node in nodes], dtype=np.float32)
+        array_genome.responses = np.array([node.response for _, node in nodes], dtype=np.float32)
+        array_genome.activations = np.array([_option_id(config.activation_options, node.activation)
+                                             for _, node in nodes], dtype=np.uint8)
+        array_genome.aggregations = np.array([_option_id(config.aggregation_options, node.aggregation)
+                                              for _, node in nodes], dtype=np.uint8)
+        array_genome.conn_in = np.array([key[0] for key, _ in connections], dtype=np.int32)
+        array_genome.conn_out = np.array([key[1] for key, _ in connections], dtype=np.int32)
+        array_genome.weights = np.array([conn.weight for _, conn in connections], dtype=np.float32)
+        array_genome.enabled = np.array([conn.enabled for _, conn in connections], dtype=np.bool_)
+        return array_genome
+
+    def to_genome(self, config):
+        """Return an equivalent DefaultGenome."""
+        genome = DefaultGenome(self.key)
+        genome.fitness = self.fitness
+        genome.nodes = self.node_genes(config)
+        genome.connections = self.connection_genes(config)
+        return genome
+
+    def node_genes(self, config):
+        """Return the node genes as a {key: DefaultNodeGene} dictionary (a copy)."""
+        genes = {}
+        for key, bias, response, activation, aggregation in zip(
+                self.node_keys.tolist(), self.biases.tolist(), self.responses.tolist(),
+                self.activations.tolist(), self.aggregations.tolist()):
+            gene = config.node_gene_type(key)
+            gene.bias = bias
+            gene.response = response
+            gene.activation = config.activation_options[activation]
+            gene.aggregation = config.aggregation_options[aggregation]
+            genes[key] = gene
+        return genes
+
+    def connection_genes(self, config):
+        """Return the connection genes as a {(in, out): DefaultConnectionGene} dictionary (a copy)."""
+        genes = {}
+        for i, o, weight, enabled in zip(self.conn_in.tolist(), self.conn_out.tolist(),
+                                         self.weights.tolist(), self.enabled.tolist()):
+            gene = config.connection_gene_type((i, o))
+            gene.weight = weight
+            gene.enabled = enabled
+            genes[(i, o)] = gene
+        return genes
+
+    def connection_keys(self):
+        """Return the packed int64 connection keys, sorted."""
+        return pack_connection_keys(self.conn_in, self.conn_out)
+
+    # Construction
+
+    def configure_new(self, config):
+        """Configure a new genome based on the given configuration."""
+        genome = DefaultGenome(self.key)
+        genome.configure_new(config)
+        self._copy_from(ArrayGenome.from_genome(genome, config))
+
+    def _copy_from(self, other):
+        for name, _ in NODE_FIELDS + CONN_FIELDS:
+            setattr(self, name, getattr(other, name))
+
+    def configure_crossover(self, genome1, genome2, config):
+        """Configure a new genome by crossover from two parent genomes.
+
+        Genes of the fitter parent are inherited; each attribute of a gene
+        both parents share comes from either parent with equal chance.
+        """
+        assert isinstance(genome1.fitness, (int, float))
+        assert isinstance(genome2.fitness, (int, float))
+        if genome1.fitness > genome2.fitness:
+            parent1, parent2 = genome1, genome2
+        else:
+            parent1, parent2 = genome2, genome1
+
+        rng = np.random.default_rng(random.getrandbits(64))
+
+        def inherit(keys1, keys2, fields):
+            positions, matched = _match(keys2, keys1)
+            for name, _ in fields:
+                values = getattr(parent1, name).copy()
+                take = matched & (rng.random(len(values)) <= 0.5)
+                values[take] = getattr(parent2, name)[positions[take]]
+                setattr(self, name, values)
+
+        inherit(parent1.node_keys, parent2.node_keys, NODE_FIELDS[1:])
+        self.node_keys = parent1.node_keys.copy()
+        inherit(parent1.connection_keys(), parent2.connection_keys(), CONN_FIELDS[2:])
+        self.conn_in = parent1.conn_in.copy()
+        self.conn_out = parent1.conn_out.copy()
+
+    # Mutation
+
+    def mutate(self, config):
+        """Mutate this genome: structure first, then the gene attributes."""
+        mutate_structure(self, config)
+        self.mutate_attributes([self], config, np.random.default_rng(random.getrandbits(64)))
+
+    @classmethod
+    def mutate_attributes(cls, genomes, config, rng):
+        """Mutate the gene attributes of many genomes with one batch of draws per attribute.
+
+        Args:
+            genomes: ArrayGenomes mutated in place
+            config: The genome config
+            rng: numpy Generator
+        """
+        if not genomes:
+            return
+        mutators = {attribute.name: AttributeMutator(attribute, config)
+                    for gene_type in (config.node_gene_type, config.connection_gene_type)
+                    for attribute in gene_type._gene_attributes}
+
+        def batch(name, dtype, mutate):
+            parts = [getattr(genome, name) for genome in genomes]
+            bounds = np.cumsum([len(part) for part in parts])[:-1]
+            values = mutate(np.concatenate(parts).astype(dtype))
+            for genome, part in zip(genomes, np.split(values, bounds)):
+                setattr(genome, name, part.astype(getattr(genome, name).dtype))
+
+        def floats(attribute):
+            return lambda values: mutators[attribute].mutate_floats(values, rng)[0]
+
+        def options(attribute):
+            def draw(values):
+                changed, picks = mutators[attribute].draw_options(len(values), rng)
+                values[changed] = picks
+                return values
+            return draw
+
+        batch('biases', np.float64, floats('bias'))
+        batch('responses', np.float64, floats('response'))
+        batch('activations', np.int64, options('activation'))
+        batch('aggregations', np.int64, options('aggregation'))
+        batch('weights', np.float64, floats('weight'))
+        batch('enabled', np.bool_, lambda values: mutators['enabled'].mutate_bools(values, rng)[0])
+
+    def _insert_node(self, config, node_key):
+        gene = config.node_gene_type(node_key)
+        gene.init_attributes(config)
+        position = int(np.searchsorted(self.node_keys, node_key))
+        self.node_keys = np.insert(self.node_keys, position, node_key)
+        self.biases = np.insert(self.biases, position, gene.bias)
+        self.responses = np.insert(self.responses, position, gene.response)
+        self.activations = np.insert(self.activations, position, _option_id(config.activation_options, gene.activation))
+        self.aggregations = np.insert(self.aggregations, position, _option_id(config.aggregation_options, gene.aggregation))
+
+    def _connection_index(self, input_key, output_key):
+        keys = self.connection_keys()
+        key = pack_connection_keys(np.array([input_key]), np.array([output_key]))[0]
+        position = int(np.searchsorted(keys, key))
+        found = position < len(keys) and keys[position] == key
+        return position, found
+
+    def add_connection(self, config, input_key, output_key, weight, enabled):
+        """Add (or replace) the connection input_key -> output_key."""
+        assert isinstance(input_key, int)
+        assert isinstance(output_key, int)
+        assert output_key >= 0
+        assert isinstance(enabled, bool)
+        position, found = self._connection_index(input_key, output_key)
+        if found:
+            self.weights[position] = weight
+            self.enabled[position] = enabled
+            return
+        self.conn_in = np.insert(self.conn_in, position, input_key)
+        self.conn_out = np.insert(self.conn_out, position, output_key)
+        self.weights = np.insert(self.weights, position, weight)
+        self.enabled = np.insert(self.enabled, position, enabled)
+
+    def mutate_add_node(self, config):
+        if not len(self.conn_in):
+            if config.check_structural_mutation_surer():
+                self.mutate_add_connection(config)
+            return
+
+        # Split a random connection with a new node
+        index = random.randrange(len(self.conn_in))
+        new_node_id = config.get_new_node_key(dict.fromkeys(self.node_keys.tolist()))
+        self._insert_node(config, new_node_id)
+
+        i, o = int(self.conn_in[index]), int(self.conn_out[index])
+        weight = float(self.weights[index])
+        self.enabled[index] = False
+        self.add_connection(config, i, new_node_id, 1.0, True)
+        self.add_connection(config, new_node_id, o, weight, True)
+
+    def mutate_add_connection(self, config):
+        possible_outputs = self.node_keys.tolist()
+        out_node = random.choice(possible_outputs)
+        in_node = random.choice(possible_outputs + config.input_keys)
+
+        # Don't duplicate connections
+        position, found = self._connection_index(in_node, out_node)
+        if found:
+            if config.check_structural_mutation_surer():
+                self.enabled[position] = True
+            return
+
+        # Don't allow connections between two output nodes
+        if in_node in config.output_keys and out_node in config.output_keys:
+            return
+
+        # For feed-forward networks, avoid creating cycles
+        key = (in_node, out_node)
+        if config.feed_forward and creates_cycle(list(zip(self.conn_in.tolist(), self.conn_out.tolist())), key):
+            return
+
+        gene = config.connection_gene_type(key)
+        gene.init_attributes(config)
+        self.add_connection(config, in_node, out_node, float(gene.weight), bool(gene.enabled))
+
+    def mutate_delete_node(self, config):
+        available_nodes = [k for k in self.node_keys.tolist() if k not in config.output_keys]
+        if not available_nodes:
+            return -1
+
+        del_key = random.choice(available_nodes)
+        keep = (self.conn_in != del_key) & (self.conn_out != del_key)
+        for name, _ in CONN_FIELDS:
+            setattr(self, name, getattr(self, name)[keep])
+        keep = self.node_keys != del_key
+        for name, _ in NODE_FIELDS:
+            setattr(self, name, getattr(self, name)[keep])
+        return del_key
+
+    def mutate_delete_connection(self):
+        if len(self.conn_in):
+            index = random.randrange(len(self.conn_in))
+            for name, _ in CONN_FIELDS:
+                setattr(self, name, np.delete(getattr(self, name), index))
+
+    # Comparison
+
+    def distance(self, other, config):
+        """Return the genetic distance to other, computed as DefaultGenome.distance does."""
+        node_distance = 0.0
+        if len(self.node_keys) or len(other.node_keys):
+            positions, matched = _match(other.node_keys, self.node_keys)
+            theirs = positions[matched]
+            homologous = (np.abs(self.biases[matched].astype(np.float64) - other.biases[theirs]) +
+                          np.abs(self.responses[matched].astype(np.float64) - other.responses[theirs]) +
+                          (self.activations[matched] != other.activations[theirs]) +
+                          (self.aggregations[matched] != other.aggregations[theirs])).sum()
+            matches = int(matched.sum())
+            disjoint = len(self.node_keys) + len(other.node_keys) - 2 * matches
+            node_distance = (homologous * config.compatibility_weight_coefficient +
+                             config.compatibility_disjoint_coefficient * disjoint) / max(len(self.node_keys), len(other.node_keys))
+
+        connection_distance = 0.0
+        if len(self.conn_in) or len(other.conn_in):
+            positions, matched = _match(other.connection_keys(), self.connection_keys())
+            theirs = positions[matched]
+            homologous = (np.abs(self.weights[matched].astype(np.float64) - other.weights[theirs]) +
+                          (self.enabled[matched] != other.enabled[theirs])).sum()
+            matches = int(matched.sum())
+            disjoint = len(self.conn_in) + len(other.conn_in) - 2 * matches
+            connection_distance = (homologous * config.compatibility_weight_coefficient +
+                                   config.compatibility_disjoint_coefficient * disjoint) / max(len(self.conn_in), len(other.conn_in))
+
+        return float(node_distance + connection_distance)
+
+    def size(self):
+        """Return (number of nodes, number of enabled connections)."""
+        return len(self.node_keys), int(self.enabled.sum())
+
+    def __str__(self):
+        lines = [f"Key: {self.key}", f"Fitness: {self.fitness}", "Nodes:"]
+        for key, bias, response, activation, aggregation in zip(
+                self.node_keys.tolist(), self.biases.tolist(), self.responses.tolist(),
+                self.activations.tolist(), self.aggregations.tolist()):
+            lines.append(f"\t{key} bias={bias:.4f} response={response:.4f} "
+                         f"activation={activation} aggregation={aggregation}")
+        lines.append("Connections:")
+        for i, o, weight, enabled in zip(self.conn_in.tolist(), self.conn_out.tolist(),
+                                         self.weights.tolist(), self.enabled.tolist()):
+            lines.append(f"\t({i}, {o}) weight={weight:.4f} enabled={enabled}")
+        return "\n".join(lines)
+
+    # Networks
+
+    def feed_forward_network(self, config):
+        """Build a neat FeedForwardNetwork straight from the arrays.
+
+        Args:
+            config: The neat.Config (its genome_config supplies the functions)
+        """
+        genome_config = config.genome_config
+        enabled = self.enabled
+        conn_in = self.conn_in[enabled].tolist()
+        conn_out = self.conn_out[enabled].tolist()
+        weights = self.weights[enabled].tolist()
+        connections = list(zip(conn_in, conn_out))
+
+        incoming = {}
+        for i, o, weight in zip(conn_in, conn_out, weights):
+            incoming.setdefault(o, []).append((i, weight))
+
+        index_of = {key: index for index, key in enumerate(self.node_keys.tolist())}
+        biases, responses = self.biases.tolist(), self.responses.tolist()
+        activations, aggregations = self.activations.tolist(), self.aggregations.tolist()
+
+        node_evals = []
+        for layer in feed_forward_layers(genome_config.input_keys, genome_config.output_keys, connections):
+            for node in layer:
+                index = index_of[node]
+                activation = genome_config.activation_defs.get(genome_config.activation_options[activations[index]])
+                aggregation = genome_config.aggregation_function_defs.get(genome_config.aggregation_options[aggregations[index]])
+                node_evals.append((node, activation, aggregation, biases[index], responses[index], incoming.get(node, [])))
+        return FeedForwardNetwork(genome_config.input_keys, genome_config.output_keys, node_evals)
+
+    # Serialization
+
+    def to_bytes(self):
+        """Return the genome as a compact byte string (see from_bytes)."""
+        fitness = float('nan') if self.fitness is None else float(self.fitness)
+        parts = [_HEADER.pack(_MAGIC, _VERSION, self.key, fitness, len(self.node_keys), len(self.conn_in))]
+        for name, dtype in NODE_FIELDS + CONN_FIELDS:
+            parts.append(np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuild a genome written by to_bytes.
+
+        Raises:
+            ValueError: If data is not an ArrayGenome of a supported version
+        """
+        magic, version, key, fitness, num_nodes, num_connections = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not an ArrayGenome byte string")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported ArrayGenome version {version}")
+        genome = cls(key)
+        genome.fitness = None if fitness != fitness else fitness
+        offset = _HEADER.size
+        for fields, count in ((NODE_FIELDS, num_nodes), (CONN_FIELDS, num_connections)):
+            for name, dtype in fields:
+                values = np.frombuffer(data, dtype=dtype, count=count, offset=offset).copy()
+                offset += values.nbytes
+                setattr(genome, name, values)
+        return genome
+
+    def __reduce__(self):
+        return (ArrayGenome.from_bytes, (self.to_bytes(),))
+
+    def __copy__(self):
+        return self.__deepcopy__()
+
+    def __deepcopy__(self, memo=None):
+        genome = ArrayGenome(self.key)
+        genome.fitness = self.fitness
+        for name, _ in NODE_FIELDS + CONN_FIELDS:
+            setattr(genome, name, getattr(self, name).copy())
+        return genome
+
+
+def _match(keys, query):
+    """Return (positions in sorted keys, mask of query entries present in keys)."""
+    if not len(keys):
+        return np.zeros(len(query), dtype=np.int64), np.zeros(len(query), dtype=bool)
+    positions = np.searchsorted(keys, query)
+    positions[positions == len(keys)] = 0
+    return positions, keys[positions] == query
@@ -0,0 +1,89 @@
+class Camera:
+    """Pan/zoom view of a pond that may be larger than the window.
+
+    The camera maps world coordinates to pixels of a viewport_width x
+    viewport_height viewport: screen = (world - origin) * zoom. The origin is
+    the world position shown at the top-left corner of the viewport.
+    """
+
+    def __init__(self, viewport_width, viewport_height, world_width, world_height,
+                 min_zoom=None, max_zoom=4.0):
+        """Create a camera that initially shows the whole world.
+
+        Args:
+            viewport_width: Width of the drawing area in pixels
+            viewport_height: Height of the drawing area in pixels
+            world_width: Pond width in world units
+            world_height: Pond height in world units
+            min_zoom: Smallest zoom allowed (defaults to fitting the whole pond)
+            max_zoom: Largest zoom allowed
+        """
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+        self.world_width = world_width
+        self.world_height = world_height
+
+        fit_zoom = min(viewport_width / world_width, viewport_height / world_height)
+        self.min_zoom = fit_zoom if min_zoom is None else min_zoom
+        self.max_zoom = max(max_zoom, self.min_zoom)
+        self.zoom = fit_zoom
+        self.x = 0.0
+        self.y = 0.0
+        self.clamp()
+
+    def world_to_screen(self, position):
+        """Convert a world position to viewport pixels."""
+        return ((position[0] - self.x) * self.zoom, (position[1] - self.y) * self.zoom)
+
+    def screen_to_world(self, position):
+        """Convert viewport pixels to a world position."""
+        return (position[0] / self.zoom + self.x, position[1] / self.zoom + self.y)
+
+    def visible_rect(self, margin=0):
+        """Return the (left, top, right, bottom) world rectangle on screen.
+
+        Args:
+            margin: Extra world units around the view, so objects whose centre
+                is just off screen but whose body is visible are not culled
+        """
+        return (
+            self.x - margin,
+            self.y - margin,
+            self.x + self.viewport_width / self.zoom + margin,
+            self.y + self.viewport_height / self.zoom + margin
+        )
+
+    def pan(self, dx, dy):
+        """Move the view by dx, dy viewport pixels."""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, screen_position=None):
+        """Zoom by factor while keeping the world point under screen_position fixed."""
+        if screen_position is None:
+            screen_position = (self.viewport_width / 2, self.viewport_height / 2)
+        anchor = self.screen_to_world(screen_position)
+        self.zoom = max(self.min_zoom, min(self.max_zoom, self.zoom * factor))
+        self.x = anchor[0] - screen_position[0] / self.zoom
+        self.y = anchor[1] - screen_position[1] / self.zoom
+        self.clamp()
+
+    def center_on(self, position):
+        """Centre the view on a world position."""
+        self.x = position[0] - self.viewport_width / (2 * self.zoom)
+        self.y = position[1] - self.viewport_height / (2 * self.zoom)
+        self.clamp()
+
+    def clamp(self):
+        """Keep the view inside the world, centring it when the world is smaller."""
+        view_width = self.viewport_width / self.zoom
+        view_height = self.viewport_height / self.zoom
+        if view_width >= self.world_width:
+            self.x = (self.world_width - view_width) / 2
+        else:
+            self.x = max(0.0, min(self.world_width - view_width, self.x))
+        if view_height >= self.world_height:
+            self.y = (self.world_height - view_height) / 2
+        else:
+            self.y = max(0.0, min(self.world_height - view_height, self.y))
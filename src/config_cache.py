@@ -0,0 +1,74 @@
+import copy
+import json
+import os
+
+# Parsed configuration files keyed by absolute path, validated against the
+# file's modification time and size so an edited file is parsed again
+_cache = {}
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _cached(path, kind, parse):
+    path = os.path.abspath(path)
+    key = _file_key(path)
+    entry = _cache.get((kind, path))
+    if entry is None or entry[0] != key:
+        entry = (key, parse(path))
+        _cache[(kind, path)] = entry
+    return entry[1]
+
+
+def _parse_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_sim_config(path):
+    """Return the simulation configuration stored at path.
+
+    The file is parsed once per process (and again when it changes). Each
+    caller gets its own copy, since the simulation fills in defaults.
+
+    Args:
+        path: Path of the simulation-config.json file
+
+    Returns:
+        A fresh dictionary of simulation settings
+    """
+    return copy.deepcopy(_cached(path, 'json', _parse_json))
+
+
+def load_neat_config(path):
+    """Return the NEAT configuration stored at path, built with the default NEAT classes.
+
+    The file is parsed once per process (and again when it changes). Each
+    caller gets its own copy: evolution advances the genome config's node
+    indexer, and a Simulation sets the species set, reproduction and genome
+    classes on its config. The [KoiSensors] settings are attached as
+    config.koi_sensors.
+
+    Args:
+        path: Path of the neat-config.ini file
+
+    Returns:
+        A neat.Config instance
+    """
+    def parse(path):
+        import neat
+        from sensors import load_sensor_config
+        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             path)
+        # Koi sensor settings share the file, see sensors.load_sensor_config
+        config.koi_sensors = load_sensor_config(path, config)
+        return config
+    return copy.deepcopy(_cached(path, 'neat', parse))
+
+
+def clear():
+    """Forget every cached configuration."""
+    _cache.clear()
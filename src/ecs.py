@@ -0,0 +1,224 @@
+# The phases of a pond step, in the order their systems run
+PHASES = ('sense', 'think', 'act', 'eat', 'metabolize', 'score')
+
+# Handles pack a slot number and the slot's generation into one int
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class EntityRegistry:
+    """Entities stored as dense rows of component columns.
+
+    Rows are kept contiguous: despawning moves the last row into the gap,
+    so removal is O(1) and systems can iterate columns without skipping
+    holes. Row numbers therefore change when entities are removed; a
+    handle stays valid for the entity's whole life. A handle packs a slot
+    with that slot's generation, and the generation is bumped when the
+    slot is reused, so a stale handle is never mistaken for a newer entity.
+
+    Columns are plain Python lists. The simulation keeps the Koi objects
+    in one of them, and their state stays on the objects, so systems still
+    loop over rows rather than operate on whole arrays.
+
+    Despawning is deferred. despawn() only marks the entity, and the rows
+    are removed by flush(), normally at the end of a step. Systems can
+    therefore despawn while iterating a column. Systems that run later in
+    the step should skip marked rows (see live() and is_despawning()).
+    """
+
+    def __init__(self, components=()):
+        """Declare the components.
+
+        Args:
+            components: Names of the components, each stored as a list
+        """
+        self._columns = {name: [] for name in components}
+        self._count = 0
+        self._row_handles = []  # row -> handle
+        self._slot_rows = []  # slot -> row, or -1 when free
+        self._generations = []  # slot -> current generation
+        self._free_slots = []
+        self._dying = []  # row -> marked for despawn
+        self._pending = []  # rows marked for despawn
+        self.on_despawn = []  # Callbacks (registry, row) run by flush before a row is removed
+
+    def __len__(self):
+        return self._count
+
+    def spawn(self, **components):
+        """Add an entity and return its handle.
+
+        Components that are not given start as None.
+
+        Raises:
+            KeyError: If a component was not declared
+        """
+        for name in components:
+            if name not in self._columns:
+                raise KeyError(f"Unknown component '{name}'")
+
+        row = self._count
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._generations[slot] += 1
+            self._slot_rows[slot] = row
+        else:
+            slot = len(self._slot_rows)
+            self._generations.append(0)
+            self._slot_rows.append(row)
+        handle = (self._generations[slot] << SLOT_BITS) | slot
+
+        for name, column in self._columns.items():
+            column.append(components.get(name))
+        self._row_handles.append(handle)
+        self._dying.append(False)
+        self._count += 1
+        return handle
+
+    def is_alive(self, handle):
+        """Return True if handle refers to an entity that has not been removed yet."""
+        slot = handle & SLOT_MASK
+        return (slot < len(self._slot_rows) and self._slot_rows[slot] >= 0
+                and self._generations[slot] == handle >> SLOT_BITS)
+
+    def row(self, handle):
+        """Return the current row of an entity.
+
+        Raises:
+            KeyError: If the handle is stale
+        """
+        if not self.is_alive(handle):
+            raise KeyError(f"Entity {handle} does not exist")
+        return self._slot_rows[handle & SLOT_MASK]
+
+    def handle(self, row):
+        """Return the handle of the entity in a row."""
+        return self._row_handles[row]
+
+    def handles(self):
+        """Return the handles of every entity, in row order."""
+        return list(self._row_handles)
+
+    def column(self, name):
+        """Return a component column.
+
+        Columns are the registry's own lists, so they stay current as
+        entities come and go.
+        """
+        if name not in self._columns:
+            raise KeyError(f"Unknown component '{name}'")
+        return self._columns[name]
+
+    def get(self, handle, name):
+        """Return one component of an entity."""
+        return self.column(name)[self.row(handle)]
+
+    def set(self, handle, name, value):
+        """Replace one component of an entity."""
+        self.column(name)[self.row(handle)] = value
+
+    def despawn(self, handle):
+        """Mark an entity for removal at the next flush; stale handles are ignored."""
+        if self.is_alive(handle):
+            self.despawn_row(self._slot_rows[handle & SLOT_MASK])
+
+    def despawn_row(self, row):
+        """Mark the entity in a row for removal at the next flush."""
+        if not self._dying[row]:
+            self._dying[row] = True
+            self._pending.append(row)
+
+    def is_despawning(self, row):
+        """Return True if the entity in a row is marked for removal."""
+        return self._dying[row]
+
+    def live(self, name):
+        """Return a column without the entities marked for removal."""
+        column = self._columns[name]
+        if not self._pending:
+            return column
+        dying = self._dying
+        return [value for row, value in enumerate(column) if not dying[row]]
+
+    def flush(self):
+        """Remove the marked entities and return how many were removed.
+
+        Each removed row is filled by moving the last row into it. Rows
+        are processed from the highest down, so a row being moved is
+        never one that is still waiting for removal.
+        """
+        pending = self._pending
+        if not pending:
+            return 0
+        pending.sort(reverse=True)
+        for row in pending:
+            for callback in self.on_despawn:
+                callback(self, row)
+            last = self._count - 1
+            handle = self._row_handles[row]
+            slot = handle & SLOT_MASK
+            self._slot_rows[slot] = -1
+            self._free_slots.append(slot)
+            if row != last:
+                moved = self._row_handles[last]
+                self._row_handles[row] = moved
+                self._slot_rows[moved & SLOT_MASK] = row
+                self._dying[row] = self._dying[last]
+                for column in self._columns.values():
+                    column[row] = column[last]
+            self._row_handles.pop()
+            self._dying.pop()
+            for column in self._columns.values():
+                column.pop()
+            self._count = last
+        removed = len(pending)
+        self._pending = []
+        return removed
+
+
+class SystemSchedule:
+    """Systems of an EntityRegistry, run in phase order every step."""
+
+    def __init__(self, registry, phases=PHASES):
+        """Create an empty schedule.
+
+        Args:
+            registry: The EntityRegistry the systems work on
+            phases: Phase names in the order they run
+        """
+        self.registry = registry
+        self.phases = tuple(phases)
+        self._systems = {phase: [] for phase in self.phases}
+
+    def add(self, phase, system):
+        """Add a system to the end of a phase.
+
+        Args:
+            phase: One of the schedule's phases
+            system: Callable system(registry, step)
+
+        Raises:
+            ValueError: If the phase is unknown
+        """
+        if phase not in self._systems:
+            raise ValueError(f"Unknown phase '{phase}', expected one of {', '.join(self.phases)}")
+        self._systems[phase].append(system)
+        return system
+
+    def remove(self, system):
+        """Remove a system from whichever phase holds it."""
+        for systems in self._systems.values():
+            if system in systems:
+                systems.remove(system)
+
+    def systems(self):
+        """Return (phase, system) pairs in the order they run."""
+        return [(phase, system) for phase in self.phases for system in self._systems[phase]]
+
+    def run(self, step):
+        """Run every system for one step, then remove the entities despawned during it."""
+        registry = self.registry
+        for phase in self.phases:
+            for system in self._systems[phase]:
+                system(registry, step)
+        registry.flush()
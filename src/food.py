@@ -1,6 +1,145 @@
 import random
 
 class LilyPad:
+    __slots__ = ('position', 'state_slot')
+
     def __init__(self, x, y):
         self.position = (x, y)
-        print(f"Lily pad placed at position {self.position}.")
+
+
+class FoodDynamics:
+    """Regrowth, clustering and local depletion of the lily pads in a TiledWorld.
+
+    Every step, eaten pads grow back at a rate proportional to how many are
+    missing: food_regrowth_rate pads per step when the pond is empty, none
+    when it is full. New pads are drawn as one batch of coordinates, either
+    uniformly or around food_clusters fixed centres, and filed into the
+    world's pad index one by one, so the cost per step stays proportional to
+    the pads actually regrown.
+
+    Eating a pad depletes its chunk: the chunk's fertility (the chance that
+    a pad regrows there) is multiplied by 1 - food_depletion and recovers
+    towards 1 by food_recovery per step. Recovery is computed when the chunk
+    is next looked at, so untouched chunks cost nothing.
+    """
+
+    def __init__(self, world, params, rng=random, pad_factory=LilyPad):
+        """Create the food model for a world.
+
+        Args:
+            world: The TiledWorld whose pads are managed
+            params: Compiled SimParams with the food_* settings
+            rng: Random source used to seed the batch generator
+            pad_factory: Callable building a pad from x, y
+        """
+        self.world = world
+        self.params = params
+        self.pad_factory = pad_factory
+        self._seed = rng.getrandbits(64)
+        self._generator = None
+        self.capacity = 0  # Pads the pond holds when fully grown
+        self.cluster_centres = None
+        self._fertility = {}  # chunk key -> (fertility, step it was computed at)
+
+    def reset(self, lily_pads=()):
+        """Start a new trial with lily_pads as the fully grown layout."""
+        self.capacity = len(lily_pads)
+        self._fertility = {}
+        clusters = self.params.food_clusters
+        if clusters > 0:
+            self.cluster_centres = self._rng.uniform(
+                (0, 0), (self.world.width, self.world.height), size=(clusters, 2)
+            )
+        else:
+            self.cluster_centres = None
+
+    @property
+    def _rng(self):
+        # numpy is imported on first use so it stays off the startup path
+        if self._generator is None:
+            import numpy as np
+            self._generator = np.random.default_rng(self._seed)
+        return self._generator
+
+    def add_capacity(self, count):
+        """Grow the capacity by pads created outside the food model (lazy chunks)."""
+        self.capacity += count
+
+    def sample_positions(self, count):
+        """Return a (count, 2) array of candidate pad positions."""
+        width, height = self.world.width, self.world.height
+        if self.cluster_centres is None:
+            positions = self._rng.uniform((0, 0), (width, height), size=(count, 2))
+        else:
+            centres = self.cluster_centres[self._rng.integers(len(self.cluster_centres), size=count)]
+            positions = centres + self._rng.normal(0.0, self.params.food_cluster_spread, size=(count, 2))
+        positions[:, 0].clip(0, width, out=positions[:, 0])
+        positions[:, 1].clip(0, height, out=positions[:, 1])
+        return positions
+
+    def spawn(self, count, step=0):
+        """Place count new pads (clustered when configured) and grow the capacity.
+
+        Returns:
+            The lily pads created
+        """
+        lily_pads = self._place(self.sample_positions(count), step, check_fertility=False)
+        self.capacity += len(lily_pads)
+        return lily_pads
+
+    def fertility(self, key, step):
+        """Return the chance that a pad regrows in chunk key at step."""
+        entry = self._fertility.get(key)
+        if entry is None:
+            return 1.0
+        fertility, since = entry
+        if step > since:
+            # Close the gap to 1 by food_recovery per elapsed step
+            fertility = 1.0 - (1.0 - fertility) * (1.0 - self.params.food_recovery) ** (step - since)
+            self._fertility[key] = (fertility, step)
+        return fertility
+
+    def consume(self, lily_pad, step):
+        """Deplete the chunk a pad was eaten from."""
+        depletion = self.params.food_depletion
+        if depletion <= 0:
+            return
+        key = self.world.pads.cell_key(lily_pad.position)
+        self._fertility[key] = (self.fertility(key, step) * (1.0 - depletion), step)
+
+    def step(self, step, alive):
+        """Regrow pads for one step.
+
+        Args:
+            step: Current simulation step
+            alive: Number of pads currently in the pond
+
+        Returns:
+            The lily pads that grew back
+        """
+        missing = self.capacity - alive
+        rate = self.params.food_regrowth_rate
+        if missing <= 0 or rate <= 0:
+            return []
+        count = min(missing, int(self._rng.poisson(rate * missing / self.capacity)))
+        if count == 0:
+            return []
+        return self._place(self.sample_positions(count), step, check_fertility=True)
+
+    def _place(self, positions, step, check_fertility):
+        world = self.world
+        chunk_size = world.chunk_size
+        accept = self._rng.random(len(positions)) if check_fertility else None
+        lily_pads = []
+        for index, (x, y) in enumerate(positions.tolist()):
+            key = (int(x // chunk_size), int(y // chunk_size))
+            if world.lazy:
+                chunk = world.chunks.get(key)
+                if chunk is None or not chunk.generated:
+                    continue  # The chunk gets its own pads when it is first visited
+            if check_fertility and accept[index] >= self.fertility(key, step):
+                continue
+            lily_pad = self.pad_factory(x, y)
+            world.add_pad(lily_pad)
+            lily_pads.append(lily_pad)
+        return lily_pads
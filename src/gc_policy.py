@@ -0,0 +1,147 @@
+import gc
+import time
+
+from neat.reporting import BaseReporter
+
+GC_MODES = ('default', 'tuned')
+
+
+class GCPolicy(BaseReporter):
+    """Garbage collector management for long runs.
+
+    The step loop allocates many short-lived tuples, lists and dicts. They
+    are freed by reference counting, but each allocation counts towards the
+    collector's generation 0 threshold, so the cyclic collector runs every
+    few hundred allocations and rescans everything that has survived so
+    far. In 'tuned' mode the policy:
+
+    - freezes the objects alive after startup (modules, configs, the pond)
+      with gc.freeze(), so collections no longer traverse them;
+    - raises the generation 0 threshold while an episode runs, so the step
+      loop triggers far fewer collections;
+    - runs one full collection between generations, where a pause costs
+      nothing, to reclaim any cycles the episode left behind.
+
+    In 'default' mode the interpreter's thresholds are left alone and only
+    the collection between generations is made. In both modes every
+    collection is timed through gc.callbacks and summarized after each
+    generation.
+
+    The policy is a neat reporter: add it to the population after the
+    checkpoint reporter so its collection follows checkpoint writing.
+    """
+
+    def __init__(self, mode='default', episode_threshold=50000):
+        """Create a policy.
+
+        Args:
+            mode: 'default' or 'tuned'
+            episode_threshold: Generation 0 threshold used during episodes in tuned mode
+
+        Raises:
+            ValueError: If mode is unknown
+        """
+        if mode not in GC_MODES:
+            raise ValueError(f"Unknown gc_mode '{mode}', expected one of {', '.join(GC_MODES)}")
+        BaseReporter.__init__(self)
+        self.mode = mode
+        self.episode_threshold = episode_threshold
+        self.pauses = []  # (collector generation, seconds) since the last summary
+        self.total_pause = 0.0  # Seconds paused since the policy was installed
+        self.collections = 0
+        self.last_summary = None
+        self._started = None
+        self._saved_threshold = None
+        self._installed = False
+        self._frozen = False
+
+    def __getstate__(self):
+        """Return state for copying; copies are not installed and hold no pause log."""
+        state = self.__dict__.copy()
+        state.update(pauses=[], _started=None, _saved_threshold=None, _installed=False, _frozen=False)
+        return state
+
+    def install(self):
+        """Start timing collections."""
+        if not self._installed:
+            gc.callbacks.append(self._on_collect)
+            self._installed = True
+
+    def startup(self):
+        """Call once setup is complete: start timing and, when tuned, freeze the survivors."""
+        self.install()
+        if self.mode == 'tuned' and not self._frozen:
+            gc.collect()
+            gc.freeze()
+            self._frozen = True
+            print(f"GC: froze {gc.get_freeze_count()} startup objects")
+
+    def begin_episode(self):
+        """Raise the generation 0 threshold for the step loop (tuned mode)."""
+        if self.mode == 'tuned' and self._saved_threshold is None:
+            self._saved_threshold = gc.get_threshold()
+            gc.set_threshold(self.episode_threshold, *self._saved_threshold[1:])
+
+    def end_episode(self):
+        """Restore the thresholds in force before begin_episode."""
+        if self._saved_threshold is not None:
+            gc.set_threshold(*self._saved_threshold)
+            self._saved_threshold = None
+
+    def collect(self):
+        """Run a full collection and return the time it took in seconds."""
+        self.end_episode()
+        start = time.perf_counter()
+        gc.collect()
+        return time.perf_counter() - start
+
+    def summary(self):
+        """Return pause statistics since the last summary and start a new period."""
+        pauses = self.pauses
+        self.pauses = []
+        counts = [0, 0, 0]
+        for generation, _ in pauses:
+            counts[generation] += 1
+        durations = [seconds for _, seconds in pauses]
+        self.last_summary = {
+            'collections': len(pauses),
+            'by_generation': counts,
+            'total_pause': sum(durations),
+            'max_pause': max(durations, default=0.0),
+        }
+        return self.last_summary
+
+    def end_generation(self, config, population, species_set):
+        """Summarize the generation's pauses, then collect while nothing is running."""
+        summary = self.summary()
+        scheduled = self.collect()
+        print(f"GC: {summary['collections']} collections during the generation "
+              f"(gen0 {summary['by_generation'][0]}, gen1 {summary['by_generation'][1]}, "
+              f"gen2 {summary['by_generation'][2]}), {summary['total_pause'] * 1000:.1f} ms paused, "
+              f"longest {summary['max_pause'] * 1000:.1f} ms; "
+              f"scheduled collection {scheduled * 1000:.1f} ms")
+        self.pauses = []  # The scheduled collection is reported on its own
+
+    def close(self):
+        """Restore the collector (thresholds, frozen objects, callbacks) and collect what the run left."""
+        self.end_episode()
+        if self._frozen:
+            gc.unfreeze()
+            self._frozen = False
+        if self._installed:
+            try:
+                gc.callbacks.remove(self._on_collect)
+            except ValueError:
+                pass
+            self._installed = False
+            gc.collect()
+
+    def _on_collect(self, phase, info):
+        if phase == 'start':
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            seconds = time.perf_counter() - self._started
+            self._started = None
+            self.pauses.append((info['generation'], seconds))
+            self.total_pause += seconds
+            self.collections += 1
@@ -0,0 +1,196 @@
+import mmap
+import os
+import struct
+from array import array
+
+import numpy as np
+
+# File layout: fixed header followed by densely packed records
+HISTORY_MAGIC = b'KOIH'
+HISTORY_VERSION = 1
+HEADER_FORMAT = '<4sIQ'  # magic, version, record count
+HEADER_SIZE = 64  # Header is padded so records start on a cache line
+
+HISTORY_DTYPE = np.dtype([
+    ('run', '<i4'),
+    ('generation', '<i4'),
+    ('species_id', '<i8'),
+    ('best_fitness', '<f8'),
+    ('mean_fitness', '<f8'),
+    ('size', '<i4'),
+    ('population', '<i4'),
+    ('food_consumed', '<i8'),
+])
+
+# Records reserved whenever the file has to grow
+INITIAL_CAPACITY = 1024
+
+
+class HistoryStore:
+    """Append-only, memory-mapped store of per-generation species statistics.
+
+    Each record describes one species in one generation of one run. Records are
+    appended in generation order, so the store can answer range queries with a
+    binary search instead of a scan, and a per-(run, species) row index keeps
+    species queries proportional to the size of the answer. The file survives
+    across runs; every HistoryStore opened for writing starts a new run id.
+    """
+
+    def __init__(self, path, new_run=True):
+        """Open (or create) the history file at path.
+
+        Args:
+            path: Location of the history file
+            new_run: Start a new run id for records appended through this store
+        """
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE
+        self._file = open(path, 'r+b' if exists else 'w+b')
+
+        if exists:
+            magic, version, count = struct.unpack_from(HEADER_FORMAT, self._file.read(HEADER_SIZE))
+            if magic != HISTORY_MAGIC:
+                raise ValueError(f"{path} is not a species history file")
+            if version != HISTORY_VERSION:
+                raise ValueError(f"Unsupported species history version {version} in {path}")
+            self._count = count
+        else:
+            self._count = 0
+            self._file.truncate(HEADER_SIZE + INITIAL_CAPACITY * HISTORY_DTYPE.itemsize)
+            self._write_header()
+
+        self._map()
+        self._build_index()
+
+        self.run = self.last_run() + 1 if new_run else max(self.last_run(), 0)
+        self._last_generation = None
+
+    def _map(self):
+        """(Re)map the file and expose the record area as a structured array."""
+        self._file.flush()
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        capacity = (len(self._mmap) - HEADER_SIZE) // HISTORY_DTYPE.itemsize
+        self._records = np.ndarray((capacity,), dtype=HISTORY_DTYPE,
+                                   buffer=self._mmap, offset=HEADER_SIZE)
+
+    def _unmap(self):
+        self._records = None
+        self._mmap.close()
+
+    def _write_header(self):
+        header = struct.pack(HEADER_FORMAT, HISTORY_MAGIC, HISTORY_VERSION, self._count)
+        if hasattr(self, '_mmap') and not self._mmap.closed:
+            self._mmap[:len(header)] = header
+        else:
+            self._file.seek(0)
+            self._file.write(header)
+
+    def _build_index(self):
+        """Build the (run, species) -> row numbers index in one vectorised pass."""
+        self._index = {}
+        if self._count == 0:
+            return
+        records = self._records[:self._count]
+        keys = np.stack((records['run'].astype(np.int64), records['species_id']), axis=1)
+        order = np.lexsort((np.arange(self._count), keys[:, 1], keys[:, 0]))
+        boundaries = np.flatnonzero(np.any(np.diff(keys[order], axis=0) != 0, axis=1)) + 1
+        for rows in np.split(order, boundaries):
+            run, species_id = keys[rows[0]]
+            self._index[(int(run), int(species_id))] = array('q', rows.tolist())
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        return len(self._records)
+
+    def last_run(self):
+        """Return the highest run id in the file, or -1 when it is empty."""
+        if self._count == 0:
+            return -1
+        return int(self._records['run'][self._count - 1])
+
+    def append(self, generation, species_id, best_fitness, mean_fitness, size, population, food_consumed):
+        """Append one species' statistics for a generation of the current run.
+
+        Appends are amortised O(1): the file doubles in size when full.
+        """
+        if self._last_generation is not None and generation < self._last_generation:
+            raise ValueError(
+                f"Generation {generation} appended after generation {self._last_generation}; "
+                "history must be recorded in generation order"
+            )
+        if self._count == self.capacity:
+            self._grow()
+
+        self._records[self._count] = (
+            self.run, generation, int(species_id), best_fitness, mean_fitness,
+            size, population, food_consumed
+        )
+        self._index.setdefault((self.run, int(species_id)), array('q')).append(self._count)
+        self._count += 1
+        self._last_generation = generation
+        self._write_header()
+
+    def _grow(self):
+        new_capacity = max(INITIAL_CAPACITY, self.capacity * 2)
+        self._unmap()
+        self._file.truncate(HEADER_SIZE + new_capacity * HISTORY_DTYPE.itemsize)
+        self._map()
+
+    def _generation_bounds(self, generations, start, stop):
+        """Locate [start, stop) inside a sorted generation column."""
+        lo = 0 if start is None else int(np.searchsorted(generations, start, side='left'))
+        hi = len(generations) if stop is None else int(np.searchsorted(generations, stop, side='left'))
+        return lo, hi
+
+    def query(self, species_id=None, start=None, stop=None, run=None):
+        """Return the records of a run within a generation range.
+
+        Args:
+            species_id: Only return this species (all species when None)
+            start: First generation to include (inclusive)
+            stop: Last generation to include (exclusive)
+            run: Run id to query, defaults to the most recent run in the file
+
+        Returns:
+            A structured NumPy array of HISTORY_DTYPE records
+        """
+        if run is None:
+            run = self.last_run()
+
+        if species_id is not None:
+            rows = self._index.get((run, int(species_id)))
+            if not rows:
+                return np.empty(0, dtype=HISTORY_DTYPE)
+            rows = np.frombuffer(rows, dtype=np.int64)
+            lo, hi = self._generation_bounds(self._records['generation'][rows], start, stop)
+            return self._records[rows[lo:hi]]
+
+        # Runs are contiguous and generations ordered within a run
+        runs = self._records['run'][:self._count]
+        run_lo = int(np.searchsorted(runs, run, side='left'))
+        run_hi = int(np.searchsorted(runs, run, side='right'))
+        generations = self._records['generation'][run_lo:run_hi]
+        lo, hi = self._generation_bounds(generations, start, stop)
+        return self._records[run_lo + lo:run_lo + hi].copy()
+
+    def species_ids(self, run=None):
+        """Return the ids of every species recorded in a run."""
+        if run is None:
+            run = self.last_run()
+        return sorted(species_id for (key_run, species_id) in self._index if key_run == run)
+
+    def flush(self):
+        """Flush dirty pages to disk."""
+        self._mmap.flush()
+
+    def close(self):
+        """Flush and release the file; the size is trimmed to the used records."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._unmap()
+        self._file.truncate(HEADER_SIZE + max(self._count, 1) * HISTORY_DTYPE.itemsize)
+        self._file.close()
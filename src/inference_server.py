@@ -0,0 +1,427 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import pickle
+import socket
+import time
+
+import numpy as np
+
+from koi_brain import KoiBrain, encode_genome
+
+DEFAULT_NEAT_CONFIG = 'config/neat-config.ini'
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Requests are single JSON lines; a batch of a few thousand observations fits
+MAX_LINE = 16 * 1024 * 1024
+
+
+def best_genome(population):
+    """Return the fittest genome of a {key: genome} population."""
+    evaluated = [genome for genome in population.values() if genome.fitness is not None]
+    if not evaluated:
+        raise ValueError("No genome in the population has a fitness")
+    return max(evaluated, key=lambda genome: genome.fitness)
+
+
+def load_genome(path, neat_config_path=DEFAULT_NEAT_CONFIG):
+    """Load a saved genome and the NEAT config it belongs to.
+
+    Args:
+        path: A pickled genome (best_koi.pkl), a checkpoint written by
+            CheckpointReporter, or a neat.Checkpointer checkpoint. For
+            checkpoints the fittest genome is returned.
+        neat_config_path: NEAT config for files that do not carry one
+            (neat.Checkpointer checkpoints do)
+
+    Returns:
+        A (genome, config) tuple
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return _decode_genome(data, neat_config_path)
+
+
+def _decode_genome(data, neat_config_path):
+    config = None
+    if data.startswith(GZIP_MAGIC):
+        # neat.Checkpointer: (generation, config, population, species_set, random state)
+        _, config, population, _, _ = pickle.loads(gzip.decompress(data))
+        genome = best_genome(population)
+    else:
+        loaded = pickle.loads(data)
+        if isinstance(loaded, tuple):
+            # CheckpointReporter: (population, species_set, generation)
+            genome = best_genome(loaded[0])
+        else:
+            genome = loaded
+    if config is None:
+        from config_cache import load_neat_config
+        config = load_neat_config(neat_config_path)
+    return genome, config
+
+
+def load_brain(path, neat_config_path=DEFAULT_NEAT_CONFIG):
+    """Load a model for serving.
+
+    Args:
+        path: A .kbrain file, or any file load_genome accepts
+        neat_config_path: NEAT config used to export pickled genomes
+
+    Returns:
+        A KoiBrain
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(b'KBRN'):
+        return KoiBrain.from_bytes(data)
+    genome, config = _decode_genome(data, neat_config_path)
+    return KoiBrain.from_bytes(encode_genome(genome, config))
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ServedModel:
+    """One model behind the server: its brain, a micro-batcher and hot reload.
+
+    Requests are queued and evaluated together: the batcher takes the first
+    waiting request, then keeps collecting until max_batch observations are
+    gathered or max_delay seconds have passed since the first one arrived,
+    and evaluates them with a single activate_batch call. Evaluation takes
+    well under a millisecond, so it runs on the event loop rather than
+    paying for a thread hand-off.
+
+    The source file is polled every reload_interval seconds; when its
+    modification time or size changes it is loaded again in a worker thread
+    and swapped in. A failed load (for example a file caught mid-write)
+    keeps the previous brain and is retried on the next poll.
+    """
+
+    def __init__(self, name, path, neat_config_path=DEFAULT_NEAT_CONFIG,
+                 max_batch=256, max_delay=0.002, reload_interval=1.0):
+        self.name = name
+        self.path = path
+        self.neat_config_path = neat_config_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.reload_interval = reload_interval
+        self.brain = None
+        self.version = 0  # Incremented on every (re)load
+        self.batches = 0  # activate_batch calls, for monitoring
+        self._file_key = None
+        self._queue = None
+        self._tasks = []
+
+    def load(self):
+        """Load the model synchronously (used at startup)."""
+        key = _file_key(self.path)
+        self.brain = load_brain(self.path, self.neat_config_path)
+        self._file_key = key
+        self.version += 1
+
+    async def start(self):
+        if self.brain is None:
+            self.load()
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._batch_loop()),
+                       asyncio.create_task(self._reload_loop())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def describe(self):
+        brain = self.brain
+        return {'path': self.path, 'inputs': brain.num_inputs, 'outputs': brain.num_outputs,
+                'genome': brain.key, 'fitness': brain.fitness, 'version': self.version}
+
+    async def infer(self, observations):
+        """Evaluate (n, num_inputs) observations in the next batch.
+
+        Raises:
+            ValueError: If the observations have the wrong shape
+        """
+        observations = np.asarray(observations, dtype=np.float64)
+        if observations.ndim != 2 or observations.shape[1] != self.brain.num_inputs:
+            raise ValueError(f"Expected observations of shape (n, {self.brain.num_inputs}), "
+                             f"got {observations.shape}")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((observations, future))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_delay
+            while rows < self.max_batch:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                batch.append(item)
+                rows += len(item[0])
+            self._run(batch)
+
+    def _run(self, batch):
+        pending = [(observations, future) for observations, future in batch if not future.cancelled()]
+        if not pending:
+            return
+        try:
+            outputs = self.brain.activate_batch(np.concatenate([observations for observations, _ in pending]))
+            self.batches += 1
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for observations, future in pending:
+            end = start + len(observations)
+            if not future.done():
+                future.set_result(outputs[start:end])
+            start = end
+
+    async def _reload_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self.check_reload(loop)
+
+    async def check_reload(self, loop=None):
+        """Reload the model if its file changed; returns True when it was reloaded."""
+        loop = loop or asyncio.get_running_loop()
+        try:
+            key = _file_key(self.path)
+        except OSError:
+            return False  # Missing while being replaced; try again later
+        if key == self._file_key:
+            return False
+        try:
+            brain = await loop.run_in_executor(None, load_brain, self.path, self.neat_config_path)
+        except Exception as e:
+            print(f"Could not reload model '{self.name}' from {self.path}: {e}")
+            return False
+        self.brain = brain
+        self._file_key = key
+        self.version += 1
+        print(f"Reloaded model '{self.name}' from {self.path} (genome {brain.key}, version {self.version})")
+        return True
+
+
+class InferenceServer:
+    """Local asyncio server answering koi policy queries.
+
+    Listens on a Unix socket or on a localhost TCP port. The protocol is one
+    JSON object per line in each direction:
+
+        {"id": 1, "model": "best", "inputs": [0.1, ...]}        -> {"id": 1, "outputs": [...]}
+        {"id": 2, "model": "best", "inputs": [[...], [...]]}    -> {"id": 2, "outputs": [[...], [...]]}
+        {"id": 3, "op": "models"}                               -> {"id": 3, "models": {...}}
+
+    "model" may be left out when a single model is served. Errors come back
+    as {"id": ..., "error": "..."}. Requests on one connection are handled
+    concurrently, so responses may arrive out of order; match them by id.
+    """
+
+    def __init__(self, models, neat_config_path=DEFAULT_NEAT_CONFIG, max_batch=256,
+                 max_delay=0.002, reload_interval=1.0):
+        """Load the models.
+
+        Args:
+            models: Mapping of model name to source path (see load_brain)
+            neat_config_path: NEAT config for exporting pickled genomes
+            max_batch: Most observations evaluated in one batch
+            max_delay: Longest time (seconds) a request waits for others to batch with
+            reload_interval: Seconds between checks for changed model files
+        """
+        self.models = {
+            name: ServedModel(name, path, neat_config_path, max_batch, max_delay, reload_interval)
+            for name, path in models.items()
+        }
+        for model in self.models.values():
+            model.load()
+        self._server = None
+        self.address = None
+
+    async def start(self, socket_path=None, host='127.0.0.1', port=0):
+        """Start listening on socket_path, or on host:port (port 0 picks a free port)."""
+        for model in self.models.values():
+            await model.start()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=socket_path, limit=MAX_LINE)
+            self.address = socket_path
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for model in self.models.values():
+            await model.stop()
+
+    async def _handle(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"error": "Request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _answer(self, line, writer):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be JSON objects")
+            request_id = request.get('id')
+            response = await self.respond(request)
+        except Exception as e:
+            response = {'error': str(e)}
+        response['id'] = request_id
+        writer.write(json.dumps(response).encode() + b'\n')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def respond(self, request):
+        """Return the response dictionary for a decoded request."""
+        if request.get('op') == 'models':
+            return {'models': {name: model.describe() for name, model in self.models.items()}}
+
+        name = request.get('model')
+        if name is None:
+            if len(self.models) != 1:
+                raise ValueError(f"Specify a model, one of {', '.join(sorted(self.models))}")
+            name = next(iter(self.models))
+        model = self.models.get(name)
+        if model is None:
+            raise ValueError(f"Unknown model '{name}'")
+
+        inputs = request.get('inputs')
+        if inputs is None:
+            raise ValueError("Missing 'inputs'")
+        single = bool(inputs) and not isinstance(inputs[0], list)
+        outputs = await model.infer([inputs] if single else inputs)
+        return {'model': name, 'outputs': outputs[0].tolist() if single else outputs.tolist()}
+
+
+class InferenceClient:
+    """Blocking client for the inference server, for scripts and test harnesses."""
+
+    def __init__(self, socket_path=None, host='127.0.0.1', port=None, timeout=5.0):
+        if socket_path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+        else:
+            self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._reader = self._socket.makefile('rb')
+        self._next_id = 0
+
+    def request(self, request):
+        """Send one request and return its response."""
+        self._next_id += 1
+        request = dict(request, id=self._next_id)
+        self._socket.sendall(json.dumps(request).encode() + b'\n')
+        response = json.loads(self._reader.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def query(self, inputs, model=None):
+        """Return the outputs for one observation (or a list of observations)."""
+        request = {'inputs': inputs}
+        if model is not None:
+            request['model'] = model
+        return self.request(request)['outputs']
+
+    def models(self):
+        return self.request({'op': 'models'})['models']
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+
+def main():
+    """Serve evolved koi until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve evolved koi policies to local processes")
+    parser.add_argument('--model', action='append', default=None, metavar='NAME=PATH',
+                        help="Model to serve (.kbrain, best_koi.pkl or a checkpoint); repeatable. "
+                             "Defaults to best=best_koi.pkl")
+    parser.add_argument('--socket', default=None, help="Unix socket path (TCP on localhost otherwise)")
+    parser.add_argument('--port', type=int, default=8765, help="Localhost TCP port")
+    parser.add_argument('--config', default=DEFAULT_NEAT_CONFIG, help="NEAT configuration for pickled genomes")
+    parser.add_argument('--max-batch', type=int, default=256, help="Most observations per batch")
+    parser.add_argument('--max-delay-ms', type=float, default=2.0, help="Latency budget for collecting a batch")
+    parser.add_argument('--reload-interval', type=float, default=1.0, help="Seconds between model file checks")
+    args = parser.parse_args()
+
+    models = {}
+    for entry in args.model or ['best=best_koi.pkl']:
+        name, separator, path = entry.partition('=')
+        if not separator:
+            name, path = os.path.splitext(os.path.basename(entry))[0], entry
+        models[name] = path
+
+    async def serve():
+        server = InferenceServer(models, args.config, args.max_batch, args.max_delay_ms / 1000.0,
+                                 args.reload_interval)
+        address = await server.start(socket_path=args.socket, port=args.port)
+        print(f"Serving {', '.join(sorted(models))} on {address}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
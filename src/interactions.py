@@ -0,0 +1,128 @@
+import math
+
+
+class InteractionSystem:
+    """Koi-to-koi contests, nudging and hunger transfer driven by the aggression output.
+
+    Once every koi has moved and fed, each pair of koi closer than
+    interaction_radius (found through the koi spatial index) holds a contest.
+    The more aggressive koi wins (ties go to the koi earlier in the list):
+    it takes contest_transfer * (difference in aggression) hunger off the
+    loser's reserves, nudges the loser away by nudge_distance * its own
+    aggression, and claims the nearest lily pad within reach of the pair.
+    Every contestant pays aggression_cost * aggression in hunger, so
+    aggression is never free.
+
+    All effects are computed from the state at the start of the phase and
+    applied together afterwards, so the outcome does not depend on the order
+    pairs are visited in, and a pad claimed by several pairs goes to its most
+    aggressive claimant.
+    """
+
+    def __init__(self, params):
+        """Create the interaction phase.
+
+        Args:
+            params: Compiled SimParams with the interaction settings
+        """
+        self.radius = params.interaction_radius
+        self.aggression_cost = params.aggression_cost
+        self.contest_transfer = params.contest_transfer
+        self.nudge_distance = params.nudge_distance
+        self.lily_pad_value = params.lily_pad_value
+        self.width = params.environment_width
+        self.height = params.environment_height
+
+    def find_pairs(self, koi_list, koi_index):
+        """Return the sorted (i, j), i < j, index pairs of koi within the interaction radius."""
+        slots = {id(fish): index for index, fish in enumerate(koi_list)}
+        pairs = []
+        for i, fish in enumerate(koi_list):
+            for other in koi_index.query_radius(fish.position, self.radius):
+                j = slots.get(id(other))
+                if j is not None and j > i:
+                    pairs.append((i, j))
+        pairs.sort()
+        return pairs
+
+    def resolve(self, koi_list, koi_index, pad_index):
+        """Run one interaction phase.
+
+        Args:
+            koi_list: The living koi
+            koi_index: Spatial index of the koi, updated for nudged koi
+            pad_index: Spatial index of the lily pads
+
+        Returns:
+            The lily pads eaten by contest winners; the caller removes them
+            from the pond
+        """
+        pairs = self.find_pairs(koi_list, koi_index)
+        if not pairs:
+            return []
+
+        # Snapshot the state every effect is computed from
+        aggression = [min(1.0, max(0.0, fish.aggression)) for fish in koi_list]
+        positions = [fish.position for fish in koi_list]
+        hunger_delta = [0.0] * len(koi_list)
+        nudges = {}
+        claims = {}  # id(pad) -> (rank, winner index, pad)
+
+        for i, j in pairs:
+            a_i, a_j = aggression[i], aggression[j]
+            # Higher aggression wins; on a tie the earlier koi does
+            winner, loser = (i, j) if a_i >= a_j else (j, i)
+            a_win, a_lose = aggression[winner], aggression[loser]
+
+            hunger_delta[i] += self.aggression_cost * a_i
+            hunger_delta[j] += self.aggression_cost * a_j
+            stake = self.contest_transfer * (a_win - a_lose)
+            hunger_delta[winner] -= stake
+            hunger_delta[loser] += stake
+
+            # Push the loser directly away from the winner
+            dx = positions[loser][0] - positions[winner][0]
+            dy = positions[loser][1] - positions[winner][1]
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > 0:
+                dx, dy = dx / distance, dy / distance
+            else:
+                dx, dy = (1.0, 0.0) if loser > winner else (-1.0, 0.0)
+            push = self.nudge_distance * a_win
+            nx, ny = nudges.get(loser, (0.0, 0.0))
+            nudges[loser] = (nx + dx * push, ny + dy * push)
+
+            # The nearest pad within reach of the pair's midpoint is contested
+            midpoint = ((positions[i][0] + positions[j][0]) / 2, (positions[i][1] + positions[j][1]) / 2)
+            nearby = pad_index.query_radius(midpoint, self.radius)
+            if nearby:
+                pad = min(nearby, key=lambda p: ((p.position[0] - midpoint[0]) ** 2 + (p.position[1] - midpoint[1]) ** 2, p.position))
+                rank = (a_win, -winner)
+                claim = claims.get(id(pad))
+                if claim is None or rank > claim[0]:
+                    claims[id(pad)] = (rank, winner, pad)
+
+        # Apply every effect at once
+        eaten = []
+        for _, winner, pad in sorted(claims.values(), key=lambda claim: claim[1]):
+            fish = koi_list[winner]
+            hunger_delta[winner] -= self.lily_pad_value
+            fish.food_consumed += 1
+            fish.eaten_lily_pads.append(pad)
+            eaten.append(pad)
+
+        for fish, delta in zip(koi_list, hunger_delta):
+            if delta:
+                fish.hunger = max(0.0, fish.hunger + delta)
+
+        for index in sorted(nudges):
+            fish = koi_list[index]
+            old_position = fish.position
+            nx, ny = nudges[index]
+            fish.position = (
+                max(0, min(self.width, old_position[0] + nx)),
+                max(0, min(self.height, old_position[1] + ny))
+            )
+            koi_index.move(fish, old_position)
+
+        return eaten
@@ -1,16 +1,47 @@
 import math
 import neat
 import random
+from sensors import VisionSensor
+from sim_params import SimParams
+
+# Field of view used for the closest-food inputs, shared by every koi
+FOOD_SENSOR = VisionSensor()
+
+
+def create_network(genome, config):
+    """Build a genome's feed-forward network.
+
+    Genome classes with their own builder (ArrayGenome) construct the network
+    directly; DefaultGenome goes through neat's FeedForwardNetwork.create.
+    """
+    if hasattr(type(genome), 'feed_forward_network'):
+        return genome.feed_forward_network(config)
+    return neat.nn.FeedForwardNetwork.create(genome, config)
+
 
 class Koi:
     def __init__(self, genome, config, position, environment_config, species_id=None):
+        """Create a koi driven by a genome's network.
+        
+        Args:
+            genome: The NEAT genome
+            config: The NEAT configuration
+            position: Starting (x, y) position
+            environment_config: Compiled SimParams, or an environment dict
+                with width, height and detection_radius
+            species_id: Species the genome belongs to
+        """
         self.genome = genome
         self.config = config
-        self.network = neat.nn.FeedForwardNetwork.create(genome, config)
+        self.network = create_network(genome, config)
         self.environment_config = environment_config
+        if isinstance(environment_config, SimParams):
+            self.params = environment_config
+        else:
+            self.params = SimParams.from_environment(environment_config)
         self.position = position
         self.last_position = position
-        self.hunger = 0
+        self.hunger = self.params.starting_hunger
         self.energy = 100
         self.species_id = species_id
         self.highest_fitness = 0
@@ -18,6 +49,10 @@ class Koi:
         self.steps_taken = 0  # Track how many steps the koi has survived
         self.food_consumed = 0  # Track how many lily pads consumed
         self.movement_efficiency = 0  # Track how efficiently the koi moves
+        self.last_outputs = None  # Most recent network outputs, for telemetry
+        self.eaten_lily_pads = []  # Lily pads consumed since last drained, for telemetry
+        self.vision_inputs = None  # Field-of-view inputs from the batch vision sensor, if enabled
+        self.aggression = 0.0  # Latest aggression output, used by the interaction phase
 
     def __getstate__(self):
         """Return state for pickling, excluding unpicklable objects."""
@@ -38,7 +73,7 @@ class Koi:
             del state['genome']
         
         # Ensure we don't have any pygame references in our environment config
-        if 'environment_config' in state:
+        if isinstance(state.get('environment_config'), dict):
             # Make a clean copy without any potential pygame references
             clean_env = {}
             for k, v in state['environment_config'].items():
@@ -83,7 +118,7 @@ class Koi:
         # Recreate the neural network from genome and config
         if hasattr(self, 'genome') and hasattr(self, 'config') and self.genome and self.config:
             try:
-                self.network = neat.nn.FeedForwardNetwork.create(self.genome, self.config)
+                self.network = create_network(self.genome, self.config)
             except Exception as e:
                 print(f"Error recreating neural network: {e}")
                 self.network = None
@@ -115,22 +150,43 @@ class Koi:
             del self._had_genome_ref
 
     def take_action(self, nearby_lily_pads, nearby_koi):
+        """Think and swim for one step; returns False if the koi should die."""
+        outputs = self.think(nearby_lily_pads, nearby_koi)
+        if outputs is None:
+            return False  # Return False to indicate koi should be removed
+        self.act(outputs, nearby_koi)
+        return True  # Return True to indicate koi remains alive
+
+    def think(self, nearby_lily_pads, nearby_koi):
+        """Evaluate the network on the koi's surroundings.
+        
+        Returns:
+            The network outputs, or None if the koi should die
+        """
+        params = self.params
+        
         # Store previous position for smooth movement
         self.last_position = self.position
         
         # If energy is depleted, the koi should die
         if self.energy <= 0:
-            return False  # Return False to indicate koi should be removed
+            return None
             
         # Koi also dies if too hungry
-        if self.hunger >= 200:
-            return False  # Return False to indicate koi should be removed
+        if self.hunger >= params.max_hunger:
+            return None
             
         # Get inputs for the neural network
         inputs = self.get_inputs(nearby_lily_pads, nearby_koi)
         
         # Get outputs from neural network
         outputs = self.network.activate(inputs)
+        self.last_outputs = outputs
+        return outputs
+
+    def act(self, outputs, nearby_koi):
+        """Swim as the network outputs direct."""
+        params = self.params
         
         # The NEAT config specifies 5 outputs
         # Interpret outputs as movement direction, speed, and other behaviors
@@ -139,6 +195,7 @@ class Koi:
         speed = abs(outputs[2])  # Use absolute value to ensure positive speed
         schooling_tendency = outputs[3] if len(outputs) > 3 else 0.5  # How much to follow school
         aggression = outputs[4] if len(outputs) > 4 else 0.0  # How aggressive with other koi
+        self.aggression = aggression
         
         # Normalize direction vector
         magnitude = math.sqrt(direction_x**2 + direction_y**2)
@@ -180,8 +237,7 @@ class Koi:
                     direction_y /= magnitude
         
         # Apply movement
-        max_speed = 5.0
-        actual_speed = speed * max_speed
+        actual_speed = speed * params.max_speed
         
         # Track previous position for efficiency calculation
         old_position = self.position
@@ -195,21 +251,19 @@ class Koi:
         # Increase hunger proportionally to movement, but with a smaller factor
         # Reduce the movement cost to prevent excessive hunger increase and energy drop
         movement_distance = self.distance_to((self.last_position[0], self.last_position[1]))
-        movement_cost = movement_distance * 0.05  # Reduced from 0.1 to 0.05
+        movement_cost = movement_distance * params.swimming_cost
         self.hunger += movement_cost
         
         # Constrain position to environment boundaries
         self.position = (
-            max(0, min(self.environment_config['width'], self.position[0])),
-            max(0, min(self.environment_config['height'], self.position[1]))
+            max(0, min(params.environment_width, self.position[0])),
+            max(0, min(params.environment_height, self.position[1]))
         )
-        
-        return True  # Return True to indicate koi remains alive
 
     def get_closest_lily_pad_info(self, nearby_lily_pads):
         # Default values if no lily pads are nearby
         result = {
-            'distance': self.environment_config['detection_radius'],
+            'distance': self.params.detection_radius,
             'direction_x': 0,
             'direction_y': 0
         }
@@ -236,6 +290,12 @@ class Koi:
         }
 
     def get_inputs(self, nearby_lily_pads, nearby_koi):
+        params = self.params
+        width = params.environment_width
+        height = params.environment_height
+        detection_radius = params.detection_radius
+        schooling_radius = params.schooling_radius
+        
         # Get closest lily pad and koi info
         lily_pad_info = self.get_closest_lily_pad_info(nearby_lily_pads)
         koi_info = self.get_closest_koi_info(nearby_koi)
@@ -254,7 +314,7 @@ class Koi:
             dy = other.position[1] - self.position[1]
             dist = math.sqrt(dx*dx + dy*dy)
             
-            if dist < 100:  # Schooling radius
+            if dist < schooling_radius:
                 if other.species_id == self.species_id:
                     schooling_x += dx
                     schooling_y += dy
@@ -271,11 +331,11 @@ class Koi:
         # Calculate distance from pond edges to help avoid boundaries
         edge_distances = [
             self.position[0],  # Distance to left edge
-            self.environment_config['width'] - self.position[0],  # Distance to right edge
+            width - self.position[0],  # Distance to right edge
             self.position[1],  # Distance to top edge
-            self.environment_config['height'] - self.position[1]  # Distance to bottom edge
+            height - self.position[1]  # Distance to bottom edge
         ]
-        min_edge_distance = min(edge_distances) / max(self.environment_config['width'], self.environment_config['height'])
+        min_edge_distance = min(edge_distances) / max(width, height)
         
         # Check for concentration of lily pads in different directions
         lily_pad_concentrations = [0, 0, 0, 0]  # left, right, up, down
@@ -302,13 +362,13 @@ class Koi:
         # Normalize inputs - expanded from 10 to include more environmental awareness
         # Core original inputs
         inputs = [
-            self.hunger / 200.0,  # Normalized hunger
-            self.position[0] / self.environment_config['width'],  # Normalized x position
-            self.position[1] / self.environment_config['height'],  # Normalized y position
-            lily_pad_info['distance'] / self.environment_config['detection_radius'],  # Normalized distance to lily pad
+            self.hunger / params.max_hunger,  # Normalized hunger
+            self.position[0] / width,  # Normalized x position
+            self.position[1] / height,  # Normalized y position
+            lily_pad_info['distance'] / detection_radius,  # Normalized distance to lily pad
             lily_pad_info['direction_x'],  # Direction to lily pad (x)
             lily_pad_info['direction_y'],  # Direction to lily pad (y)
-            koi_info['distance'] / self.environment_config['detection_radius'],  # Normalized distance to koi
+            koi_info['distance'] / detection_radius,  # Normalized distance to koi
             koi_info['direction_x'],  # Direction to koi (x)
             koi_info['direction_y'],  # Direction to koi (y)
             num_neighbors / 10.0,  # Normalized number of neighbors (schooling influence)
@@ -326,63 +386,34 @@ class Koi:
             self.food_consumed / 20.0  # How much food the koi has eaten
         ]
         
-        return inputs  # Return all 20 inputs to match updated NEAT config
+        # The vision input mode appends the field-of-view inputs
+        if self.vision_inputs is not None:
+            inputs.extend(self.vision_inputs)
+        
+        return inputs  # 20 inputs, or 26 with vision, matching num_inputs in the NEAT config
 
     def get_closest_food_info(self, nearby_food):
-        if not nearby_food:
-            return [1.0, 0.0]  # Max distance, no angle
-        
-        # Calculate vision cone parameters
-        vision_angle = 120  # Must match renderer's vision_angle
-        vision_length = 80  # Must match renderer's vision_length
-        
-        # Get current orientation angle (from velocity)
-        if hasattr(self, 'last_position'):
-            dx = self.position[0] - self.last_position[0]
-            dy = self.position[1] - self.last_position[1]
-            if dx != 0 or dy != 0:
-                current_angle = math.degrees(math.atan2(dy, dx))
-            else:
-                current_angle = 0
-        else:
-            current_angle = 0
+        """Return the normalized distance and angle of the closest food in the vision cone.
         
-        # Filter food items to only those in vision cone
-        visible_food = []
-        for food in nearby_food:
-            if food.position is None:
-                continue
-            
-            # Calculate angle and distance to food
-            food_dx = food.position[0] - self.position[0]
-            food_dy = food.position[1] - self.position[1]
-            distance = math.sqrt(food_dx*food_dx + food_dy*food_dy)
-            
-            if distance > vision_length:
-                continue
-            
-            # Calculate angle to food relative to current orientation
-            food_angle = math.degrees(math.atan2(food_dy, food_dx))
-            angle_diff = abs((food_angle - current_angle + 180) % 360 - 180)
-            
-            if angle_diff <= vision_angle/2:
-                visible_food.append((food, distance, food_angle))
-        
-        if not visible_food:
-            return [1.0, 0.0]  # Nothing in vision cone
-        
-        # Get closest visible food
-        closest_food, distance, angle = min(visible_food, key=lambda x: x[1])
+        Uses the same field of view as the batch vision sensor and the
+        renderer's cone overlay.
+        """
+        targets = [food.position for food in nearby_food if food.position is not None]
+        if not targets:
+            return [1.0, 0.0]  # Max distance, no angle
         
+        sensor = FOOD_SENSOR
+        positions, headings = sensor.poses([self])
+        distance, angle, _ = sensor.closest_visible(positions, headings, [0] * len(targets), targets)
         return [
-            min(1.0, distance / vision_length),  # Normalized distance
-            (angle - current_angle) / 180.0  # Normalized angle (-1 to 1)
+            min(1.0, float(distance[0]) / sensor.length),  # Normalized distance
+            float(angle[0])  # Angle relative to the heading (-1 to 1)
         ]
 
     def get_closest_koi_info(self, nearby_koi):
         # Default values if no koi are nearby
         result = {
-            'distance': self.environment_config['detection_radius'],
+            'distance': self.params.detection_radius,
             'direction_x': 0,
             'direction_y': 0
         }
@@ -427,33 +458,53 @@ class Koi:
 
     def reset(self, sim_config):
         """Reset koi for a new trial"""
-        self.hunger = 0
+        self.hunger = self.params.starting_hunger
         self.energy = 100
         self.steps_taken = 0
         self.food_consumed = 0
         self.movement_efficiency = 0
+        self.last_outputs = None
+        self.eaten_lily_pads = []
+        self.vision_inputs = None
+        self.aggression = 0.0
         # Keep position, species_id, and network intact
 
     def update(self, lily_pads, other_koi):
         """Update the koi state based on interactions with lily pads and other koi."""
-        # Increment steps taken
-        self.steps_taken += 1
+        self.eat(lily_pads)
+        self.metabolize()
+        self.score()
+
+    def eat(self, lily_pads):
+        """Eat the lily pads within reach, removing them from lily_pads."""
+        params = self.params
         
         # Check for lily pad consumption
         for lily_pad in lily_pads[:]:
-            if self.distance_to(lily_pad) < 10:  # If close enough to consume
-                self.hunger = max(0, self.hunger - 30)  # Reduce hunger
+            if self.distance_to(lily_pad) < params.eating_radius:  # If close enough to consume
+                self.hunger = max(0, self.hunger - params.lily_pad_value)  # Reduce hunger
                 lily_pads.remove(lily_pad)  # Remove the consumed lily pad
                 self.food_consumed += 1  # Track food consumption
-                
-        # Increase hunger over time, but at a reduced rate
-        self.hunger += 0.05  # Reduced from 0.1 to 0.05
+                self.eaten_lily_pads.append(lily_pad)
+
+    def metabolize(self):
+        """Advance hunger and energy by one step; returns False if the koi should die."""
+        params = self.params
+        
+        # Increment steps taken
+        self.steps_taken += 1
+        
+        # Increase hunger over time
+        self.hunger += params.hunger_rate
         
         # Update energy based on hunger, with a more gradual decline
         # Adjust the formula to make energy decrease more slowly
         self.energy = max(0, 100 - self.hunger / 3)  # Changed from /2 to /3 for slower energy reduction
         
-        # Calculate and update fitness
+        return self.energy > 0 and self.hunger < params.max_hunger
+
+    def score(self):
+        """Update the highest fitness reached."""
         current_fitness = self.calculate_fitness()
         self.highest_fitness = max(self.highest_fitness, current_fitness)
 
@@ -471,15 +522,16 @@ class Koi:
         
         # Exploration factor - reward for exploring the environment
         # This encourages koi to move around and not stay in one place
-        border_margin = 50  # Distance from edge to consider "edge territory"
+        params = self.params
+        border_margin = params.border_margin  # Distance from edge to consider "edge territory"
         x, y = self.position
-        width = self.environment_config['width']
-        height = self.environment_config['height']
+        width = params.environment_width
+        height = params.environment_height
         
         # Penalty for staying too close to edges
         edge_penalty = 0
         if x < border_margin or x > width - border_margin or y < border_margin or y > height - border_margin:
-            edge_penalty = 15
+            edge_penalty = params.edge_penalty
         
         # Calculate total fitness with balanced weights
         fitness = energy_factor + survival_factor + food_factor - edge_penalty
@@ -0,0 +1,336 @@
+import argparse
+import mmap
+import os
+import struct
+
+import numpy as np
+
+# File layout: fixed header, then the arrays below in order, each starting
+# on an 8-byte boundary so they can be viewed in place from a memory map
+BRAIN_MAGIC = b'KBRN'
+BRAIN_VERSION = 1
+HEADER_FORMAT = '<4sIqdIIIII'  # magic, version, genome key, fitness, inputs, outputs, nodes, connections, layers
+HEADER_SIZE = 64
+
+# name, dtype, length given the header counts (inputs, outputs, nodes, connections, layers).
+# Value slots number the network inputs first, then the evaluated nodes in order.
+SECTIONS = (
+    ('input_keys', '<i4', lambda i, o, n, c, l: i),
+    ('output_keys', '<i4', lambda i, o, n, c, l: o),
+    ('output_slots', '<i4', lambda i, o, n, c, l: o),        # Value slot of each output, -1 if never computed
+    ('node_keys', '<i4', lambda i, o, n, c, l: n),           # Evaluated nodes, in evaluation order
+    ('layer_offsets', '<i4', lambda i, o, n, c, l: l + 1),   # Nodes of layer k are [offsets[k], offsets[k + 1])
+    ('conn_offsets', '<i4', lambda i, o, n, c, l: n + 1),    # Inputs of node k are [offsets[k], offsets[k + 1])
+    ('conn_sources', '<i4', lambda i, o, n, c, l: c),        # Value slot each connection reads
+    ('conn_weights', '<f8', lambda i, o, n, c, l: c),
+    ('biases', '<f8', lambda i, o, n, c, l: n),
+    ('responses', '<f8', lambda i, o, n, c, l: n),
+    ('activations', 'u1', lambda i, o, n, c, l: n),          # Index into ACTIVATIONS
+    ('aggregations', 'u1', lambda i, o, n, c, l: n),         # Index into AGGREGATIONS
+)
+
+# numpy versions of neat-python's built-in functions, in file id order. Clamps
+# use minimum/maximum, which skip np.clip's argument handling
+def _clamp(z, low, high):
+    return np.minimum(np.maximum(z, low), high)
+
+
+ACTIVATIONS = {
+    'sigmoid': lambda z: 1.0 / (1.0 + np.exp(-_clamp(5.0 * z, -60.0, 60.0))),
+    'tanh': lambda z: np.tanh(_clamp(2.5 * z, -60.0, 60.0)),
+    'sin': lambda z: np.sin(_clamp(5.0 * z, -60.0, 60.0)),
+    'gauss': lambda z: np.exp(-5.0 * _clamp(z, -3.4, 3.4) ** 2),
+    'relu': lambda z: np.maximum(z, 0.0),
+    'softplus': lambda z: 0.2 * np.log(1 + np.exp(_clamp(5.0 * z, -60.0, 60.0))),
+    'identity': lambda z: z,
+    'clamped': lambda z: _clamp(z, -1.0, 1.0),
+    'inv': lambda z: _inv(z),
+    'log': lambda z: np.log(np.maximum(z, 1e-7)),
+    'exp': lambda z: np.exp(_clamp(z, -60.0, 60.0)),
+    'abs': np.abs,
+    'hat': lambda z: np.maximum(0.0, 1 - np.abs(z)),
+    'square': lambda z: z ** 2,
+    'cube': lambda z: z ** 3,
+}
+AGGREGATIONS = {
+    'sum': lambda x: x.sum(axis=1),
+    'product': lambda x: x.prod(axis=1),
+    'max': lambda x: x.max(axis=1),
+    'min': lambda x: x.min(axis=1),
+    'maxabs': lambda x: x[np.arange(len(x)), np.abs(x).argmax(axis=1)],
+    'median': lambda x: _median(x),
+    'mean': lambda x: x.sum(axis=1) / x.shape[1],
+}
+ACTIVATION_NAMES = tuple(ACTIVATIONS)
+AGGREGATION_NAMES = tuple(AGGREGATIONS)
+SUM = AGGREGATION_NAMES.index('sum')
+
+
+def _median(x):
+    # Same rule as neat's median2: the middle value, or the mean of the two middle values
+    x = np.sort(x, axis=1)
+    middle = x.shape[1] // 2
+    if x.shape[1] % 2:
+        return x[:, middle]
+    return (x[:, middle - 1] + x[:, middle]) / 2.0
+
+
+def _inv(z):
+    with np.errstate(divide='ignore', over='ignore'):
+        result = 1.0 / z
+    # neat returns 0 where the division fails
+    result[~np.isfinite(result)] = 0.0
+    return result
+
+
+def _aligned(size):
+    return (size + 7) & ~7
+
+
+def export_genome(genome, config, path):
+    """Write a genome's feed-forward network as a .kbrain file.
+
+    Only exporting needs neat-python; KoiBrain loads and runs the file
+    with numpy alone.
+
+    Args:
+        genome: A DefaultGenome or ArrayGenome
+        config: The neat.Config the genome was evolved with
+        path: Destination file, replaced atomically
+
+    Returns:
+        The path written
+
+    Raises:
+        ValueError: If the network uses an activation or aggregation
+            function that is not one of neat-python's built-ins
+    """
+    data = encode_genome(genome, config)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return path
+
+
+def encode_genome(genome, config):
+    """Return the .kbrain file contents for a genome (see export_genome)."""
+    from koi import create_network
+    genome_config = config.genome_config
+    network = create_network(genome, config)
+
+    activation_names = {func: name for name, func in genome_config.activation_defs.functions.items()}
+    aggregation_names = {func: name for name, func in genome_config.aggregation_function_defs.functions.items()}
+
+    input_keys = list(network.input_nodes)
+    slot_of = {key: slot for slot, key in enumerate(input_keys)}
+
+    # node_evals are in dependency order; group them into layers by depth
+    depth = dict.fromkeys(input_keys, 0)
+    evals = []
+    for position, (node, activation, aggregation, bias, response, links) in enumerate(network.node_evals):
+        depth[node] = 1 + max((depth.get(i, 0) for i, _ in links), default=0)
+        evals.append((depth[node], position, node, activation, aggregation, bias, response, links))
+    evals.sort(key=lambda entry: entry[:2])
+
+    node_keys, layer_offsets, conn_offsets = [], [0], [0]
+    conn_sources, conn_weights, biases, responses, activations, aggregations = [], [], [], [], [], []
+    for index, (node_depth, _, node, activation, aggregation, bias, response, links) in enumerate(evals):
+        if index and node_depth != evals[index - 1][0]:
+            layer_offsets.append(index)
+        try:
+            activations.append(ACTIVATION_NAMES.index(activation_names[activation]))
+            aggregations.append(AGGREGATION_NAMES.index(aggregation_names[aggregation]))
+        except (KeyError, ValueError):
+            raise ValueError(f"Node {node} uses a function the koi brain runtime does not provide") from None
+        slot_of[node] = len(input_keys) + index
+        node_keys.append(node)
+        biases.append(bias)
+        responses.append(response)
+        for i, weight in links:
+            conn_sources.append(slot_of[i])
+            conn_weights.append(weight)
+        conn_offsets.append(len(conn_sources))
+    layer_offsets.append(len(node_keys))
+    if not node_keys:
+        layer_offsets = [0]
+
+    output_keys = list(network.output_nodes)
+    values = {
+        'input_keys': input_keys,
+        'output_keys': output_keys,
+        'output_slots': [slot_of.get(key, -1) for key in output_keys],
+        'node_keys': node_keys,
+        'layer_offsets': layer_offsets,
+        'conn_offsets': conn_offsets,
+        'conn_sources': conn_sources,
+        'conn_weights': conn_weights,
+        'biases': biases,
+        'responses': responses,
+        'activations': activations,
+        'aggregations': aggregations,
+    }
+    fitness = float('nan') if genome.fitness is None else float(genome.fitness)
+    header = struct.pack(HEADER_FORMAT, BRAIN_MAGIC, BRAIN_VERSION, int(genome.key), fitness,
+                         len(input_keys), len(output_keys), len(node_keys), len(conn_sources),
+                         len(layer_offsets) - 1)
+
+    parts = [header.ljust(HEADER_SIZE, b'\0')]
+    for name, dtype, _ in SECTIONS:
+        data = np.asarray(values[name], dtype=dtype).tobytes()
+        parts.append(data.ljust(_aligned(len(data)), b'\0'))
+    return b''.join(parts)
+
+
+class KoiBrain:
+    """Numpy runtime for an exported koi network (.kbrain file).
+
+    The network is evaluated layer by layer for a whole batch of
+    observations: the sum-aggregated nodes of a layer (the common case) are
+    one matrix product over the values computed so far, other aggregations
+    gather their inputs, and activations are applied per function to the
+    layer's columns. Results match neat's FeedForwardNetwork.activate.
+    """
+
+    def __init__(self, arrays, key=None, fitness=None, buffer=None):
+        """Build the runtime from the file's arrays (see load and from_bytes).
+
+        Args:
+            arrays: Dictionary of the SECTIONS arrays
+            key: Genome key stored in the file
+            fitness: Fitness stored in the file
+            buffer: Memory map backing the arrays, kept open while they are used
+        """
+        self.arrays = arrays
+        self.key = key
+        self.fitness = fitness
+        self._buffer = buffer
+        self.num_inputs = len(arrays['input_keys'])
+        self.num_outputs = len(arrays['output_keys'])
+        self._layers = self._plan()
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a .kbrain file."""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls._parse(buffer, path, buffer)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Read a .kbrain file's contents."""
+        return cls._parse(data, 'data')
+
+    @classmethod
+    def _parse(cls, data, name, buffer=None):
+        if len(data) < HEADER_SIZE:
+            raise ValueError(f"{name} is not a koi brain file")
+        magic, version, key, fitness, *counts = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != BRAIN_MAGIC:
+            raise ValueError(f"{name} is not a koi brain file")
+        if version != BRAIN_VERSION:
+            raise ValueError(f"Unsupported koi brain version {version} in {name}")
+
+        arrays = {}
+        offset = HEADER_SIZE
+        for section, dtype, length in SECTIONS:
+            count = length(*counts)
+            arrays[section] = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            offset += _aligned(arrays[section].nbytes)
+        return cls(arrays, key, None if fitness != fitness else fitness, buffer)
+
+    def _plan(self):
+        """Precompute per-layer weight matrices and function groups."""
+        a = self.arrays
+        num_inputs = self.num_inputs
+        layers = []
+        for start, end in zip(a['layer_offsets'][:-1].tolist(), a['layer_offsets'][1:].tolist()):
+            slots = num_inputs + start  # Values available to this layer
+            count = end - start
+            nodes = range(start, end)
+            summed = [k for k in nodes if a['aggregations'][k] == SUM]
+            weights = np.zeros((slots, len(summed)))
+            for column, k in enumerate(summed):
+                lo, hi = a['conn_offsets'][k], a['conn_offsets'][k + 1]
+                np.add.at(weights[:, column], a['conn_sources'][lo:hi], a['conn_weights'][lo:hi])
+            others = []
+            for k in nodes:
+                if a['aggregations'][k] != SUM:
+                    lo, hi = a['conn_offsets'][k], a['conn_offsets'][k + 1]
+                    others.append((k - start, AGGREGATIONS[AGGREGATION_NAMES[a['aggregations'][k]]],
+                                   a['conn_sources'][lo:hi], a['conn_weights'][lo:hi]))
+            groups = {}
+            for k in nodes:
+                groups.setdefault(int(a['activations'][k]), []).append(k - start)
+            activation_groups = [(ACTIVATIONS[ACTIVATION_NAMES[act]], np.array(columns))
+                                 for act, columns in groups.items()]
+            layers.append((slots, count, np.array([k - start for k in summed], dtype=np.int64), weights,
+                           others, activation_groups, a['biases'][start:end], a['responses'][start:end]))
+        return layers
+
+    def activate_batch(self, observations):
+        """Evaluate the network for a batch of observations.
+
+        Args:
+            observations: (n, num_inputs) array-like of network inputs
+
+        Returns:
+            (n, num_outputs) array of network outputs
+        """
+        observations = np.asarray(observations, dtype=np.float64)
+        if observations.ndim != 2 or observations.shape[1] != self.num_inputs:
+            raise ValueError(f"Expected observations of shape (n, {self.num_inputs}), got {observations.shape}")
+        count = len(observations)
+        values = np.zeros((count, self.num_inputs + len(self.arrays['node_keys'])))
+        values[:, :self.num_inputs] = observations
+
+        for slots, width, summed, weights, others, activation_groups, biases, responses in self._layers:
+            totals = np.empty((count, width))
+            if len(summed):
+                totals[:, summed] = values[:, :slots] @ weights
+            for column, aggregate, sources, link_weights in others:
+                totals[:, column] = aggregate(values[:, sources] * link_weights)
+            z = biases + responses * totals
+            layer = values[:, slots:slots + width]
+            for activation, columns in activation_groups:
+                layer[:, columns] = activation(z[:, columns])
+
+        output_slots = self.arrays['output_slots']
+        outputs = values[:, np.maximum(output_slots, 0)]
+        outputs[:, output_slots < 0] = 0.0
+        return outputs
+
+    def activate(self, inputs):
+        """Evaluate one observation, like FeedForwardNetwork.activate."""
+        if len(inputs) != self.num_inputs:
+            raise RuntimeError(f"Expected {self.num_inputs} inputs, got {len(inputs)}")
+        return self.activate_batch([inputs])[0].tolist()
+
+    def close(self):
+        """Release the memory map (the brain cannot be used afterwards)."""
+        self.arrays = None
+        self._layers = None
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+
+def main():
+    """Export a pickled genome (best_koi.pkl) as a .kbrain file."""
+    parser = argparse.ArgumentParser(description="Export an evolved koi genome for the standalone runtime")
+    parser.add_argument('genome', help="Pickled genome, e.g. best_koi.pkl")
+    parser.add_argument('output', nargs='?', default=None, help="Destination .kbrain file (next to the genome by default)")
+    parser.add_argument('--config', default='config/neat-config.ini', help="NEAT configuration the genome was evolved with")
+    args = parser.parse_args()
+
+    import pickle
+    from config_cache import load_neat_config
+    with open(args.genome, 'rb') as f:
+        genome = pickle.load(f)
+    output = args.output or os.path.splitext(args.genome)[0] + '.kbrain'
+    export_genome(genome, load_neat_config(args.config), output)
+    print(f"Exported {args.genome} to {output}")
+
+
+if __name__ == '__main__':
+    main()
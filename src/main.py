@@ -1,39 +1,25 @@
-import neat
-import json
-import pygame
+from config_cache import load_neat_config, load_sim_config
 from simulation import Simulation
-from koi import Koi
-import gc
 
 print("Starting Koi Pond Simulation...")
 
 def run_simulation():
-    # Initialize pygame
-    pygame.init()
-    
     # Load configuration
-    with open('config/simulation-config.json') as f:
-        sim_config = json.load(f)
-    
-    # Set up display
-    screen_width = sim_config['screen_width']
-    screen_height = sim_config['screen_height'] 
-    screen = pygame.display.set_mode((screen_width, screen_height))
-    pygame.display.set_caption("Koi Pond Simulation")
+    sim_config = load_sim_config('config/simulation-config.json')
 
-    # Load NEAT configuration
-    config_path = 'config/neat-config.ini'
-    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
-                         config_path)
+    # pygame is only needed when a window is shown or frames are exported;
+    # the renderer sets up its own window
+    pygame = None
+    if sim_config.get('render', False) or sim_config.get('video_dir'):
+        import pygame
+        pygame.init()
 
-    # Initialize scoreboard
-    from scoreboard import Scoreboard
-    Scoreboard.initialize()
+    # Load NEAT configuration
+    config = load_neat_config('config/neat-config.ini')
 
     # Create the simulation
     simulation = Simulation(config, sim_config)
-    
+
     try:
         # Run the simulation
         winner = simulation.run()
@@ -46,16 +32,15 @@ def run_simulation():
         import traceback
         traceback.print_exc()
     finally:
-        # Explicitly clean up the simulation
+        # Explicitly clean up the simulation; this also restores the garbage
+        # collector (see gc_policy.py), which frees what the run left behind
         if 'simulation' in locals():
             simulation.cleanup()
             del simulation
-        
+
         # Clean up pygame resources
-        pygame.quit()
-        
-        # Force garbage collection to clean up any remaining resources
-        gc.collect()
+        if pygame is not None:
+            pygame.quit()
 
 if __name__ == '__main__':
     run_simulation()
@@ -2,18 +2,50 @@ import pygame
 import random
 import math
 import os
+import time
+from camera import Camera
+from sensors import VisionSensor
+
+# Koi levels of detail, from most to least expensive to draw
+LOD_FULL = 0        # Full body with patterns, fins, eyes and highlights
+LOD_SILHOUETTE = 1  # Plain body outline with a tail
+LOD_DOT = 2         # Single colored dot
 
 class Renderer:
-    def __init__(self, size):
+    def __init__(self, size, scoreboard=None, offscreen=False, frame_sink=None, world_size=None):
+        """Create the renderer.
+        
+        Args:
+            size: Pond viewport size in pixels (the scoreboard is added to the width)
+            scoreboard: Scoreboard service to display
+            offscreen: Draw to a plain pygame.Surface without opening a window
+            frame_sink: Optional object whose submit(surface, generation) receives each frame
+            world_size: (width, height) of the pond in world units, when it
+                differs from the viewport; the camera starts zoomed to fit it
+        """
+        self.offscreen = offscreen
+        self.frame_sink = frame_sink
+        if offscreen:
+            # No display is needed; the dummy driver works on headless servers
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
         pygame.init()
         
+        # Scoreboard service to display, defaulting to the process-wide one
+        if scoreboard is None:
+            from scoreboard import Scoreboard
+            scoreboard = Scoreboard.get_service()
+        self.scoreboard = scoreboard
+        
         # Define scoreboard width first
         self.scoreboard_width = 300
         
         # Create single window with extra width for scoreboard
         total_width = size + self.scoreboard_width
-        self.screen = pygame.display.set_mode((total_width, size))
-        pygame.display.set_caption("Koi Pond Simulation")
+        if offscreen:
+            self.screen = pygame.Surface((total_width, size))
+        else:
+            self.screen = pygame.display.set_mode((total_width, size))
+            pygame.display.set_caption("Koi Pond Simulation")
         
         # Define scoreboard area as a rect
         self.scoreboard_rect = pygame.Rect(size, 0, self.scoreboard_width, size)
@@ -23,17 +55,8 @@ class Renderer:
         self.species_colors = {}  # Dictionary to store colors for each species
         print(f"Renderer initialized with screen size: {size}x{size}")
 
-        # Enhanced fonts and colors
-        pygame.font.init()
-        try:
-            self.title_font = pygame.font.Font('assets/fonts/Roboto-Bold.ttf', 36)
-            self.header_font = pygame.font.Font('assets/fonts/Roboto-Medium.ttf', 28)
-            self.font = pygame.font.Font('assets/fonts/Roboto-Regular.ttf', 20)
-        except:
-            print("Falling back to default font")
-            self.title_font = pygame.font.Font(None, 36)
-            self.header_font = pygame.font.Font(None, 28)
-            self.font = pygame.font.Font(None, 20)
+        # Fonts are loaded on first use, see _load_fonts
+        self._fonts = None
 
         # Koi pond color scheme
         self.colors = {
@@ -50,6 +73,80 @@ class Renderer:
 
         # Toggle for showing koi field of vision
         self.show_vision = True
+        
+        # Scoreboard paging and ranking selection
+        self.scoreboard_page = 0
+        self.scoreboard_page_size = 5
+        self.scoreboard_rankings = ['fitness', 'recent', 'longevity']
+        self.scoreboard_ranking = 'fitness'
+        
+        # Extra key bindings registered by other components (key -> callable)
+        self.key_handlers = {}
+        
+        # Level-of-detail budgets: the most koi drawn at each detail level, and
+        # the smallest on-screen radius (pixels) worth drawing in full
+        self.lod_koi_budgets = {LOD_FULL: 60, LOD_SILHOUETTE: 400}
+        self.lod_min_full_radius = 6
+        
+        # Adaptive LOD: coarsen when frames take longer than the target allows
+        self.target_fps = 30
+        self.lod_bias = 0
+        self.frame_time = 0.0  # Exponential moving average of render time (seconds)
+        self._lod_cooldown = 0
+        
+        # Vision cones are drawn onto one transparent overlay per frame
+        self.vision_sensor = VisionSensor()  # Field of view shown by the cones
+        self._vision_overlay = pygame.Surface((size, size), pygame.SRCALPHA)
+        
+        # Camera over the pond; W/A/S/D or dragging pans, +/- or the wheel zooms
+        world_width, world_height = world_size if world_size else (size, size)
+        self.camera = Camera(size, size, world_width, world_height)
+        self.pan_step = 100  # Pixels panned per key press
+    
+    def _load_fonts(self):
+        """Load the scoreboard fonts, falling back to pygame's default font."""
+        pygame.font.init()
+        try:
+            self._fonts = (
+                pygame.font.Font('assets/fonts/Roboto-Bold.ttf', 36),
+                pygame.font.Font('assets/fonts/Roboto-Medium.ttf', 28),
+                pygame.font.Font('assets/fonts/Roboto-Regular.ttf', 20)
+            )
+        except:
+            print("Falling back to default font")
+            self._fonts = (
+                pygame.font.Font(None, 36),
+                pygame.font.Font(None, 28),
+                pygame.font.Font(None, 20)
+            )
+        return self._fonts
+
+    @property
+    def title_font(self):
+        return (self._fonts or self._load_fonts())[0]
+
+    @property
+    def header_font(self):
+        return (self._fonts or self._load_fonts())[1]
+
+    @property
+    def font(self):
+        return (self._fonts or self._load_fonts())[2]
+
+    @property
+    def vision_length(self):
+        """Length of the vision cone in world units."""
+        return self.vision_sensor.length
+
+    @property
+    def vision_angle(self):
+        """Total angle of the vision cone in degrees."""
+        return self.vision_sensor.angle
+
+    @property
+    def zoom(self):
+        """Current camera zoom (screen pixels per world unit)."""
+        return self.camera.zoom
 
     def get_species_color(self, species_id):
         """Get a consistent color for a given species ID."""
@@ -108,18 +205,101 @@ class Renderer:
         
         return self.species_colors[species_id]
 
-    def render(self, koi, lily_pads):
-        """Render the current state of the simulation."""
-        # Handle events
-        for event in pygame.event.get():
+    def select_lod(self, num_koi):
+        """Pick the koi level of detail for this frame.
+        
+        The base level comes from the koi count and zoom; the adaptive bias
+        coarsens it further while frames are over the time budget.
+        """
+        if num_koi <= self.lod_koi_budgets[LOD_FULL]:
+            lod = LOD_FULL
+        elif num_koi <= self.lod_koi_budgets[LOD_SILHOUETTE]:
+            lod = LOD_SILHOUETTE
+        else:
+            lod = LOD_DOT
+        
+        # Fish too small on screen to show their patterns
+        if lod == LOD_FULL and 10 * self.zoom < self.lod_min_full_radius:
+            lod = LOD_SILHOUETTE
+        
+        return min(LOD_DOT, lod + self.lod_bias)
+    
+    def _update_frame_budget(self, frame_seconds):
+        """Track render time and adjust the LOD bias to hold the target frame rate."""
+        self.frame_time = frame_seconds if self.frame_time == 0 else 0.9 * self.frame_time + 0.1 * frame_seconds
+        
+        # Offscreen frames are not shown in real time, keep their detail stable
+        if self.offscreen:
+            return
+        
+        # Wait a little between adjustments so the average can settle
+        if self._lod_cooldown > 0:
+            self._lod_cooldown -= 1
+            return
+        
+        budget = 1.0 / self.target_fps
+        if self.frame_time > budget and self.lod_bias < LOD_DOT:
+            self.lod_bias += 1
+            self._lod_cooldown = 30
+        elif self.frame_time < budget * 0.5 and self.lod_bias > 0:
+            self.lod_bias -= 1
+            self._lod_cooldown = 30
+    
+    def _handle_camera_event(self, event):
+        """Apply pan and zoom input to the camera."""
+        pond_rect = pygame.Rect(0, 0, self.scoreboard_rect.left, self.scoreboard_rect.height)
+        if event.type == pygame.KEYDOWN:
+            pans = {
+                pygame.K_a: (-self.pan_step, 0), pygame.K_d: (self.pan_step, 0),
+                pygame.K_w: (0, -self.pan_step), pygame.K_s: (0, self.pan_step),
+            }
+            if event.key in pans:
+                self.camera.pan(*pans[event.key])
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.camera.zoom_at(1.25)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.camera.zoom_at(0.8)
+        elif event.type == pygame.MOUSEWHEEL:
+            mouse_position = pygame.mouse.get_pos()
+            if pond_rect.collidepoint(mouse_position):
+                self.camera.zoom_at(1.25 ** event.y, mouse_position)
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0] and pond_rect.collidepoint(event.pos):
+            self.camera.pan(-event.rel[0], -event.rel[1])
+    
+    def render(self, koi, lily_pads, koi_index=None, pad_index=None):
+        """Render the current state of the simulation.
+        
+        Only koi and lily pads inside the camera view are drawn. When spatial
+        indexes (see spatial_index.SpatialHash) are given, the visible objects
+        are queried from them instead of filtering the full lists.
+        """
+        frame_start = time.perf_counter()
+        
+        # Handle events (there is no window to receive any when offscreen)
+        for event in ([] if self.offscreen else pygame.event.get()):
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
                 # Handle key press events
-                if event.key == pygame.K_v:
+                if event.key in self.key_handlers:
+                    self.key_handlers[event.key]()
+                elif event.key == pygame.K_v:
                     # Toggle vision cone display when V is pressed
                     self.show_vision = not self.show_vision
                     print(f"Vision display: {'ON' if self.show_vision else 'OFF'}")
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.scoreboard_page += 1
+                elif event.key == pygame.K_PAGEUP:
+                    self.scoreboard_page = max(0, self.scoreboard_page - 1)
+                elif event.key == pygame.K_r:
+                    # Cycle through the scoreboard rankings when R is pressed
+                    index = self.scoreboard_rankings.index(self.scoreboard_ranking)
+                    self.scoreboard_ranking = self.scoreboard_rankings[(index + 1) % len(self.scoreboard_rankings)]
+                    self.scoreboard_page = 0
+                else:
+                    self._handle_camera_event(event)
+            elif event.type in (pygame.MOUSEWHEEL, pygame.MOUSEMOTION):
+                self._handle_camera_event(event)
         
         # Fill the background with water color
         self.screen.fill(self.colors['water'])
@@ -192,14 +372,34 @@ class Renderer:
                 (refl_x - reflection_size, refl_y - reflection_size/2)
             )
         
+        # Cull everything outside the camera view (with room for bodies and vision cones)
+        left, top, right, bottom = self.camera.visible_rect(margin=self.vision_length)
+        if pad_index is not None:
+            lily_pads = pad_index.query_rect(left, top, right, bottom)
+        else:
+            lily_pads = [
+                pad for pad in lily_pads
+                if pad.position is not None and left <= pad.position[0] <= right and top <= pad.position[1] <= bottom
+            ]
+        if koi_index is not None:
+            koi = koi_index.query_rect(left, top, right, bottom)
+        else:
+            koi = [
+                fish for fish in koi
+                if fish.position is not None and left <= fish.position[0] <= right and top <= fish.position[1] <= bottom
+            ]
+        world_to_screen = self.camera.world_to_screen
+        zoom = self.camera.zoom
+        
         # Draw lily pads
         for lily_pad in lily_pads:
             # Make sure the position is valid
             if lily_pad.position is None:
                 continue
+            pad_x, pad_y = world_to_screen(lily_pad.position)
                 
             # Draw a green circle for each lily pad
-            pad_radius = 15
+            pad_radius = max(2, int(15 * zoom))
             
             # Create a more realistic lily pad with gradient and texture
             lily_surface = pygame.Surface((pad_radius*2, pad_radius*2), pygame.SRCALPHA)
@@ -239,16 +439,21 @@ class Renderer:
             # Blit the shadow with a slight offset
             self.screen.blit(
                 shadow_surface, 
-                (lily_pad.position[0] - pad_radius + 2, lily_pad.position[1] - pad_radius + 2)
+                (pad_x - pad_radius + 2, pad_y - pad_radius + 2)
             )
             
             # Blit the lily pad with slight movement
             self.screen.blit(
                 lily_surface, 
-                (lily_pad.position[0] - pad_radius + jitter_x, lily_pad.position[1] - pad_radius + jitter_y)
+                (pad_x - pad_radius + jitter_x, pad_y - pad_radius + jitter_y)
             )
         
-        # Draw koi fish
+        # Draw koi fish at the level of detail the frame budget allows
+        lod = self.select_lod(len(koi))
+        draw_vision = self.show_vision and lod != LOD_DOT
+        if draw_vision:
+            self._vision_overlay.fill((0, 0, 0, 0))
+        
         for fish in koi:
             # Skip if position is None or if the koi is not moving
             if fish.position is None or fish.last_position is None:
@@ -258,9 +463,10 @@ class Renderer:
             species_id = fish.species_id if hasattr(fish, 'species_id') else 0
             color = self.get_species_color(species_id)
             
-            # Draw the koi fish
-            size = fish.get_radius() if hasattr(fish, 'get_radius') else 10
-            is_predator = fish.species_id == 999 if hasattr(fish, 'species_id') else False
+            screen_position = world_to_screen(fish.position)
+            if lod == LOD_DOT:
+                pygame.draw.circle(self.screen, color, (int(screen_position[0]), int(screen_position[1])), 3)
+                continue
             
             # Use the koi's orientation and body flex for natural movement
             orientation = fish.orientation if hasattr(fish, 'orientation') else None
@@ -275,11 +481,34 @@ class Renderer:
                 else:
                     orientation = 0
             
-            self.draw_koi_fish(self.screen, fish.position, color, size, is_predator, orientation, body_flex)
+            if draw_vision:
+                self._draw_vision_cone(self._vision_overlay, screen_position, orientation, color)
+            
+            size = (fish.get_radius() if hasattr(fish, 'get_radius') else 10) * zoom
+            if lod == LOD_SILHOUETTE:
+                self.draw_koi_silhouette(self.screen, screen_position, color, size, orientation)
+            else:
+                is_predator = fish.species_id == 999 if hasattr(fish, 'species_id') else False
+                self.draw_koi_fish(self.screen, screen_position, color, size, is_predator, orientation, body_flex)
+        
+        # Blit every vision cone in one go
+        if draw_vision:
+            self.screen.blit(self._vision_overlay, (0, 0))
         
         # Draw the scoreboard
         self._render_scoreboard()
         
+        # Feed the adaptive level-of-detail controller
+        self._update_frame_budget(time.perf_counter() - frame_start)
+        
+        # Hand the finished frame to the exporter, if any
+        if self.frame_sink is not None:
+            self.frame_sink.submit(self.screen, self.generation)
+        
+        # Offscreen rendering is not tied to a display or real time
+        if self.offscreen:
+            return True
+        
         # Update the display
         pygame.display.flip()
         
@@ -293,9 +522,8 @@ class Renderer:
         self.generation = generation
         
         # Update the scoreboard's generation counter as well
-        from scoreboard import Scoreboard
-        if generation > Scoreboard.get_current_generation():
-            Scoreboard.set_current_generation(generation)
+        if generation > self.scoreboard.get_current_generation():
+            self.scoreboard.set_current_generation(generation)
     
     def _rotate_point(self, point, origin, angle_rad):
         """Rotate a point around an origin by the given angle in radians."""
@@ -611,9 +839,9 @@ class Renderer:
         title_rect = title_text.get_rect(centerx=self.scoreboard_rect.centerx, top=self.scoreboard_rect.top + 20)
         self.screen.blit(title_text, title_rect)
         
-        # Get generation from scoreboard if available
-        from scoreboard import Scoreboard
-        scoreboard_generation = Scoreboard.get_current_generation()
+        # Read one consistent snapshot of the scoreboard for this frame
+        snapshot = self.scoreboard.snapshot()
+        scoreboard_generation = snapshot.get_current_generation()
         
         # Use the higher generation value (local or from scoreboard)
         display_generation = max(self.generation, scoreboard_generation)
@@ -623,11 +851,24 @@ class Renderer:
         gen_rect = gen_text.get_rect(centerx=self.scoreboard_rect.centerx, top=title_rect.bottom + 20)
         self.screen.blit(gen_text, gen_rect)
         
-        # Get top species from scoreboard
-        top_species = Scoreboard.get_top_species(5)
+        # Get the current page of ranked species from the scoreboard
+        top_species, page_count = snapshot.get_species_page(
+            self.scoreboard_page, self.scoreboard_page_size, self.scoreboard_ranking
+        )
+        self.scoreboard_page = min(self.scoreboard_page, page_count - 1)
+        first_rank = self.scoreboard_page * self.scoreboard_page_size
+        
+        # Draw ranking name and page indicator
+        page_text = self.font.render(
+            f"By {self.scoreboard_ranking} - page {self.scoreboard_page + 1}/{page_count}",
+            True,
+            self.colors['text']
+        )
+        page_rect = page_text.get_rect(centerx=self.scoreboard_rect.centerx, top=gen_rect.bottom + 10)
+        self.screen.blit(page_text, page_rect)
         
         # Draw species cards
-        y_offset = gen_rect.bottom + 30
+        y_offset = page_rect.bottom + 15
         card_height = 100
         card_width = self.scoreboard_rect.width - 40
         
@@ -643,7 +884,7 @@ class Renderer:
             pygame.draw.rect(self.screen, self.colors['border'], card_rect, 2)
             
             # Draw rank
-            rank_text = self.header_font.render(f"#{i+1}", True, self.colors['highlight'])
+            rank_text = self.header_font.render(f"#{first_rank + i + 1}", True, self.colors['highlight'])
             self.screen.blit(rank_text, (card_rect.x + 10, card_rect.y + 10))
             
             # Draw koi icon - make it smaller and position it properly
@@ -692,40 +933,50 @@ class Renderer:
             
             y_offset += card_height + 10
 
+    def _draw_vision_cone(self, surface, position, orientation, color):
+        """Draw a koi's dotted vision cone onto the (transparent) overlay surface."""
+        x, y = position
+        angle = orientation if orientation is not None else 0
+        
+        # Dotted arc along the sensor's field of view
+        points = self.vision_sensor.cone_outline(position, angle, scale=self.zoom)
+        
+        # Draw dots with slight transparency
+        vision_color = (*color, 100)
+        for point in points:
+            pygame.draw.circle(surface, vision_color, point, 1)
+        
+        # Draw lines to first and last dots
+        pygame.draw.line(surface, vision_color, (x, y), points[0], 1)
+        pygame.draw.line(surface, vision_color, (x, y), points[-1], 1)
+    
+    def draw_koi_silhouette(self, screen, position, color, size, orientation=0):
+        """Draw a cheap koi outline: an oval body and a triangular tail."""
+        x, y = position
+        rad_angle = math.radians(orientation if orientation is not None else 0)
+        cos_a, sin_a = math.cos(rad_angle), math.sin(rad_angle)
+        
+        # Body and tail points in fish space (head towards +x), then rotated
+        half_length = size * 1.2
+        half_width = size * 0.7
+        shape = [
+            (half_length, 0), (half_length * 0.5, half_width), (-half_length * 0.5, half_width * 0.7),
+            (-half_length, 0), (-half_length * 0.5, -half_width * 0.7), (half_length * 0.5, -half_width)
+        ]
+        tail = [(-half_length * 0.8, 0), (-half_length * 1.5, half_width), (-half_length * 1.5, -half_width)]
+        
+        def to_screen(point):
+            return (x + point[0] * cos_a - point[1] * sin_a, y + point[0] * sin_a + point[1] * cos_a)
+        
+        pygame.draw.polygon(screen, color, [to_screen(point) for point in shape])
+        pygame.draw.polygon(screen, color, [to_screen(point) for point in tail])
+    
     def draw_koi_fish(self, screen, position, color, size, is_predator, orientation=0, body_flex=0):
         x, y = position
         
         # Use provided orientation or default to 0 (facing right)
         angle = orientation if orientation is not None else 0
         
-        # Draw vision cone (only if show_vision is True)
-        if self.show_vision:
-            vision_length = 80  # Length of vision cone
-            vision_angle = 120  # Total angle of vision cone
-            
-            # Draw dotted arc for vision range
-            radius = vision_length
-            start_angle = math.radians(angle - vision_angle/2)
-            end_angle = math.radians(angle + vision_angle/2)
-            
-            # Draw dotted arc line
-            points = []
-            num_dots = 20
-            for i in range(num_dots):
-                current_angle = start_angle + (end_angle - start_angle) * i / (num_dots - 1)
-                dot_x = x + radius * math.cos(current_angle)
-                dot_y = y + radius * math.sin(current_angle)
-                points.append((int(dot_x), int(dot_y)))
-            
-            # Draw dots with slight transparency
-            vision_color = (*color, 100)
-            for point in points:
-                pygame.draw.circle(screen, vision_color, point, 1)
-            
-            # Draw lines to first and last dots
-            pygame.draw.line(screen, vision_color, (x, y), points[0], 1)
-            pygame.draw.line(screen, vision_color, (x, y), points[-1], 1)
-        
         # Get color components
         r, g, b = color
         
@@ -0,0 +1,274 @@
+import argparse
+import os
+
+import numpy as np
+
+from telemetry import list_chunks, load_chunk, cache_paths, NUM_OUTPUTS, EVENT_PAD_CONSUMED, EVENT_PAD_SPAWNED
+
+# Row layout of the consolidated, memory-mappable frame table
+FRAME_DTYPE = np.dtype([
+    ('step', '<i4'),
+    ('koi_id', '<i8'),
+    ('species_id', '<i4'),
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('hunger', '<f4'),
+    ('energy', '<f4'),
+    ('outputs', '<f4', (NUM_OUTPUTS,)),
+])
+
+# Lily pad lifetimes: visible for spawn_step <= step < consumed_step
+PAD_DTYPE = np.dtype([
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('spawn_step', '<i4'),
+    ('consumed_step', '<i4'),
+])
+
+NEVER_CONSUMED = np.iinfo(np.int32).max
+
+
+class ReplayKoi:
+    """Koi facade for one recorded row, carrying what Renderer.render reads."""
+
+    __slots__ = ('position', 'last_position', 'species_id', 'hunger', 'energy')
+
+    def __init__(self, position, last_position, species_id, hunger, energy):
+        self.position = position
+        self.last_position = last_position
+        self.species_id = species_id
+        self.hunger = hunger
+        self.energy = energy
+
+    def get_radius(self):
+        """Koi radius is fixed, matching Koi.get_radius."""
+        return 10
+
+
+class ReplayLilyPad:
+    """Lily pad facade for a recorded pad."""
+
+    __slots__ = ('position',)
+
+    def __init__(self, position):
+        self.position = position
+
+
+class ReplayFile:
+    """Memory-mapped access to one recorded generation.
+
+    The first time a generation is opened its compressed telemetry chunks are
+    consolidated into three uncompressed .npy files next to them:
+    gen<N>_frames.npy (all koi rows in step order), gen<N>_keyframes.npy (the
+    first row of every step, so seeking is an index lookup) and gen<N>_pads.npy
+    (one lifetime record per lily pad). Later opens map those files directly,
+    unless a chunk is newer than the caches, in which case they are rebuilt.
+    """
+
+    def __init__(self, directory, generation):
+        self.directory = directory
+        self.generation = generation
+        frames_path, keyframes_path, pads_path = cache_paths(directory, generation)
+
+        if self._stale(frames_path, keyframes_path, pads_path):
+            self._consolidate(frames_path, keyframes_path, pads_path)
+
+        self.frames = np.load(frames_path, mmap_mode='r')
+        self.keyframes = np.load(keyframes_path, mmap_mode='r')
+        self.pads = np.load(pads_path, mmap_mode='r')
+        self.first_step = int(self.frames['step'][0]) if len(self.frames) else 0
+        self.num_steps = len(self.keyframes) - 1
+
+    def _stale(self, *paths):
+        """Return True if a cache is missing or older than one of the chunks."""
+        if not all(os.path.exists(path) for path in paths):
+            return True
+        built = min(os.stat(path).st_mtime_ns for path in paths)
+        return any(os.stat(path).st_mtime_ns > built for _, _, path in list_chunks(self.directory, self.generation))
+
+    def _consolidate(self, frames_path, keyframes_path, pads_path):
+        """Write the memory-mappable caches from the compressed chunks."""
+        chunks = list_chunks(self.directory, self.generation)
+        if not chunks:
+            raise FileNotFoundError(f"No telemetry recorded for generation {self.generation} in {self.directory}")
+
+        # Size the frame table first so it can be filled chunk by chunk
+        total_rows = 0
+        for _, _, path in chunks:
+            with np.load(path) as data:
+                total_rows += len(data['step'])
+
+        frames = np.lib.format.open_memmap(frames_path + '.tmp', mode='w+', dtype=FRAME_DTYPE, shape=(total_rows,))
+        event_parts = []
+        row = 0
+        for _, _, path in chunks:
+            chunk = load_chunk(path)
+            count = len(chunk['step'])
+            for name in FRAME_DTYPE.names:
+                frames[name][row:row + count] = chunk[name]
+            row += count
+            event_parts.append(np.stack([
+                chunk['event_step'].astype(np.float64),
+                chunk['event_kind'].astype(np.float64),
+                chunk['event_x'].astype(np.float64),
+                chunk['event_y'].astype(np.float64),
+            ], axis=1))
+        frames.flush()
+
+        # Keyframe index: keyframes[i] is the first row of step first_step + i
+        steps = frames['step']
+        first_step = int(steps[0]) if total_rows else 0
+        last_step = int(steps[-1]) if total_rows else -1
+        keyframes = np.searchsorted(steps, np.arange(first_step, last_step + 2), side='left').astype(np.int64)
+        del frames
+
+        pads = self._pad_lifetimes(np.concatenate(event_parts) if event_parts else np.empty((0, 4)))
+
+        np.save(keyframes_path, keyframes)
+        np.save(pads_path, pads)
+        os.replace(frames_path + '.tmp', frames_path)
+
+    @staticmethod
+    def _pad_lifetimes(events):
+        """Pair spawn and consume events (matched by position) into lifetimes."""
+        pads = []
+        alive = {}  # (x, y) -> indices of pads alive at that position
+        for step, kind, x, y in events:
+            key = (float(x), float(y))
+            if int(kind) == EVENT_PAD_SPAWNED:
+                alive.setdefault(key, []).append(len(pads))
+                pads.append([x, y, int(step), NEVER_CONSUMED])
+            elif int(kind) == EVENT_PAD_CONSUMED and alive.get(key):
+                # A pad eaten during step s is gone from frame s onwards
+                pads[alive[key].pop(0)][3] = int(step)
+        result = np.empty(len(pads), dtype=PAD_DTYPE)
+        for index, (x, y, spawn_step, consumed_step) in enumerate(pads):
+            result[index] = (x, y, spawn_step, consumed_step)
+        return result
+
+    def rows_for_step(self, step):
+        """Return the recorded koi rows of a step (a view into the mapped file)."""
+        index = step - self.first_step
+        if index < 0 or index >= self.num_steps:
+            return self.frames[0:0]
+        return self.frames[self.keyframes[index]:self.keyframes[index + 1]]
+
+    def koi_at(self, step):
+        """Return renderer-ready koi for a step."""
+        rows = self.rows_for_step(step)
+        previous = self.rows_for_step(step - 1)
+        previous_positions = {
+            int(koi_id): (float(x), float(y))
+            for koi_id, x, y in zip(previous['koi_id'], previous['x'], previous['y'])
+        }
+
+        koi = []
+        for koi_id, species_id, x, y, hunger, energy in zip(
+                rows['koi_id'], rows['species_id'], rows['x'], rows['y'], rows['hunger'], rows['energy']):
+            position = (float(x), float(y))
+            koi.append(ReplayKoi(
+                position,
+                previous_positions.get(int(koi_id), position),
+                int(species_id),
+                float(hunger),
+                float(energy)
+            ))
+        return koi
+
+    def lily_pads_at(self, step):
+        """Return renderer-ready lily pads visible at a step."""
+        pads = self.pads
+        visible = (pads['spawn_step'] <= step) & (pads['consumed_step'] > step)
+        return [ReplayLilyPad((float(x), float(y))) for x, y in zip(pads['x'][visible], pads['y'][visible])]
+
+
+class ReplayEngine:
+    """Drive a Renderer from a recorded generation instead of eval_genomes.
+
+    Playback advances `speed` recorded steps per rendered frame (fractional
+    speeds accumulate) and renders only every (frame_skip + 1)-th frame.
+    While playing, Left/Right seek by 100 steps, Up/Down double or halve the
+    speed and Space pauses.
+    """
+
+    SEEK_STEPS = 100
+
+    def __init__(self, renderer, replay_file, speed=1.0, frame_skip=0):
+        self.renderer = renderer
+        self.replay_file = replay_file
+        self.speed = speed
+        self.frame_skip = frame_skip
+        self.paused = False
+        self.position = float(replay_file.first_step)
+
+    @property
+    def step(self):
+        return int(self.position)
+
+    @property
+    def last_step(self):
+        return self.replay_file.first_step + self.replay_file.num_steps - 1
+
+    def seek(self, step):
+        """Jump to a recorded step, clamped to the recording."""
+        self.position = float(max(self.replay_file.first_step, min(self.last_step, step)))
+
+    def _install_controls(self):
+        import pygame
+        self.renderer.key_handlers.update({
+            pygame.K_RIGHT: lambda: self.seek(self.step + self.SEEK_STEPS),
+            pygame.K_LEFT: lambda: self.seek(self.step - self.SEEK_STEPS),
+            pygame.K_UP: lambda: setattr(self, 'speed', self.speed * 2),
+            pygame.K_DOWN: lambda: setattr(self, 'speed', max(0.125, self.speed / 2)),
+            pygame.K_SPACE: lambda: setattr(self, 'paused', not self.paused),
+        })
+
+    def play(self, start_step=None, end_step=None):
+        """Play the recording until its end (or end_step) or the window closes.
+
+        Returns:
+            False if the window was closed, True otherwise
+        """
+        if start_step is not None:
+            self.seek(start_step)
+        end_step = self.last_step if end_step is None else min(end_step, self.last_step)
+
+        self._install_controls()
+        self.renderer.set_generation(self.replay_file.generation)
+        frame = 0
+        while self.step <= end_step:
+            if frame % (self.frame_skip + 1) == 0:
+                step = self.step
+                if not self.renderer.render(self.replay_file.koi_at(step), self.replay_file.lily_pads_at(step)):
+                    return False
+            frame += 1
+            if not self.paused:
+                self.position += self.speed
+        return True
+
+
+def main():
+    """Replay a recorded generation in a window."""
+    parser = argparse.ArgumentParser(description="Replay recorded koi pond telemetry")
+    parser.add_argument('telemetry_dir', help="Directory written by the trajectory recorder")
+    parser.add_argument('--generation', type=int, default=None, help="Generation to replay (latest by default)")
+    parser.add_argument('--start', type=int, default=None, help="Step to start from")
+    parser.add_argument('--speed', type=float, default=1.0, help="Recorded steps advanced per frame")
+    parser.add_argument('--frame-skip', type=int, default=0, help="Frames advanced between rendered frames")
+    parser.add_argument('--size', type=int, default=1000, help="Pond window size in pixels")
+    args = parser.parse_args()
+
+    generation = args.generation
+    if generation is None:
+        chunks = list_chunks(args.telemetry_dir)
+        if not chunks:
+            parser.error(f"No telemetry found in {args.telemetry_dir}")
+        generation = chunks[-1][0]
+
+    from renderer import Renderer
+    replay_file = ReplayFile(args.telemetry_dir, generation)
+    engine = ReplayEngine(Renderer(args.size), replay_file, speed=args.speed, frame_skip=args.frame_skip)
+    engine.play(start_step=args.start)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+import math
+import random
+
+import numpy as np
+from neat.attributes import BoolAttribute, FloatAttribute, StringAttribute
+from neat.math_util import mean
+from neat.reproduction import DefaultReproduction
+
+
+def mutate_structure(genome, genome_config):
+    """Apply the structural half of DefaultGenome.mutate (add/delete nodes and connections)."""
+    config = genome_config
+    if config.single_structural_mutation:
+        div = max(1, (config.node_add_prob + config.node_delete_prob +
+                      config.conn_add_prob + config.conn_delete_prob))
+        r = random.random()
+        if r < (config.node_add_prob / div):
+            genome.mutate_add_node(config)
+        elif r < ((config.node_add_prob + config.node_delete_prob) / div):
+            genome.mutate_delete_node(config)
+        elif r < ((config.node_add_prob + config.node_delete_prob +
+                   config.conn_add_prob) / div):
+            genome.mutate_add_connection(config)
+        elif r < ((config.node_add_prob + config.node_delete_prob +
+                   config.conn_add_prob + config.conn_delete_prob) / div):
+            genome.mutate_delete_connection()
+    else:
+        if random.random() < config.node_add_prob:
+            genome.mutate_add_node(config)
+
+        if random.random() < config.node_delete_prob:
+            genome.mutate_delete_node(config)
+
+        if random.random() < config.conn_add_prob:
+            genome.mutate_add_connection(config)
+
+        if random.random() < config.conn_delete_prob:
+            genome.mutate_delete_connection()
+
+
+class AttributeMutator:
+    """Mutates one gene attribute across many genes with numpy.
+
+    Applies the same rules as the attribute's mutate_value: float attributes
+    are perturbed with probability mutate_rate, otherwise replaced with a
+    fresh initial value with probability replace_rate, and clamped; bool
+    attributes are re-drawn with probability mutate_rate (plus the
+    rate_to_*_add for the current value); string attributes are re-drawn
+    from their options with probability mutate_rate.
+    """
+
+    def __init__(self, attribute, genome_config):
+        self.attribute = attribute
+        self.name = attribute.name
+        self.config = genome_config
+
+    def _setting(self, item):
+        return getattr(self.config, self.attribute.config_item_name(item))
+
+    def mutate(self, genes, rng):
+        """Mutate the attribute on every gene in genes.
+
+        Args:
+            genes: Gene objects carrying the attribute
+            rng: numpy Generator
+        """
+        if not genes:
+            return
+        name = self.name
+        attribute = self.attribute
+        if isinstance(attribute, FloatAttribute):
+            values = np.fromiter((getattr(gene, name) for gene in genes), dtype=np.float64, count=len(genes))
+            values, changed = self.mutate_floats(values, rng)
+            self._write(genes, changed, values[changed].tolist())
+        elif isinstance(attribute, BoolAttribute):
+            values = np.fromiter((bool(getattr(gene, name)) for gene in genes), dtype=bool, count=len(genes))
+            values, changed = self.mutate_bools(values, rng)
+            self._write(genes, changed, values[changed].tolist())
+        elif isinstance(attribute, StringAttribute):
+            changed, picks = self.draw_options(len(genes), rng)
+            options = self._setting('options')
+            self._write(genes, changed, [options[pick] for pick in picks.tolist()])
+        else:
+            # Attribute types neat may add later fall back to the per-gene path
+            for gene in genes:
+                setattr(gene, name, attribute.mutate_value(getattr(gene, name), self.config))
+
+    def _write(self, genes, changed, values):
+        name = self.name
+        for index, value in zip(np.flatnonzero(changed).tolist(), values):
+            setattr(genes[index], name, value)
+
+    def mutate_floats(self, values, rng):
+        """Mutate a float64 array in place.
+
+        Returns:
+            (values, mask of the entries that changed)
+        """
+        count = len(values)
+        mutate_rate = self._setting('mutate_rate')
+        replace_rate = self._setting('replace_rate')
+
+        r = rng.random(count)
+        perturb = r < mutate_rate
+        replace = ~perturb & (r < mutate_rate + replace_rate)
+        changed = perturb | replace
+        if changed.any():
+            values[perturb] += rng.normal(0.0, self._setting('mutate_power'), int(perturb.sum()))
+            values[replace] = self.initial_values(int(replace.sum()), rng)
+            np.clip(values, self._setting('min_value'), self._setting('max_value'), out=values)
+        return values, changed
+
+    def initial_values(self, count, rng):
+        """Draw count initial values of a float attribute."""
+        mean_value, stdev = self._setting('init_mean'), self._setting('init_stdev')
+        init_type = self._setting('init_type').lower()
+        if 'gauss' in init_type or 'normal' in init_type:
+            return np.clip(rng.normal(mean_value, stdev, count), self._setting('min_value'), self._setting('max_value'))
+        if 'uniform' in init_type:
+            low = max(self._setting('min_value'), mean_value - 2 * stdev)
+            high = min(self._setting('max_value'), mean_value + 2 * stdev)
+            return rng.uniform(low, high, count)
+        raise RuntimeError(f"Unknown init_type {init_type!r} for {self.attribute.init_type_name}")
+
+    def mutate_bools(self, values, rng):
+        """Mutate a bool array in place.
+
+        Returns:
+            (values, mask of the entries that were re-drawn)
+        """
+        rates = np.where(values, self._setting('rate_to_false_add'), self._setting('rate_to_true_add'))
+        rates += self._setting('mutate_rate')
+        changed = rng.random(len(values)) < rates
+        if changed.any():
+            values[changed] = rng.random(int(changed.sum())) < 0.5
+        return values, changed
+
+    def draw_options(self, count, rng):
+        """Decide which of count string attributes are re-drawn, and to which option.
+
+        Returns:
+            (mask of the re-drawn entries, option indices for them)
+        """
+        mutate_rate = self._setting('mutate_rate')
+        if mutate_rate <= 0:
+            return np.zeros(count, dtype=bool), np.empty(0, dtype=np.int64)
+        changed = rng.random(count) < mutate_rate
+        picks = rng.integers(len(self._setting('options')), size=int(changed.sum()))
+        return changed, picks
+
+
+class BatchReproduction(DefaultReproduction):
+    """DefaultReproduction with attribute mutation done for the whole offspring at once.
+
+    Parent selection, elitism, crossover and structural mutation (adding and
+    deleting nodes and connections) are unchanged and stay per genome. The
+    attribute half of DefaultGenome.mutate (weights, biases, responses,
+    enabled flags, activation and aggregation functions) is applied after
+    all offspring exist: every attribute is gathered from all new genes into
+    one array, mutated with numpy draws and written back only where it
+    changed. Children are ordinary DefaultGenome objects.
+
+    The numpy generator is seeded from the random module on every call, so
+    seeded runs stay reproducible. It reads the [DefaultReproduction] section.
+    """
+
+    def reproduce(self, config, species, pop_size, generation):
+        """Create the next generation (see DefaultReproduction.reproduce)."""
+        # Filter out stagnated species, collect the set of non-stagnated
+        # species members, and compute their average adjusted fitness.
+        all_fitnesses = []
+        remaining_species = []
+        for stag_sid, stag_s, stagnant in self.stagnation.update(species, generation):
+            if stagnant:
+                self.reporters.species_stagnant(stag_sid, stag_s)
+            else:
+                all_fitnesses.extend(m.fitness for m in stag_s.members.values())
+                remaining_species.append(stag_s)
+
+        # No species left.
+        if not remaining_species:
+            species.species = {}
+            return {}
+
+        # Find minimum/maximum fitness across the entire population, for use in
+        # species adjusted fitness computation.
+        min_fitness = min(all_fitnesses)
+        max_fitness = max(all_fitnesses)
+        # Do not allow the fitness range to be zero, as we divide by it below.
+        fitness_range = max(1.0, max_fitness - min_fitness)
+        for afs in remaining_species:
+            msf = mean([m.fitness for m in afs.members.values()])
+            afs.adjusted_fitness = (msf - min_fitness) / fitness_range
+
+        adjusted_fitnesses = [s.adjusted_fitness for s in remaining_species]
+        avg_adjusted_fitness = mean(adjusted_fitnesses)
+        self.reporters.info("Average adjusted fitness: {:.3f}".format(avg_adjusted_fitness))
+
+        # Compute the number of new members for each species in the new generation.
+        previous_sizes = [len(s.members) for s in remaining_species]
+        min_species_size = max(self.reproduction_config.min_species_size, self.reproduction_config.elitism)
+        spawn_amounts = self.compute_spawn(adjusted_fitnesses, previous_sizes, pop_size, min_species_size)
+
+        new_population = {}
+        children = []
+        species.species = {}
+        for spawn, s in zip(spawn_amounts, remaining_species):
+            # If elitism is enabled, each species always at least gets to retain its elites.
+            spawn = max(spawn, self.reproduction_config.elitism)
+            assert spawn > 0
+
+            # The species has at least one member for the next generation, so retain it.
+            old_members = list(s.members.items())
+            s.members = {}
+            species.species[s.key] = s
+
+            # Sort members in order of descending fitness.
+            old_members.sort(reverse=True, key=lambda x: x[1].fitness)
+
+            # Transfer elites to new generation.
+            if self.reproduction_config.elitism > 0:
+                for i, m in old_members[:self.reproduction_config.elitism]:
+                    new_population[i] = m
+                    spawn -= 1
+
+            if spawn <= 0:
+                continue
+
+            # Only use the survival threshold fraction to use as parents for the next generation.
+            repro_cutoff = int(math.ceil(self.reproduction_config.survival_threshold * len(old_members)))
+            # Use at least two parents no matter what the threshold fraction result is.
+            repro_cutoff = max(repro_cutoff, 2)
+            old_members = old_members[:repro_cutoff]
+
+            # Randomly choose parents and produce the number of offspring allotted to the species.
+            while spawn > 0:
+                spawn -= 1
+
+                parent1_id, parent1 = random.choice(old_members)
+                parent2_id, parent2 = random.choice(old_members)
+
+                gid = next(self.genome_indexer)
+                child = config.genome_type(gid)
+                child.configure_crossover(parent1, parent2, config.genome_config)
+                mutate_structure(child, config.genome_config)
+                children.append(child)
+                new_population[gid] = child
+                self.ancestors[gid] = (parent1_id, parent2_id)
+
+        self.mutate_attributes(children, config.genome_config)
+        return new_population
+
+    def mutate_attributes(self, genomes, genome_config):
+        """Mutate the node and connection attributes of genomes in numpy batches.
+
+        Args:
+            genomes: Genomes whose genes are mutated in place
+            genome_config: The genome config with the attribute mutation settings
+        """
+        if not genomes:
+            return
+        rng = np.random.default_rng(random.getrandbits(64))
+        # Genome classes that keep their genes in arrays mutate them directly
+        batch = getattr(type(genomes[0]), 'mutate_attributes', None)
+        if batch is not None:
+            batch(genomes, genome_config, rng)
+            return
+
+        connections = [gene for genome in genomes for gene in genome.connections.values()]
+        nodes = [gene for genome in genomes for gene in genome.nodes.values()]
+        for gene_type, genes in ((genome_config.connection_gene_type, connections),
+                                 (genome_config.node_gene_type, nodes)):
+            for attribute in gene_type._gene_attributes:
+                AttributeMutator(attribute, genome_config).mutate(genes, rng)
@@ -1,85 +1,393 @@
-import pygame
+import queue
+import threading
+import multiprocessing
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+
+def _fitness_key(record):
+    return record['highest_fitness']
+
+def _recent_key(record):
+    return record['last_generation']
+
+def _longevity_key(record):
+    return record['last_generation'] - record['first_generation']
+
+# Ranking name -> key extracted from a species record (higher ranks first).
+# Named functions rather than lambdas keep the rankings picklable.
+RANKINGS = {
+    'fitness': _fitness_key,
+    'recent': _recent_key,
+    'longevity': _longevity_key,
+}
+
+class SpeciesRanking:
+    """Species ids kept in descending order of a record key.
+    
+    Entries are (negated key, species_id) tuples in a sorted list, so an update
+    is a binary search plus one list insertion and a top-K query is a slice.
+    """
+    
+    def __init__(self, key_func):
+        self.key_func = key_func
+        self._entries = []
+        self._entry_for = {}  # species_id -> current entry
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def update(self, species_id, record):
+        """Insert the species or move it to the position of its new key."""
+        old_entry = self._entry_for.get(species_id)
+        if old_entry is not None:
+            del self._entries[bisect_left(self._entries, old_entry)]
+        entry = (-self.key_func(record), species_id)
+        insort(self._entries, entry)
+        self._entry_for[species_id] = entry
+    
+    def top(self, n, offset=0):
+        """Return the species ids ranked offset .. offset + n - 1."""
+        return [species_id for _, species_id in self._entries[offset:offset + n]]
+    
+    def copy(self):
+        """Return an independent copy of the ranking."""
+        ranking = SpeciesRanking(self.key_func)
+        ranking._entries = list(self._entries)
+        ranking._entry_for = dict(self._entry_for)
+        return ranking
+
+class HistoryView(Sequence):
+    """Read-only view of the first entries of an append-only history list.
+    
+    Species histories only ever grow, so a snapshot can share the live list
+    and remember its length instead of copying it.
+    """
+    
+    __slots__ = ('_history', '_length')
+    
+    def __init__(self, history):
+        self._history = history
+        self._length = len(history)
+    
+    def __len__(self):
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._history[i] for i in range(self._length)[index])
+        return self._history[range(self._length)[index]]
+    
+    def __eq__(self, other):
+        if isinstance(other, (HistoryView, tuple, list)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash(tuple(self))
+    
+    def __repr__(self):
+        return f"HistoryView({tuple(self)!r})"
+
+class ScoreboardSnapshot:
+    """Immutable, consistent view of a scoreboard at one moment.
+    
+    Readers such as a render thread query a snapshot instead of the live
+    service, so they never observe a half-applied batch of updates.
+    """
+    
+    def __init__(self, records, rankings, current_generation, version):
+        self._records = records
+        self._rankings = rankings
+        self.current_generation = current_generation
+        self.version = version
+    
+    def get_records(self):
+        """Get all recorded species information."""
+        return self._records
+    
+    def get_species_record(self, species_id):
+        """Get information about a specific species."""
+        return self._records.get(species_id)
+    
+    def get_current_generation(self):
+        """Get the generation number at the time of the snapshot."""
+        return self.current_generation
+    
+    def get_top_species(self, n=5, ranking='fitness', offset=0):
+        """Get the top n species under a ranking, skipping the first offset.
+        
+        Args:
+            n: Number of species to return
+            ranking: One of RANKINGS ('fitness', 'recent' or 'longevity')
+            offset: Number of higher-ranked species to skip
+            
+        Returns:
+            A list of (species_id, record) tuples
+        """
+        if ranking not in self._rankings:
+            raise ValueError(f"Unknown ranking '{ranking}', expected one of {sorted(self._rankings)}")
+        species_ids = self._rankings[ranking].top(n, offset)
+        return [(species_id, self._records[species_id]) for species_id in species_ids]
+    
+    def get_species_page(self, page, page_size=5, ranking='fitness'):
+        """Get one page of ranked species for the scoreboard UI.
+        
+        Returns:
+            A (species, page_count) tuple where species is a list of
+            (species_id, record) tuples
+        """
+        page_count = max(1, -(-len(self._records) // page_size))
+        page = max(0, min(page, page_count - 1))
+        return self.get_top_species(page_size, ranking, page * page_size), page_count
+
+class ScoreboardClient:
+    """Picklable handle that worker processes use to submit species results.
+    
+    Results are queued as plain tuples and applied by the owning
+    ScoreboardService when it drains its queue.
+    """
+    
+    def __init__(self, submission_queue):
+        self.submission_queue = submission_queue
+    
+    def record_species(self, species_id, fitness, generation, size):
+        """Queue a species result for the owning scoreboard."""
+        self.submission_queue.put((species_id, fitness, generation, size))
+    
+    def set_current_generation(self, generation):
+        """Queue a generation update for the owning scoreboard."""
+        self.submission_queue.put((None, None, generation, None))
+
+class ScoreboardService:
+    """Scoreboard that tracks the best performing koi species of one simulation.
+    
+    All mutation happens under a lock, either directly through record_species or
+    in batches drained from a submission queue filled by worker processes.
+    Readers take snapshots, which are cached until the next update.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._species_records = {}
+        self._rankings = {name: SpeciesRanking(key) for name, key in RANKINGS.items()}
+        self._current_generation = 0
+        self._version = 0
+        self._snapshot = None
+        self._changed = set()  # Species updated since the last snapshot
+        self._queue = None
+    
+    def __getstate__(self):
+        """Return state for copying, excluding the lock and submission queue."""
+        with self._lock:
+            state = self.__dict__.copy()
+        del state['_lock']
+        state['_queue'] = None
+        state['_snapshot'] = None
+        state['_changed'] = set()
+        return state
+    
+    def __setstate__(self, state):
+        """Restore state and recreate the lock."""
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def reset(self):
+        """Clear all species records and the generation counter."""
+        with self._lock:
+            self._species_records = {}
+            self._rankings = {name: SpeciesRanking(key) for name, key in RANKINGS.items()}
+            self._current_generation = 0
+            self._version += 1
+            self._snapshot = None  # The next snapshot starts from the empty records
+            self._changed = set()
+    
+    def _apply(self, species_id, fitness, generation, size):
+        """Apply one species result; the caller holds the lock."""
+        # Use existing scientific name or generate a new one
+        record = self._species_records.get(species_id)
+        if record is None:
+            from koi import Koi
+            record = {
+                'scientific_name': Koi.generate_scientific_name(),
+                'first_generation': generation,
+                'generation_history': []
+            }
+            self._species_records[species_id] = record
+        
+        # Track the current generation for debugging and visualization
+        self._current_generation = max(self._current_generation, generation)
+        
+        # Print debug information
+        print(f"Recording species {species_id} in generation {generation} (current max: {self._current_generation})")
+        
+        # Update the record, appending to the existing history in place
+        record['highest_fitness'] = fitness
+        record['last_generation'] = generation
+        record['size'] = size
+        record['generation_history'].append((generation, fitness))
+        
+        # Keep every ranking in order
+        for ranking in self._rankings.values():
+            ranking.update(species_id, record)
+        
+        self._changed.add(species_id)
+        return record
+    
+    def record_species(self, species_id, koi, fitness, generation, config=None):
+        """Record information about a koi species in the scoreboard."""
+        # Get the visual properties directly from the koi
+        size = koi.get_radius() * 2  # Convert radius to diameter for size
+        with self._lock:
+            record = self._apply(species_id, fitness, generation, size)
+            self._version += 1
+            return record
+    
+    def client(self):
+        """Return a picklable client that submits results through a queue."""
+        with self._lock:
+            if self._queue is None:
+                self._queue = multiprocessing.Queue()
+            return ScoreboardClient(self._queue)
+    
+    def drain(self):
+        """Apply every queued submission as one batch.
+        
+        Returns:
+            The number of submissions applied
+        """
+        if self._queue is None:
+            return 0
+        
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        if batch:
+            with self._lock:
+                for species_id, fitness, generation, size in batch:
+                    if species_id is None:
+                        self._current_generation = generation
+                    else:
+                        self._apply(species_id, fitness, generation, size)
+                self._version += 1
+        return len(batch)
+    
+    def snapshot(self):
+        """Return a consistent, read-only snapshot of the scoreboard.
+        
+        A new snapshot reuses the previous one's records and copies only the
+        species updated since. Histories are shared as HistoryViews, so
+        the cost does not grow with the length of the run.
+        """
+        with self._lock:
+            previous = self._snapshot
+            if previous is None or previous.version != self._version:
+                if previous is None:
+                    changed = self._species_records.keys()
+                    records = {}
+                else:
+                    changed = self._changed
+                    records = dict(previous.get_records()) if changed else previous.get_records()
+                for species_id in changed:
+                    record = self._species_records[species_id]
+                    records[species_id] = dict(record, generation_history=HistoryView(record['generation_history']))
+                self._changed = set()
+                
+                if previous is not None and not changed:
+                    rankings = previous._rankings
+                else:
+                    rankings = {name: ranking.copy() for name, ranking in self._rankings.items()}
+                self._snapshot = ScoreboardSnapshot(records, rankings, self._current_generation, self._version)
+            return self._snapshot
+    
+    def get_records(self):
+        """Get all recorded species information."""
+        return self.snapshot().get_records()
+    
+    def get_species_record(self, species_id):
+        """Get information about a specific species."""
+        return self.snapshot().get_species_record(species_id)
+    
+    def get_top_species(self, n=5, ranking='fitness', offset=0):
+        """Get the top n species under a ranking, skipping the first offset."""
+        return self.snapshot().get_top_species(n, ranking, offset)
+    
+    def get_species_page(self, page, page_size=5, ranking='fitness'):
+        """Get one page of ranked species for the scoreboard UI."""
+        return self.snapshot().get_species_page(page, page_size, ranking)
+    
+    def get_current_generation(self):
+        """Get the current generation number as tracked by the scoreboard."""
+        return self._current_generation
+    
+    def set_current_generation(self, generation):
+        """Set the current generation number manually."""
+        with self._lock:
+            self._current_generation = generation
+            self._version += 1
+        print(f"Scoreboard generation explicitly set to {generation}")
 
 class Scoreboard:
-    """Scoreboard to track the best performing koi species throughout the simulation."""
+    """Process-wide default scoreboard, kept for callers without a service.
     
-    _species_records = {}
+    Every classmethod delegates to a shared ScoreboardService instance.
+    Simulations create their own service instead of mutating this one.
+    """
+    
+    _service = ScoreboardService()
     _initialized = False
-    _current_generation = 0  # Add a class-level generation counter
+    
+    @classmethod
+    def get_service(cls):
+        """Get the default scoreboard service."""
+        return cls._service
     
     @classmethod
     def initialize(cls):
         """Initialize the scoreboard."""
-        cls._species_records = {}
+        cls._service.reset()
         cls._initialized = True
-        cls._current_generation = 0
     
     @classmethod
     def record_species(cls, species_id, koi, fitness, generation, config):
         """Record information about a koi species in the scoreboard."""
-        # Use existing scientific name or generate a new one
-        scientific_name = None
-        if species_id in cls._species_records:
-            scientific_name = cls._species_records[species_id]['scientific_name']
-        else:
-            from koi import Koi
-            scientific_name = Koi.generate_scientific_name()
-            
-        # Get the visual properties directly from the koi
-        size = koi.get_radius() * 2  # Convert radius to diameter for size
-        
-        # Track the current generation for debugging and visualization
-        cls._current_generation = max(cls._current_generation, generation)
-        
-        # Print debug information
-        print(f"Recording species {species_id} in generation {generation} (current max: {cls._current_generation})")
-        
-        # Record the species information
-        cls._species_records[species_id] = {
-            'scientific_name': scientific_name,
-            'highest_fitness': fitness,
-            'first_generation': cls._species_records.get(species_id, {}).get('first_generation', generation),
-            'last_generation': generation,
-            'size': size,
-            'generation_history': cls._species_records.get(species_id, {}).get('generation_history', []) + [(generation, fitness)]
-        }
-        
-        return cls._species_records[species_id]
+        return cls._service.record_species(species_id, koi, fitness, generation, config)
     
     @classmethod
     def get_records(cls):
         """Get all recorded species information."""
-        return cls._species_records
+        return cls._service.get_records()
     
     @classmethod
     def get_species_record(cls, species_id):
         """Get information about a specific species."""
-        return cls._species_records.get(species_id)
+        return cls._service.get_species_record(species_id)
     
     @classmethod
     def reset(cls):
         """Reset the scoreboard."""
-        cls._species_records = {}
+        cls._service.reset()
         cls._initialized = False
-        cls._current_generation = 0
         
     @classmethod
-    def get_top_species(cls, n=5):
-        """Get the top n species by fitness."""
-        sorted_species = sorted(
-            cls._species_records.items(),
-            key=lambda x: x[1]['highest_fitness'],
-            reverse=True
-        )
-        return sorted_species[:n]
+    def get_top_species(cls, n=5, ranking='fitness', offset=0):
+        """Get the top n species by fitness (or another ranking)."""
+        return cls._service.get_top_species(n, ranking, offset)
+    
+    @classmethod
+    def get_species_page(cls, page, page_size=5, ranking='fitness'):
+        """Get one page of ranked species for the scoreboard UI."""
+        return cls._service.get_species_page(page, page_size, ranking)
         
     @classmethod
     def get_current_generation(cls):
         """Get the current generation number as tracked by the scoreboard."""
-        return cls._current_generation
+        return cls._service.get_current_generation()
     
     @classmethod
     def set_current_generation(cls, generation):
         """Set the current generation number manually."""
-        cls._current_generation = generation
-        print(f"Scoreboard generation explicitly set to {generation}")
\ No newline at end of file
+        cls._service.set_current_generation(generation)
@@ -0,0 +1,212 @@
+import configparser
+import math
+
+# Field of view shared by the vision sensor and the renderer's cone overlay
+VISION_LENGTH = 80  # Reach of the cone in world units
+VISION_ANGLE = 120  # Total opening of the cone in degrees
+
+# Network inputs per input mode: Koi.get_inputs provides the basic 20, the
+# vision mode appends VisionSensor.NUM_INPUTS field-of-view inputs
+BASIC_INPUTS = 20
+INPUT_MODES = ('basic', 'vision')
+
+SECTION = 'KoiSensors'
+
+
+class SensorConfig:
+    """Sensor settings read from the [KoiSensors] section of neat-config.ini."""
+
+    def __init__(self, input_mode='basic', vision_length=VISION_LENGTH, vision_angle=VISION_ANGLE):
+        if input_mode not in INPUT_MODES:
+            raise ValueError(f"Unknown input_mode '{input_mode}' in [{SECTION}], expected one of {', '.join(INPUT_MODES)}")
+        self.input_mode = input_mode
+        self.vision_length = vision_length
+        self.vision_angle = vision_angle
+
+    @property
+    def num_inputs(self):
+        """Number of network inputs the input mode produces."""
+        if self.input_mode == 'vision':
+            return BASIC_INPUTS + VisionSensor.NUM_INPUTS
+        return BASIC_INPUTS
+
+    def create_sensor(self):
+        """Return the batch sensor for the input mode (None for basic inputs)."""
+        if self.input_mode == 'vision':
+            return VisionSensor(self.vision_length, self.vision_angle)
+        return None
+
+
+def load_sensor_config(path, neat_config=None):
+    """Read the [KoiSensors] section of a NEAT config file.
+
+    The section is optional; without it koi use the basic inputs. neat-python
+    ignores sections it does not know, so the settings can live next to the
+    genome settings they depend on.
+
+    Args:
+        path: Path of neat-config.ini
+        neat_config: Parsed neat.Config whose num_inputs is checked against
+            the input mode
+
+    Returns:
+        A SensorConfig
+
+    Raises:
+        ValueError: If the input mode is unknown or num_inputs does not match it
+    """
+    parser = configparser.ConfigParser()
+    with open(path) as f:
+        parser.read_file(f)
+
+    sensor_config = SensorConfig()
+    if parser.has_section(SECTION):
+        section = parser[SECTION]
+        sensor_config = SensorConfig(
+            input_mode=section.get('input_mode', 'basic').strip(),
+            vision_length=section.getfloat('vision_length', VISION_LENGTH),
+            vision_angle=section.getfloat('vision_angle', VISION_ANGLE)
+        )
+
+    if neat_config is not None:
+        num_inputs = neat_config.genome_config.num_inputs
+        if num_inputs != sensor_config.num_inputs:
+            raise ValueError(
+                f"input_mode '{sensor_config.input_mode}' produces {sensor_config.num_inputs} inputs "
+                f"but num_inputs is {num_inputs} in {path}"
+            )
+    return sensor_config
+
+
+class VisionSensor:
+    """Field-of-view sensing for every koi at once.
+
+    A target is visible when it is within `length` of the koi and inside the
+    cone of `angle` degrees around the koi's heading (its last movement, or
+    +x when it has not moved). Instead of an atan2 per pair, visibility is a
+    dot product of the offset with the unit heading compared against
+    cos(angle / 2), computed with numpy for all candidate pairs together.
+    Candidates come from the spatial indexes, so only nearby pairs are tested.
+    """
+
+    NUM_INPUTS = 6
+
+    def __init__(self, length=VISION_LENGTH, angle=VISION_ANGLE):
+        self.length = length
+        self.angle = angle
+        self.cos_half_angle = math.cos(math.radians(angle / 2))
+
+    def poses(self, koi_list):
+        """Return (n, 2) arrays of the koi positions and unit heading vectors."""
+        import numpy as np
+        positions = np.array([fish.position for fish in koi_list], dtype=float).reshape(-1, 2)
+        last = np.array([fish.last_position for fish in koi_list], dtype=float).reshape(-1, 2)
+        headings = positions - last
+        norms = np.hypot(headings[:, 0], headings[:, 1])
+        still = norms == 0
+        headings[still] = (1.0, 0.0)
+        norms[still] = 1.0
+        headings /= norms[:, None]
+        return positions, headings
+
+    def closest_visible(self, positions, headings, owners, targets):
+        """Return (distance, angle, count) arrays of the closest visible target per koi.
+
+        Args:
+            positions: (n, 2) koi positions
+            headings: (n, 2) unit headings
+            owners: Index of the koi each candidate target belongs to
+            targets: Positions of the candidate targets
+        """
+        import numpy as np
+        count = len(positions)
+        distance = np.full(count, float(self.length))
+        angle = np.zeros(count)
+        visible_count = np.zeros(count)
+        if not len(owners):
+            return distance, angle, visible_count
+
+        owners = np.asarray(owners)
+        offsets = np.asarray(targets, dtype=float) - positions[owners]
+        owner_headings = headings[owners]
+        dist = np.hypot(offsets[:, 0], offsets[:, 1])
+        forward = offsets[:, 0] * owner_headings[:, 0] + offsets[:, 1] * owner_headings[:, 1]
+        visible = (dist <= self.length) & (forward >= self.cos_half_angle * dist)
+        if not visible.any():
+            return distance, angle, visible_count
+
+        owners, offsets, owner_headings = owners[visible], offsets[visible], owner_headings[visible]
+        dist, forward = dist[visible], forward[visible]
+        visible_count = np.bincount(owners, minlength=count).astype(float)
+
+        # The first entry of each owner, ordered by distance, is its closest target
+        order = np.lexsort((dist, owners))
+        first_owners, first = np.unique(owners[order], return_index=True)
+        closest = order[first]
+        distance[first_owners] = dist[closest]
+        cross = owner_headings[closest, 0] * offsets[closest, 1] - owner_headings[closest, 1] * offsets[closest, 0]
+        angle[first_owners] = np.arctan2(cross, forward[closest]) / math.pi
+        return distance, angle, visible_count
+
+    def sense(self, koi_list, pad_index, koi_index):
+        """Compute the vision inputs of every koi.
+
+        Args:
+            koi_list: The koi to sense for
+            pad_index: Spatial index of the lily pads
+            koi_index: Spatial index of the koi
+
+        Returns:
+            An (n, NUM_INPUTS) array per koi: closest visible pad distance
+            and angle, visible pad count, then the same for other koi.
+            Distances are normalized by the cone length (1 when nothing is
+            seen), angles are relative to the heading in [-1, 1] and counts
+            are divided by 10.
+        """
+        import numpy as np
+        positions, headings = self.poses(koi_list)
+        length = self.length
+
+        pad_owners, pad_targets, koi_owners, koi_targets = [], [], [], []
+        for index, fish in enumerate(koi_list):
+            for lily_pad in pad_index.query_radius(fish.position, length):
+                pad_owners.append(index)
+                pad_targets.append(lily_pad.position)
+            for other in koi_index.query_radius(fish.position, length):
+                if other is not fish:
+                    koi_owners.append(index)
+                    koi_targets.append(other.position)
+
+        pad_distance, pad_angle, pad_count = self.closest_visible(positions, headings, pad_owners, pad_targets)
+        koi_distance, koi_angle, koi_count = self.closest_visible(positions, headings, koi_owners, koi_targets)
+        return np.column_stack([
+            pad_distance / length, pad_angle, pad_count / 10.0,
+            koi_distance / length, koi_angle, koi_count / 10.0,
+        ])
+
+    def assign(self, koi_list, pad_index, koi_index):
+        """Sense for every koi and store the result in each koi's vision_inputs."""
+        if not koi_list:
+            return
+        inputs = self.sense(koi_list, pad_index, koi_index).tolist()
+        for fish, row in zip(koi_list, inputs):
+            fish.vision_inputs = row
+
+    def cone_outline(self, origin, orientation, scale=1.0, num_points=20):
+        """Return points along the cone's arc, for drawing the field of view.
+
+        Args:
+            origin: Cone apex in screen coordinates
+            orientation: Heading in degrees
+            scale: Screen pixels per world unit
+            num_points: Number of points along the arc
+        """
+        x, y = origin
+        radius = self.length * scale
+        start = math.radians(orientation - self.angle / 2)
+        end = math.radians(orientation + self.angle / 2)
+        points = []
+        for i in range(num_points):
+            current = start + (end - start) * i / (num_points - 1)
+            points.append((int(x + radius * math.cos(current)), int(y + radius * math.sin(current))))
+        return points
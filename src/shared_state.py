@@ -0,0 +1,262 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# Column layout of the koi table. Every koi owns one row (its slot) for the
+# whole generation; dead koi keep their row with 'alive' set to 0.
+KOI_FIELDS = (
+    'x', 'y', 'last_x', 'last_y', 'hunger', 'energy', 'species_id',
+    'alive', 'highest_fitness', 'food_consumed', 'steps_taken'
+)
+KOI_COLUMNS = {name: index for index, name in enumerate(KOI_FIELDS)}
+
+# Column layout of the lily pad table
+PAD_FIELDS = ('x', 'y', 'alive')
+PAD_COLUMNS = {name: index for index, name in enumerate(PAD_FIELDS)}
+
+# Header layout: capacities first so that attach() can rebuild the views
+HEADER_FIELDS = ('max_koi', 'max_pads', 'num_koi', 'num_pads', 'step', 'generation')
+HEADER_COLUMNS = {name: index for index, name in enumerate(HEADER_FIELDS)}
+
+
+class SharedKoiView:
+    """Read-only koi facade over one row of the shared koi table.
+
+    Exposes the attributes that Renderer.render reads, so the renderer can draw
+    the pond straight from shared memory without unpickling any Koi objects.
+    """
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def position(self):
+        return (float(self._row[KOI_COLUMNS['x']]), float(self._row[KOI_COLUMNS['y']]))
+
+    @property
+    def last_position(self):
+        return (float(self._row[KOI_COLUMNS['last_x']]), float(self._row[KOI_COLUMNS['last_y']]))
+
+    @property
+    def species_id(self):
+        return int(self._row[KOI_COLUMNS['species_id']])
+
+    @property
+    def hunger(self):
+        return float(self._row[KOI_COLUMNS['hunger']])
+
+    @property
+    def energy(self):
+        return float(self._row[KOI_COLUMNS['energy']])
+
+    @property
+    def highest_fitness(self):
+        return float(self._row[KOI_COLUMNS['highest_fitness']])
+
+    def get_radius(self):
+        """Koi radius is fixed, matching Koi.get_radius."""
+        return 10
+
+
+class SharedPadView:
+    """Read-only lily pad facade over one row of the shared pad table."""
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def position(self):
+        return (float(self._row[PAD_COLUMNS['x']]), float(self._row[PAD_COLUMNS['y']]))
+
+
+class SharedPondState:
+    """Pond state stored in a multiprocessing.shared_memory block.
+
+    The block holds a small header followed by a koi table and a lily pad table,
+    all float64. The owning process creates the block, worker processes attach
+    to it by name and read or write their rows in place through NumPy views, so
+    no Koi, LilyPad or genome objects are pickled per step.
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+        self.name = shm.name
+
+        header = np.ndarray((len(HEADER_FIELDS),), dtype=np.int64, buffer=shm.buf)
+        max_koi = int(header[HEADER_COLUMNS['max_koi']])
+        max_pads = int(header[HEADER_COLUMNS['max_pads']])
+        self.header = header
+
+        offset = header.nbytes
+        self.koi = np.ndarray((max_koi, len(KOI_FIELDS)), dtype=np.float64,
+                              buffer=shm.buf, offset=offset)
+        offset += self.koi.nbytes
+        self.pads = np.ndarray((max_pads, len(PAD_FIELDS)), dtype=np.float64,
+                               buffer=shm.buf, offset=offset)
+
+    @staticmethod
+    def _block_size(max_koi, max_pads):
+        header_bytes = len(HEADER_FIELDS) * np.dtype(np.int64).itemsize
+        koi_bytes = max_koi * len(KOI_FIELDS) * np.dtype(np.float64).itemsize
+        pad_bytes = max_pads * len(PAD_FIELDS) * np.dtype(np.float64).itemsize
+        return header_bytes + koi_bytes + pad_bytes
+
+    @classmethod
+    def create(cls, max_koi, max_pads, name=None):
+        """Allocate a new shared block sized for the given capacities.
+
+        Args:
+            max_koi: Number of koi rows to reserve
+            max_pads: Number of lily pad rows to reserve
+            name: Optional shared memory name (generated when None)
+        """
+        size = cls._block_size(max_koi, max_pads)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((len(HEADER_FIELDS),), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[HEADER_COLUMNS['max_koi']] = max_koi
+        header[HEADER_COLUMNS['max_pads']] = max_pads
+        del header
+        state = cls(shm, owner=True)
+        state.koi[:] = 0
+        state.pads[:] = 0
+        return state
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a block created by another process."""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def max_koi(self):
+        return int(self.header[HEADER_COLUMNS['max_koi']])
+
+    @property
+    def max_pads(self):
+        return int(self.header[HEADER_COLUMNS['max_pads']])
+
+    @property
+    def num_koi(self):
+        return int(self.header[HEADER_COLUMNS['num_koi']])
+
+    @property
+    def num_pads(self):
+        return int(self.header[HEADER_COLUMNS['num_pads']])
+
+    @property
+    def step(self):
+        return int(self.header[HEADER_COLUMNS['step']])
+
+    @property
+    def generation(self):
+        return int(self.header[HEADER_COLUMNS['generation']])
+
+    def set_step(self, step, generation=None):
+        """Publish the step (and optionally generation) the tables describe."""
+        self.header[HEADER_COLUMNS['step']] = step
+        if generation is not None:
+            self.header[HEADER_COLUMNS['generation']] = generation
+
+    def load_koi(self, koi_list):
+        """Assign each koi a row and publish its initial state."""
+        if len(koi_list) > self.max_koi:
+            raise ValueError(f"Shared state holds {self.max_koi} koi, got {len(koi_list)}")
+        self.koi[:] = 0
+        for slot, koi_fish in enumerate(koi_list):
+            koi_fish.state_slot = slot
+        self.header[HEADER_COLUMNS['num_koi']] = len(koi_list)
+        self.publish_koi(koi_list)
+
+    def publish_koi(self, koi_list):
+        """Write the state of the given (living) koi into their rows.
+
+        Koi whose row is not written this call are marked dead, so passing the
+        current survivors list keeps the alive flags in sync.
+        """
+        table = self.koi
+        table[:, KOI_COLUMNS['alive']] = 0
+        for koi_fish in koi_list:
+            row = table[koi_fish.state_slot]
+            row[KOI_COLUMNS['x']] = koi_fish.position[0]
+            row[KOI_COLUMNS['y']] = koi_fish.position[1]
+            row[KOI_COLUMNS['last_x']] = koi_fish.last_position[0]
+            row[KOI_COLUMNS['last_y']] = koi_fish.last_position[1]
+            row[KOI_COLUMNS['hunger']] = koi_fish.hunger
+            row[KOI_COLUMNS['energy']] = koi_fish.energy
+            row[KOI_COLUMNS['species_id']] = koi_fish.species_id or 0
+            row[KOI_COLUMNS['alive']] = 1
+            row[KOI_COLUMNS['highest_fitness']] = koi_fish.highest_fitness
+            row[KOI_COLUMNS['food_consumed']] = koi_fish.food_consumed
+            row[KOI_COLUMNS['steps_taken']] = koi_fish.steps_taken
+
+    def apply_to_koi(self, koi_list):
+        """Copy state written by workers back onto the owning Koi objects."""
+        table = self.koi
+        for koi_fish in koi_list:
+            row = table[koi_fish.state_slot]
+            koi_fish.last_position = (float(row[KOI_COLUMNS['last_x']]), float(row[KOI_COLUMNS['last_y']]))
+            koi_fish.position = (float(row[KOI_COLUMNS['x']]), float(row[KOI_COLUMNS['y']]))
+            koi_fish.hunger = float(row[KOI_COLUMNS['hunger']])
+            koi_fish.energy = float(row[KOI_COLUMNS['energy']])
+            koi_fish.highest_fitness = float(row[KOI_COLUMNS['highest_fitness']])
+            koi_fish.food_consumed = int(row[KOI_COLUMNS['food_consumed']])
+            koi_fish.steps_taken = int(row[KOI_COLUMNS['steps_taken']])
+
+    def load_pads(self, lily_pads):
+        """Assign each lily pad a row and publish the freshly spawned layout."""
+        if len(lily_pads) > self.max_pads:
+            raise ValueError(f"Shared state holds {self.max_pads} lily pads, got {len(lily_pads)}")
+        self.pads[:] = 0
+        for slot, lily_pad in enumerate(lily_pads):
+            lily_pad.state_slot = slot
+            self.pads[slot, PAD_COLUMNS['x']] = lily_pad.position[0]
+            self.pads[slot, PAD_COLUMNS['y']] = lily_pad.position[1]
+            self.pads[slot, PAD_COLUMNS['alive']] = 1
+        self.header[HEADER_COLUMNS['num_pads']] = len(lily_pads)
+
+    def add_pads(self, lily_pads):
+        """Give lily pads created mid-trial rows, reusing those of eaten pads first."""
+        num_pads = int(self.header[HEADER_COLUMNS['num_pads']])
+        free = np.flatnonzero(self.pads[:num_pads, PAD_COLUMNS['alive']] == 0).tolist()
+        needed = len(lily_pads) - len(free)
+        if needed > 0:
+            if num_pads + needed > self.max_pads:
+                raise ValueError(f"Shared state holds {self.max_pads} lily pads, got {num_pads + needed}")
+            free.extend(range(num_pads, num_pads + needed))
+            self.header[HEADER_COLUMNS['num_pads']] = num_pads + needed
+        for slot, lily_pad in zip(free, lily_pads):
+            lily_pad.state_slot = slot
+            self.pads[slot, PAD_COLUMNS['x']] = lily_pad.position[0]
+            self.pads[slot, PAD_COLUMNS['y']] = lily_pad.position[1]
+            self.pads[slot, PAD_COLUMNS['alive']] = 1
+
+    def publish_pads(self, lily_pads):
+        """Refresh the alive flags from the list of remaining lily pads."""
+        alive = self.pads[:, PAD_COLUMNS['alive']]
+        alive[:] = 0
+        for lily_pad in lily_pads:
+            alive[lily_pad.state_slot] = 1
+
+    def koi_views(self):
+        """Return renderer-compatible views of the living koi."""
+        alive = self.koi[:self.num_koi, KOI_COLUMNS['alive']]
+        return [SharedKoiView(self.koi[slot]) for slot in np.flatnonzero(alive)]
+
+    def pad_views(self):
+        """Return renderer-compatible views of the remaining lily pads."""
+        alive = self.pads[:self.num_pads, PAD_COLUMNS['alive']]
+        return [SharedPadView(self.pads[slot]) for slot in np.flatnonzero(alive)]
+
+    def close(self):
+        """Release this process's mapping; the owner also unlinks the block."""
+        # Drop the views before closing, the buffer cannot be released while exported
+        self.header = None
+        self.koi = None
+        self.pads = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
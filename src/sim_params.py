@@ -0,0 +1,181 @@
+REQUIRED = object()  # Marks schema entries without a default
+
+NUMBER = (int, float)
+OPTIONAL_NUMBER = (int, float, type(None))
+OPTIONAL_STR = (str, type(None))
+
+# Every key simulation-config.json may contain: name -> (accepted types, default)
+SCHEMA = {
+    # Pond
+    'environment_width': (NUMBER, REQUIRED),
+    'environment_height': (NUMBER, REQUIRED),
+    'detection_radius': (NUMBER, REQUIRED),
+    'num_lily_pads': (int, 30),
+    'chunk_size': (OPTIONAL_NUMBER, None),
+    'lazy_chunks': (bool, False),
+
+    # Food dynamics
+    'food_regrowth_rate': (NUMBER, 0),     # Pads regrown per step when the pond is empty
+    'food_clusters': (int, 0),             # Cluster centres pads grow around (0 for uniform)
+    'food_cluster_spread': (NUMBER, 50),   # Standard deviation of pad positions around a centre
+    'food_depletion': (NUMBER, 0),         # Fraction of a chunk's fertility lost per pad eaten
+    'food_recovery': (NUMBER, 0.01),       # Fraction of lost fertility recovered per step
+
+    # Evolution
+    'num_generations': (int, 100),
+    'simulation_steps': (int, 1000),
+    'speciation': (str, 'default'),        # 'default' (neat's DefaultSpeciesSet) or 'array' (numpy, cached distances)
+    'reproduction': (str, 'default'),      # 'default' (neat's DefaultReproduction) or 'batch' (numpy attribute mutation)
+    'genome': (str, 'default'),            # 'default' (neat's DefaultGenome) or 'array' (ArrayGenome)
+    'gc_mode': (str, 'default'),           # 'default' or 'tuned' (freeze, raised thresholds), see gc_policy.py
+    'gc_episode_threshold': (int, 50000),  # Generation 0 GC threshold during episodes in tuned mode
+
+    # Koi physiology
+    'max_speed': (NUMBER, 5.0),            # Distance covered per step at full speed
+    'swimming_cost': (NUMBER, 0.05),       # Hunger gained per unit of distance swum
+    'hunger_rate': (NUMBER, 0.05),         # Hunger gained every step
+    'starting_hunger': (NUMBER, 0),        # Hunger at the start of a trial
+    'max_hunger': (NUMBER, 200),           # Koi starve at this hunger
+    'lily_pad_value': (NUMBER, 30),        # Hunger relieved by eating a lily pad
+    'eating_radius': (NUMBER, 10),         # Lily pads closer than this are eaten
+    'schooling_radius': (NUMBER, 100),     # Neighbours closer than this count as the school
+
+    # Koi interactions (see interactions.py)
+    'interaction_radius': (NUMBER, 0),     # Koi closer than this contest each other (0 disables)
+    'aggression_cost': (NUMBER, 0.05),     # Hunger paid per contest at full aggression
+    'contest_transfer': (NUMBER, 1.0),     # Hunger moved from loser to winner per unit of aggression difference
+    'nudge_distance': (NUMBER, 3.0),       # Distance a loser is pushed at full winner aggression
+
+    # Fitness
+    'edge_penalty': (NUMBER, 15),          # Fitness lost while near the pond edge
+    'border_margin': (NUMBER, 50),         # Distance from the edge that counts as near
+    'boundary_penalty': (NUMBER, 0.5),     # Kept for older configs, not used
+
+    # Rendering
+    'render': (bool, False),
+    'view_size': (int, 1000),
+    'video_dir': (OPTIONAL_STR, None),
+    'video_stride': (int, 1),
+    'video_width': ((int, type(None)), None),
+    'video_height': ((int, type(None)), None),
+    'screen': (type(None), None),          # Kept for older configs, not used
+    'screen_width': (OPTIONAL_NUMBER, None),   # Kept for older configs, not used
+    'screen_height': (OPTIONAL_NUMBER, None),  # Kept for older configs, not used
+    'pond_size': (OPTIONAL_NUMBER, None),      # Kept for older configs, not used
+    'episode_length': (OPTIONAL_NUMBER, None),  # Kept for older configs, not used
+
+    # Recording and sharing
+    'shared_memory': (bool, False),
+    'history_file': (OPTIONAL_STR, None),
+    'statistics_file': (OPTIONAL_STR, None),  # Per-generation fitness statistics file (None keeps only the window)
+    'statistics_window': (int, 100),       # Generations of statistics held in memory
+    'telemetry_dir': (OPTIONAL_STR, None),
+    'telemetry_chunk_steps': (int, 100),
+}
+
+# Overrides for unattended runs in worker processes (sweep jobs, tournament
+# matches): no windows, frames, recordings or shared memory segments
+HEADLESS = {'render': False, 'video_dir': None, 'history_file': None,
+            'telemetry_dir': None, 'shared_memory': False}
+
+
+class ConfigError(ValueError):
+    """Raised when a simulation configuration does not match SCHEMA."""
+
+
+def _check_type(value, types):
+    # bool is an int subclass, but True is never a sensible size or rate
+    if isinstance(value, bool) and bool not in (types if isinstance(types, tuple) else (types,)):
+        return False
+    return isinstance(value, types)
+
+
+class SimParams:
+    """Validated, read-only simulation parameters.
+
+    Built once from the simulation config so hot loops read plain attributes
+    (params.detection_radius) instead of looking up dictionary keys. Every
+    key in SCHEMA is an attribute; unknown keys, missing required keys and
+    values of the wrong type raise ConfigError.
+    """
+
+    __slots__ = tuple(SCHEMA)
+
+    def __init__(self, values):
+        """Validate values and fill in defaults.
+
+        Args:
+            values: Mapping of configuration keys to values
+
+        Raises:
+            ConfigError: If a key is unknown, a required key is missing or a
+                value has the wrong type
+        """
+        unknown = [name for name in values if name not in SCHEMA]
+        if unknown:
+            import difflib
+            hints = []
+            for name in unknown:
+                close = difflib.get_close_matches(name, SCHEMA, n=1)
+                hints.append(f"'{name}'" + (f" (did you mean '{close[0]}'?)" if close else ""))
+            raise ConfigError(f"Unknown simulation config keys: {', '.join(hints)}")
+
+        missing = [name for name, (_, default) in SCHEMA.items() if default is REQUIRED and name not in values]
+        if missing:
+            raise ConfigError(f"Missing required simulation config keys: {', '.join(missing)}")
+
+        for name, (types, default) in SCHEMA.items():
+            value = values.get(name, default)
+            if not _check_type(value, types):
+                raise ConfigError(
+                    f"Simulation config key '{name}' has invalid value {value!r} "
+                    f"(expected {self._type_names(types)})"
+                )
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _type_names(types):
+        types = types if isinstance(types, tuple) else (types,)
+        return ' or '.join('null' if t is type(None) else t.__name__ for t in types)
+
+    @classmethod
+    def from_config(cls, sim_config):
+        """Compile the parameters of a simulation-config.json dictionary."""
+        return cls(sim_config)
+
+    @classmethod
+    def from_environment(cls, environment_config):
+        """Compile parameters from an environment_config dictionary (width, height, ...)."""
+        values = {
+            'environment_width': environment_config['width'],
+            'environment_height': environment_config['height'],
+            'detection_radius': environment_config['detection_radius'],
+        }
+        if 'boundary_penalty' in environment_config:
+            values['boundary_penalty'] = environment_config['boundary_penalty']
+        return cls(values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SimParams is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("SimParams is read-only")
+
+    def __reduce__(self):
+        return (self.__class__, (self.to_dict(),))
+
+    def __eq__(self, other):
+        return isinstance(other, SimParams) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.to_dict().items()))
+
+    def to_dict(self):
+        """Return every parameter as a plain dictionary."""
+        return {name: getattr(self, name) for name in SCHEMA}
+
+    def replace(self, **changes):
+        """Return a copy with some parameters changed (and validated)."""
+        values = self.to_dict()
+        values.update(changes)
+        return self.__class__(values)
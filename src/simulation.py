@@ -1,12 +1,15 @@
 import neat
-import pygame
 from koi import Koi
-from food import LilyPad
+from food import LilyPad, FoodDynamics
+from world import TiledWorld
+from sim_params import SimParams
+from sensors import SensorConfig
+from stats_reporter import StreamingStatisticsReporter
+from gc_policy import GCPolicy
+from ecs import EntityRegistry, SystemSchedule
 import random
-import json
 from weakref import ref
 import copy
-import gc
 
 class GenerationReporter(neat.reporting.BaseReporter):
     """Reporter that updates visualization after each generation.
@@ -116,10 +119,9 @@ class CheckpointReporter(neat.reporting.BaseReporter):
                 
                 print(f"Successfully saved checkpoint for generation {self.current_generation}")
                 
-                # Force garbage collection to clean up temporary objects
+                # Release the copies now; the GC policy collects after every generation
                 del population_copy
                 del species_set_copy
-                gc.collect()
                 
             except Exception as e:
                 print(f"Error saving checkpoint: {e}")
@@ -137,9 +139,9 @@ class Simulation:
         
         # Load simulation configuration
         if isinstance(sim_config, str):
-            # If sim_config is a file path, load it
-            with open(sim_config, 'r') as f:
-                self.sim_config = json.load(f)
+            # If sim_config is a file path, load it (parsed once per process)
+            from config_cache import load_sim_config
+            self.sim_config = load_sim_config(sim_config)
         else:
             # If sim_config is already a dictionary, use it directly
             self.sim_config = sim_config
@@ -149,45 +151,160 @@ class Simulation:
             self.sim_config['num_lily_pads'] = 30  # More lily pads
         print(f"Configured for {self.sim_config['num_lily_pads']} lily pads")  # Debug print
         
+        # Validate the configuration once and compile it for the hot loops
+        self.params = params = SimParams.from_config(self.sim_config)
+        
+        # The pond is tiled into chunks that own their pads and koi. Chunks the
+        # size of the detection radius keep neighbour queries to 3x3 chunks
+        self.world = TiledWorld(
+            params.environment_width,
+            params.environment_height,
+            params.chunk_size or params.detection_radius,
+            halo=params.detection_radius,
+            lazy=params.lazy_chunks
+        )
+        
+        # Input mode from the [KoiSensors] section of the NEAT config; the
+        # vision mode senses every koi's field of view in one batch per step
+        sensor_config = getattr(neat_config, 'koi_sensors', None)
+        if not isinstance(sensor_config, SensorConfig):
+            sensor_config = SensorConfig()
+        self.sensor_config = sensor_config
+        self.vision_sensor = sensor_config.create_sensor()
+        
+        # Optional koi-to-koi contests driven by the aggression output
+        self.interactions = None
+        if params.interaction_radius > 0:
+            from interactions import InteractionSystem
+            self.interactions = InteractionSystem(params)
+        
+        # Optional regrowth, clustering and depletion of the lily pads
+        self.food = None
+        if params.food_regrowth_rate > 0 or params.food_clusters > 0:
+            self.food = FoodDynamics(self.world, params, pad_factory=LilyPad)
+        
         # Initialize lily pads
         self.lily_pads = []
         self.spawn_lily_pads()
         
-        # Initialize renderer if rendering is enabled
+        # Each simulation owns its scoreboard; the renderer reads snapshots of it
+        from scoreboard import ScoreboardService
+        self.scoreboard = ScoreboardService()
+        
+        # Initialize renderer if rendering or video export is enabled
         self.renderer = None
-        if self.sim_config.get('render', False):
+        self.frame_exporter = None
+        video_dir = params.video_dir
+        if params.render or video_dir:
             from renderer import Renderer
-            screen_size = max(
-                self.sim_config['environment_width'],
-                self.sim_config['environment_height']
+            # Ponds larger than the view are shown through the renderer's camera
+            screen_size = min(
+                max(params.environment_width, params.environment_height),
+                params.view_size
             )
-            self.renderer = Renderer(screen_size)
+            if video_dir:
+                from video_export import FrameExporter
+                video_size = None
+                if params.video_width and params.video_height:
+                    video_size = (params.video_width, params.video_height)
+                self.frame_exporter = FrameExporter(
+                    video_dir,
+                    stride=params.video_stride,
+                    size=video_size
+                )
+                print(f"Exporting rendered frames to {video_dir}")
+            self.renderer = Renderer(
+                screen_size,
+                scoreboard=self.scoreboard,
+                offscreen=not params.render,
+                frame_sink=self.frame_exporter,
+                world_size=(params.environment_width, params.environment_height)
+            )
+            if self.vision_sensor is not None:
+                self.renderer.vision_sensor = self.vision_sensor
         
         # Add this line to store environment configuration
         self.environment_config = {
-            'width': self.sim_config['environment_width'],
-            'height': self.sim_config['environment_height'],
-            'boundary_penalty': self.sim_config.get('boundary_penalty', 0.5),
-            'detection_radius': self.sim_config['detection_radius']
+            'width': params.environment_width,
+            'height': params.environment_height,
+            'boundary_penalty': params.boundary_penalty,
+            'detection_radius': params.detection_radius
         }
         
         # Remove redundant width/height since we have environment_width/height
         # Remove redundant food_count since we have num_lily_pads
         
         # Get simulation attributes from config
-        self.simulation_steps = self.sim_config['simulation_steps']
-        self.detection_radius = self.sim_config['detection_radius']
-        self.num_generations = self.sim_config['num_generations']
-        
-        # Initialize the scoreboard at simulation start
-        from scoreboard import Scoreboard
-        Scoreboard._species_records = {}  # Reset species records
+        self.simulation_steps = params.simulation_steps
+        self.detection_radius = params.detection_radius
+        self.num_generations = params.num_generations
         
         # Store the population reference
         self.population = None
         
         # Track current generation separately
         self.current_generation = 0
+        
+        # Optional shared-memory mirror of the pond for multi-process evaluation
+        self.shared_state = None
+        
+        # Optional persistent per-generation species history
+        self.history_store = None
+        history_file = params.history_file
+        if history_file:
+            from history_store import HistoryStore
+            self.history_store = HistoryStore(history_file)
+            print(f"Recording species history to {history_file} (run {self.history_store.run})")
+        
+        # Per-generation fitness statistics, created by run()
+        self.statistics = None
+        
+        # Garbage collector management: freeze after startup, fewer
+        # collections during episodes, a full collection between generations
+        self.gc_policy = GCPolicy(params.gc_mode, params.gc_episode_threshold)
+        
+        # Optional per-step trajectory telemetry
+        self.telemetry = None
+        telemetry_dir = params.telemetry_dir
+        if telemetry_dir:
+            from telemetry import TrajectoryRecorder
+            self.telemetry = TrajectoryRecorder(
+                telemetry_dir,
+                chunk_steps=params.telemetry_chunk_steps
+            )
+            print(f"Recording koi trajectories to {telemetry_dir}")
+    
+    def __getstate__(self):
+        """Return state for copying, excluding pygame, file and shared memory handles.
+        
+        Reporters hold a callback into the simulation, so checkpoint deep copies
+        of the species set reach this object.
+        """
+        state = self.__dict__.copy()
+        for key in ('history_store', 'shared_state', 'telemetry', 'statistics',
+                    'frame_exporter', 'renderer', '_temp_renderer'):
+            if key in state:
+                state[key] = None
+        return state
+    
+    def ensure_shared_state(self, num_koi):
+        """Create (or grow) the shared-memory pond state when enabled in the config.
+        
+        Args:
+            num_koi: Number of koi that must fit in the shared koi table
+        """
+        if not self.params.shared_memory:
+            return None
+        
+        num_pads = self.params.num_lily_pads
+        state = self.shared_state
+        if state is None or state.max_koi < num_koi or state.max_pads < num_pads:
+            if state is not None:
+                state.close()
+            from shared_state import SharedPondState
+            self.shared_state = SharedPondState.create(num_koi, num_pads)
+            print(f"Shared pond state allocated as '{self.shared_state.name}'")
+        return self.shared_state
     
     def update_generation_display(self, generation):
         """Update generation display in renderer and scoreboard.
@@ -201,22 +318,135 @@ class Simulation:
         if self.renderer:
             self.renderer.set_generation(generation)
             
-        # Update the scoreboard with the current generation
-        from scoreboard import Scoreboard
-        Scoreboard.set_current_generation(generation)
+        # Update the scoreboard with the current generation, after any
+        # results workers submitted through scoreboard clients
+        self.scoreboard.drain()
+        self.scoreboard.set_current_generation(generation)
 
     def spawn_lily_pads(self):
-        # Clear any existing lily pads
-        self.lily_pads = []
+        # Replace any existing lily pads; lazy worlds create them chunk by chunk
+        num_lily_pads = self.params.num_lily_pads
+        food = self.food
+        if food is not None and self.params.food_clusters > 0 and not self.world.lazy:
+            # Clustered layouts are placed by the food model
+            self.world.spawn_pads(0, pad_factory=LilyPad)
+            food.reset()
+            self.lily_pads = food.spawn(num_lily_pads)
+        else:
+            self.lily_pads = self.world.spawn_pads(num_lily_pads, pad_factory=LilyPad)
+            if food is not None:
+                food.reset(self.lily_pads)
+        
+        if self.world.lazy:
+            print(f"Spreading {num_lily_pads} lily pads over chunks as koi reach them")
+        else:
+            print(f"Spawned {len(self.lily_pads)} lily pads")
+
+    def feed_koi(self, koi, step=0):
+        """Let a koi eat the lily pads within reach.
+        
+        Only the pads near the koi are handed to Koi.eat; the ones it eats
+        are then removed from the pond and the pad index.
+        """
+        eaten_before = len(koi.eaten_lily_pads)
+        reachable = self.world.pads.query_radius(koi.position, self.params.eating_radius)
+        koi.eat(reachable)
+        for lily_pad in koi.eaten_lily_pads[eaten_before:]:
+            self.remove_lily_pad(lily_pad, step)
+
+    def remove_lily_pad(self, lily_pad, step=0):
+        """Take an eaten lily pad out of the pond."""
+        self.lily_pads.remove(lily_pad)
+        self.world.remove_pad(lily_pad)
+        if self.food is not None:
+            self.food.consume(lily_pad, step)
+
+    def build_schedule(self, registry):
+        """Return the systems that advance the pond by one step.
+        
+        Each phase runs over every koi before the next phase starts, so all
+        koi sense the same pond and think before any of them moves. Each
+        system loops over the koi column and calls the matching Koi method.
+        New behaviours are added as systems in the phase they belong to.
+        """
+        schedule = SystemSchedule(registry)
+        schedule.add('sense', self.sense_system)
+        schedule.add('think', self.think_system)
+        schedule.add('act', self.act_system)
+        schedule.add('eat', self.eat_system)
+        if self.interactions is not None:
+            schedule.add('eat', self.interaction_system)
+        schedule.add('metabolize', self.metabolize_system)
+        schedule.add('score', self.score_system)
+        return schedule
+
+    def despawn_koi(self, registry, row):
+        """Mark a koi for removal and take it out of the world at once, so later systems do not meet it."""
+        registry.despawn_row(row)
+        self.world.remove_koi(registry.column('koi')[row])
+
+    def sense_system(self, registry, step):
+        """Find the lily pads and koi near every koi, and its field-of-view inputs."""
+        koi_column = registry.column('koi')
+        pad_index = self.world.pads
+        koi_index = self.world.koi
         
-        # Spawn new lily pads
-        num_lily_pads = self.sim_config.get('num_lily_pads', 30)
-        for _ in range(num_lily_pads):
-            x = random.randint(0, self.sim_config['environment_width'])
-            y = random.randint(0, self.sim_config['environment_height'])
-            self.lily_pads.append(LilyPad(x, y))
+        # Field-of-view inputs for every koi in one batch
+        if self.vision_sensor is not None:
+            self.vision_sensor.assign(koi_column, pad_index, koi_index)
         
-        print(f"Spawned {len(self.lily_pads)} lily pads")
+        # Neighbours come from the spatial indexes rather than a full scan
+        detection_radius = self.params.detection_radius
+        nearby_pads = registry.column('nearby_pads')
+        nearby_koi = registry.column('nearby_koi')
+        for row, koi in enumerate(koi_column):
+            nearby_pads[row] = pad_index.query_radius(koi.position, detection_radius)
+            nearby_koi[row] = [other for other in koi_index.query_radius(koi.position, detection_radius) if other is not koi]
+
+    def think_system(self, registry, step):
+        """Evaluate every koi's network; koi too hungry or exhausted to think die."""
+        nearby_pads = registry.column('nearby_pads')
+        nearby_koi = registry.column('nearby_koi')
+        outputs = registry.column('outputs')
+        for row, koi in enumerate(registry.column('koi')):
+            outputs[row] = koi.think(nearby_pads[row], nearby_koi[row])
+            if outputs[row] is None:
+                self.despawn_koi(registry, row)
+
+    def act_system(self, registry, step):
+        """Move every living koi as its network directs."""
+        world = self.world
+        nearby_koi = registry.column('nearby_koi')
+        outputs = registry.column('outputs')
+        for row, koi in enumerate(registry.column('koi')):
+            if registry.is_despawning(row):
+                continue
+            old_position = koi.position
+            koi.act(outputs[row], nearby_koi[row])
+            world.move_koi(koi, old_position)
+
+    def eat_system(self, registry, step):
+        """Let every living koi eat the lily pads within reach."""
+        for row, koi in enumerate(registry.column('koi')):
+            if not registry.is_despawning(row):
+                self.feed_koi(koi, step)
+
+    def interaction_system(self, registry, step):
+        """Contests between neighbouring koi, resolved together."""
+        for lily_pad in self.interactions.resolve(registry.live('koi'), self.world.koi, self.world.pads):
+            self.remove_lily_pad(lily_pad, step)
+
+    def metabolize_system(self, registry, step):
+        """Advance hunger and energy; koi that run out die."""
+        for row, koi in enumerate(registry.column('koi')):
+            if not registry.is_despawning(row) and not koi.metabolize():
+                self.despawn_koi(registry, row)
+
+    def score_system(self, registry, step):
+        """Record the highest fitness of every living koi."""
+        for row, koi in enumerate(registry.column('koi')):
+            if not registry.is_despawning(row):
+                koi.score()
 
     def eval_genomes(self, genomes, config):
         """Evaluate genomes by creating koi fish and running them in the simulation."""
@@ -246,25 +476,34 @@ class Simulation:
             
             # Create a new koi with random position
             position = (
-                random.randint(50, self.environment_config['width'] - 50),
-                random.randint(50, self.environment_config['height'] - 50)
+                random.randint(50, self.params.environment_width - 50),
+                random.randint(50, self.params.environment_height - 50)
             )
             
             koi_fish = Koi(
                 genome=genome,
                 config=config,
                 position=position,
-                environment_config=self.environment_config,
+                environment_config=self.params,
                 species_id=species_id
             )
             
             koi_list.append(koi_fish)
             genome_to_koi[genome_id] = koi_fish
-            genome.koi = koi_fish
         
         # Store koi list for checkpointing preparation
         self._temp_koi_list = koi_list
         
+        # Give every koi a row in the shared pond state
+        shared_state = self.ensure_shared_state(len(koi_list))
+        if shared_state:
+            shared_state.load_koi(koi_list)
+        
+        # Start a new telemetry generation
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.begin_generation(self.current_generation, koi_list)
+        
         # Run simulation for multiple trials
         num_trials = 1  # Can be increased for more robust evaluation
         print(f"\n=== Running {num_trials} trials ===")
@@ -274,35 +513,60 @@ class Simulation:
             self.spawn_lily_pads()
             for koi in koi_list:
                 koi.reset(self.sim_config)
+            if shared_state:
+                shared_state.load_pads(self.lily_pads)
+            if telemetry is not None:
+                telemetry.record_spawn(0, self.lily_pads)
                 
+            # Every koi is an entity; the systems run over the registry's columns
+            registry = EntityRegistry(components=('koi', 'nearby_pads', 'nearby_koi', 'outputs'))
+            handles = {genome_id: registry.spawn(koi=koi_fish) for genome_id, koi_fish in genome_to_koi.items()}
+            schedule = self.build_schedule(registry)
+            living_koi = registry.column('koi')
+            
             # Run simulation for specified steps
-            for step in range(self.sim_config['simulation_steps']):
-                for koi in koi_list[:]:  # Copy to allow removal during iteration
-                    if koi not in koi_list:
-                        continue  # Skip koi that have been removed
-                        
-                    detection_radius = self.sim_config['detection_radius']
-                    nearby_lily_pads = [pad for pad in self.lily_pads if koi.distance_to(pad) < detection_radius]
-                    nearby_koi = [other for other in koi_list if other != koi and koi.distance_to(other) < detection_radius]
-                    
-                    # Take action returns False if koi should die
-                    koi_alive = koi.take_action(nearby_lily_pads, nearby_koi)
-                    if not koi_alive:
-                        if koi in koi_list:
-                            koi_list.remove(koi)
-                            continue  # Skip update for dead koi
-                    
-                    koi.update(self.lily_pads, koi_list)
-                    
-                    # Check if koi's energy is depleted or it's too hungry - remove it from simulation
-                    if koi.energy <= 0 or koi.hunger >= 200:
-                        if koi in koi_list:
-                            koi_list.remove(koi)
+            params = self.params
+            world = self.world
+            world.place_koi(living_koi)
+            
+            # The step loop allocates many short-lived objects; collect less often
+            self.gc_policy.begin_episode()
+            pad_index = world.pads
+            koi_index = world.koi
+            for step in range(params.simulation_steps):
+                # Bring the chunks around the koi to life (creates lazy pads)
+                new_lily_pads = world.activate(step)
+                
+                # Regrow eaten lily pads
+                food = self.food
+                if food is not None:
+                    food.add_capacity(len(new_lily_pads))
+                    new_lily_pads += food.step(step, len(self.lily_pads) + len(new_lily_pads))
+                
+                if new_lily_pads:
+                    self.lily_pads.extend(new_lily_pads)
+                    if shared_state:
+                        shared_state.add_pads(new_lily_pads)
+                    if telemetry is not None:
+                        telemetry.record_spawn(step, new_lily_pads)
+                
+                # Sense, think, act, eat, metabolize and score; dead koi are removed at the end
+                schedule.run(step)
+                
+                # Publish the step to the shared pond state
+                if shared_state:
+                    shared_state.publish_koi(living_koi)
+                    shared_state.publish_pads(self.lily_pads)
+                    shared_state.set_step(step, self.current_generation)
+                
+                # Stream the step to the trajectory recorder
+                if telemetry is not None:
+                    telemetry.record_step(step, living_koi)
                 
                 # Render current state
                 if self.renderer:
                     try:
-                        if not self.renderer.render(koi_list, self.lily_pads):
+                        if not self.renderer.render(living_koi, self.lily_pads, koi_index, pad_index):
                             return  # Exit if window is closed
                     except Exception as e:
                         print(f"Warning: Rendering error occurred: {e}")
@@ -310,34 +574,33 @@ class Simulation:
                         traceback.print_exc()
                         # Continue simulation despite rendering error
             
-            # Calculate fitness for each genome
+            self.gc_policy.end_episode()
+            survivors = list(living_koi)
+            
+            # Calculate fitness for each genome that survived the trial
             for genome_id, genome in genomes:
                 koi_fish = genome_to_koi.get(genome_id)
-                if koi_fish and koi_fish in koi_list:
+                if koi_fish and registry.is_alive(handles[genome_id]):
                     trial_fitness = koi_fish.calculate_fitness()
                     
                     # Add to genome fitness (averaged across trials)
                     genome.fitness += trial_fitness / num_trials
+        
+        # Persist per-species statistics for this generation
+        if self.history_store is not None:
+            self.record_species_history(genomes, genome_to_koi)
                     
-                    # Store the koi's highest fitness in the genome
-                    if not hasattr(genome, 'highest_fitness'):
-                        genome.highest_fitness = 0
-                    genome.highest_fitness = max(genome.highest_fitness, koi_fish.highest_fitness)
-            
-            # Remove koi references from genomes before finishing
-            for _, genome in genomes:
-                if hasattr(genome, 'koi'):
-                    delattr(genome, 'koi')
-                    
+        # Apply species results workers submitted during the generation
+        self.scoreboard.drain()
+        
         # Display the best koi from this generation
-        if koi_list:
-            best_koi = max(koi_list, key=lambda k: k.highest_fitness)
+        if survivors:
+            best_koi = max(survivors, key=lambda k: k.highest_fitness)
             print(f"\n=== Best Koi This Generation ===")
             print(f"Species ID: {best_koi.species_id}")
             print(f"Highest Fitness: {best_koi.highest_fitness}")
             
             # Record the best performing species
-            from scoreboard import Scoreboard
             species_id = str(best_koi.species_id)
             
             # Get the current generation number from our internal tracker
@@ -345,7 +608,7 @@ class Simulation:
             print(f"Current Generation: {current_generation}")
             
             # Record in scoreboard with the correct generation number
-            Scoreboard.record_species(
+            self.scoreboard.record_species(
                 species_id=species_id,
                 koi=best_koi,
                 fitness=best_koi.highest_fitness,
@@ -353,6 +616,37 @@ class Simulation:
                 config=config
             )
 
+    def record_species_history(self, genomes, genome_to_koi):
+        """Append one history record per species for the current generation.
+        
+        Args:
+            genomes: The (genome_id, genome) pairs evaluated this generation
+            genome_to_koi: Mapping of genome id to the koi that represented it
+        """
+        species_stats = {}
+        for genome_id, genome in genomes:
+            koi_fish = genome_to_koi.get(genome_id)
+            species_id = koi_fish.species_id if koi_fish and koi_fish.species_id is not None else 0
+            stats = species_stats.setdefault(species_id, [0, 0.0, float('-inf'), 0])
+            stats[0] += 1
+            stats[1] += genome.fitness
+            stats[2] = max(stats[2], genome.fitness)
+            stats[3] += koi_fish.food_consumed if koi_fish else 0
+        
+        population_count = len(genomes)
+        for species_id in sorted(species_stats):
+            size, fitness_sum, best_fitness, food_consumed = species_stats[species_id]
+            self.history_store.append(
+                generation=self.current_generation,
+                species_id=species_id,
+                best_fitness=best_fitness,
+                mean_fitness=fitness_sum / size,
+                size=size,
+                population=population_count,
+                food_consumed=food_consumed
+            )
+        self.history_store.flush()
+
     def make_checkpoint_compatible(self):
         """Prepare the simulation object for checkpointing.
         
@@ -372,9 +666,6 @@ class Simulation:
                 if hasattr(koi_fish, 'make_pickle_safe'):
                     koi_fish.make_pickle_safe()
             
-            # Force garbage collection to clean up any dangling references
-            gc.collect()
-            
             print("Simulation ready for checkpointing")
         except Exception as e:
             print(f"Error preparing simulation for checkpointing: {e}")
@@ -402,19 +693,65 @@ class Simulation:
             import traceback
             traceback.print_exc()
 
+    def build_neat_config(self):
+        """Return a copy of the NEAT config with the classes chosen in the simulation settings.
+        
+        The species set, reproduction and genome classes are always set, so
+        a config shared with an earlier Simulation cannot carry its choices
+        over. The parsed sections are shared with self.neat_config.
+        
+        Raises:
+            ValueError: If speciation, reproduction or genome is unknown
+        """
+        neat_config = copy.copy(self.neat_config)
+        
+        # The vectorized species set reads the same [DefaultSpeciesSet]
+        # section, so the parsed settings carry over
+        if self.params.speciation == 'array':
+            from speciation import ArraySpeciesSet
+            neat_config.species_set_type = ArraySpeciesSet
+        elif self.params.speciation == 'default':
+            neat_config.species_set_type = neat.DefaultSpeciesSet
+        else:
+            raise ValueError(f"Unknown speciation '{self.params.speciation}', expected 'array' or 'default'")
+
+        # Likewise for reproduction, which reads [DefaultReproduction]
+        if self.params.reproduction == 'batch':
+            from reproduction import BatchReproduction
+            neat_config.reproduction_type = BatchReproduction
+        elif self.params.reproduction == 'default':
+            neat_config.reproduction_type = neat.DefaultReproduction
+        else:
+            raise ValueError(f"Unknown reproduction '{self.params.reproduction}', expected 'batch' or 'default'")
+
+        # And for the genome representation, which reads [DefaultGenome]
+        if self.params.genome == 'array':
+            from array_genome import ArrayGenome
+            neat_config.genome_type = ArrayGenome
+        elif self.params.genome == 'default':
+            neat_config.genome_type = neat.DefaultGenome
+        else:
+            raise ValueError(f"Unknown genome '{self.params.genome}', expected 'default' or 'array'")
+        return neat_config
+
     def run(self):
         """Run the NEAT algorithm to evolve a network to solve the task."""
         try:
-            # Create the population
-            population = neat.Population(self.neat_config)
+            # Create the population from this run's own config
+            neat_config = self.build_neat_config()
+            population = neat.Population(neat_config)
             
             # Store the population for use in eval_genomes
             self.population = population
             
             # Add a reporter to show progress in the terminal
             population.add_reporter(neat.StdOutReporter(True))
-            stats = neat.StatisticsReporter()
-            population.add_reporter(stats)
+            # Fitness statistics stream to disk, keeping a bounded window in memory
+            self.statistics = StreamingStatisticsReporter(
+                self.params.statistics_file,
+                window=self.params.statistics_window
+            )
+            population.add_reporter(self.statistics)
             
             # Add custom reporter to update visualization after each generation
             # Pass a callback function instead of the simulation object
@@ -433,15 +770,20 @@ class Simulation:
             self.current_generation = 0
             
             # Update the scoreboard with the initial generation
-            from scoreboard import Scoreboard
-            Scoreboard.set_current_generation(self.current_generation)
+            self.scoreboard.set_current_generation(self.current_generation)
             
             # If rendering is enabled, update the renderer's generation counter
             if self.renderer:
                 self.renderer.set_generation(self.current_generation)
             
+            # Collect between generations, after the checkpoint is written
+            population.add_reporter(self.gc_policy)
+            
+            # Setup is done; what is alive now lives for the whole run
+            self.gc_policy.startup()
+            
             # Run for up to n generations
-            num_generations = self.sim_config.get('num_generations', 100)
+            num_generations = self.params.num_generations
             winner = population.run(self.eval_genomes, num_generations)
             
             # Display the winning genome
@@ -490,6 +832,14 @@ class Simulation:
             import traceback
             traceback.print_exc()
 
+        # Also export the network for the standalone runtime (see koi_brain.py)
+        try:
+            from koi_brain import export_genome
+            export_genome(genome, self.neat_config, 'best_koi.kbrain')
+            print("Exported the best koi network to 'best_koi.kbrain'")
+        except Exception as e:
+            print(f"Error exporting best koi network: {e}")
+
     def cleanup(self):
         """Clean up resources used by the simulation."""
         # Clear any references to pygame objects
@@ -500,9 +850,37 @@ class Simulation:
         if hasattr(self, 'renderer') and self.renderer is not None:
             self.renderer = None
         
+        # Finish writing exported frames
+        if getattr(self, 'frame_exporter', None) is not None:
+            self.frame_exporter.close()
+            self.frame_exporter = None
+        
         # Clear lily pads
         if hasattr(self, 'lily_pads'):
             self.lily_pads = []
+        
+        # Close the species history file
+        if getattr(self, 'history_store', None) is not None:
+            self.history_store.close()
+            self.history_store = None
+        
+        # Close the statistics file; the reporter can still be queried
+        if getattr(self, 'statistics', None) is not None:
+            self.statistics.close()
+        
+        # Flush and stop the trajectory recorder
+        if getattr(self, 'telemetry', None) is not None:
+            self.telemetry.close()
+            self.telemetry = None
+        
+        # Restore the garbage collector's settings
+        if getattr(self, 'gc_policy', None) is not None:
+            self.gc_policy.close()
+        
+        # Release the shared pond state
+        if getattr(self, 'shared_state', None) is not None:
+            self.shared_state.close()
+            self.shared_state = None
 
     def evaluate_generation(self, koi_list, generation):
         """Evaluate the performance of each koi in the generation."""
@@ -0,0 +1,126 @@
+class SpatialHash:
+    """Uniform grid index over objects with a `position` attribute.
+
+    Each object lives in the cell containing its position, so radius and
+    rectangle queries only look at the few cells they overlap instead of every
+    object in the pond. Objects that move must be re-filed with move().
+    """
+
+    def __init__(self, cell_size):
+        """Create an empty index.
+
+        Args:
+            cell_size: Width and height of a grid cell in world units. A good
+                choice is the most common query radius.
+        """
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _cell(self, position):
+        return (int(position[0] // self.cell_size), int(position[1] // self.cell_size))
+
+    def cell_key(self, position):
+        """Return the (column, row) key of the cell containing position."""
+        return self._cell(position)
+
+    def cell(self, key):
+        """Return the objects filed in a cell (empty if the cell is unoccupied)."""
+        return self._cells.get(key, ())
+
+    def occupied_cells(self):
+        """Return the keys of the cells holding at least one object."""
+        return list(self._cells)
+
+    def insert(self, item):
+        """Add an object at its current position."""
+        self._cells.setdefault(self._cell(item.position), []).append(item)
+        self._count += 1
+
+    def remove(self, item, position=None):
+        """Remove an object, filed under position (its current one by default)."""
+        key = self._cell(item.position if position is None else position)
+        cell = self._cells.get(key)
+        if cell is None:
+            return
+        for index, other in enumerate(cell):
+            if other is item:
+                # Order inside a cell does not matter, swap-remove is O(1)
+                cell[index] = cell[-1]
+                cell.pop()
+                self._count -= 1
+                break
+        if not cell:
+            del self._cells[key]
+
+    def move(self, item, old_position):
+        """Re-file an object after it moved from old_position."""
+        old_key = self._cell(old_position)
+        if old_key != self._cell(item.position):
+            self.remove(item, old_position)
+            self.insert(item)
+
+    def clear(self):
+        """Remove every object."""
+        self._cells = {}
+        self._count = 0
+
+    def rebuild(self, items):
+        """Replace the contents of the index with items."""
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def query_radius(self, position, radius):
+        """Return the objects strictly closer than radius to position."""
+        x, y = position
+        cell_size = self.cell_size
+        min_cx, max_cx = int((x - radius) // cell_size), int((x + radius) // cell_size)
+        min_cy, max_cy = int((y - radius) // cell_size), int((y + radius) // cell_size)
+        radius_sq = radius * radius
+        cells = self._cells
+
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = cells.get((cx, cy))
+                if not cell:
+                    continue
+                for item in cell:
+                    dx = item.position[0] - x
+                    dy = item.position[1] - y
+                    if dx * dx + dy * dy < radius_sq:
+                        result.append(item)
+        return result
+
+    def query_rect(self, left, top, right, bottom):
+        """Return the objects whose position lies inside the rectangle."""
+        cell_size = self.cell_size
+        min_cx, max_cx = int(left // cell_size), int(right // cell_size)
+        min_cy, max_cy = int(top // cell_size), int(bottom // cell_size)
+        cells = self._cells
+
+        result = []
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            # The rectangle spans more cells than exist, walk the occupied ones
+            candidates = (
+                cell for (cx, cy), cell in cells.items()
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+            )
+        else:
+            candidates = (
+                cells[(cx, cy)]
+                for cx in range(min_cx, max_cx + 1)
+                for cy in range(min_cy, max_cy + 1)
+                if (cx, cy) in cells
+            )
+        for cell in candidates:
+            for item in cell:
+                x, y = item.position
+                if left <= x <= right and top <= y <= bottom:
+                    result.append(item)
+        return result
+
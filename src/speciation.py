@@ -0,0 +1,269 @@
+import numpy as np
+from neat.math_util import mean, stdev
+from neat.species import DefaultSpeciesSet, Species
+
+from array_genome import ArrayGenome, pack_connection_keys
+
+
+class GenomeArrays:
+    """One genome's genes as sorted key arrays with matching attribute arrays.
+
+    Node genes are keyed by node id and carry bias, response and integer
+    codes for the activation and aggregation names. Connection genes are
+    keyed by (in, out) packed into a single int64 and carry weight and
+    enabled.
+    """
+
+    __slots__ = ('node_keys', 'node_values', 'node_codes', 'conn_keys', 'conn_weights', 'conn_enabled')
+
+    def __init__(self, genome, codes):
+        """Encode a genome.
+
+        Args:
+            genome: A neat DefaultGenome or an ArrayGenome
+            codes: Shared dict assigning integers to activation/aggregation names
+        """
+        if isinstance(genome, ArrayGenome):
+            # Already sorted arrays; the option indices serve as codes
+            self.node_keys = genome.node_keys.astype(np.int64)
+            self.node_values = np.column_stack((genome.biases, genome.responses)).astype(np.float64)
+            self.node_codes = np.column_stack((genome.activations, genome.aggregations)).astype(np.int64)
+            self.conn_keys = genome.connection_keys()
+            self.conn_weights = genome.weights.astype(np.float64)
+            self.conn_enabled = genome.enabled
+            return
+
+        nodes = sorted(genome.nodes.items())
+        self.node_keys = np.array([key for key, _ in nodes], dtype=np.int64)
+        self.node_values = np.array([(node.bias, node.response) for _, node in nodes], dtype=np.float64).reshape(-1, 2)
+        self.node_codes = np.array([
+            (codes.setdefault(node.activation, len(codes)), codes.setdefault(node.aggregation, len(codes)))
+            for _, node in nodes
+        ], dtype=np.int64).reshape(-1, 2)
+
+        connections = sorted(genome.connections.items())
+        self.conn_keys = pack_connection_keys(
+            np.array([key[0] for key, _ in connections], dtype=np.int64),
+            np.array([key[1] for key, _ in connections], dtype=np.int64)
+        )
+        self.conn_weights = np.array([conn.weight for _, conn in connections], dtype=np.float64)
+        self.conn_enabled = np.array([conn.enabled for _, conn in connections], dtype=bool)
+
+
+class PackedGenomes:
+    """The genes of many genomes concatenated, each gene tagged with its genome's row."""
+
+    def __init__(self, encodings):
+        self.size = len(encodings)
+        self.node_counts = np.array([len(e.node_keys) for e in encodings], dtype=np.int64)
+        self.conn_counts = np.array([len(e.conn_keys) for e in encodings], dtype=np.int64)
+        self.node_owner = np.repeat(np.arange(self.size), self.node_counts)
+        self.conn_owner = np.repeat(np.arange(self.size), self.conn_counts)
+
+        def concatenate(name, dtype, shape=()):
+            parts = [getattr(e, name) for e in encodings]
+            return np.concatenate(parts) if parts else np.empty((0,) + shape, dtype=dtype)
+
+        self.node_keys = concatenate('node_keys', np.int64)
+        self.node_values = concatenate('node_values', np.float64, (2,))
+        self.node_codes = concatenate('node_codes', np.int64, (2,))
+        self.conn_keys = concatenate('conn_keys', np.int64)
+        self.conn_weights = concatenate('conn_weights', np.float64)
+        self.conn_enabled = concatenate('conn_enabled', bool)
+
+
+def _match(rep_keys, keys):
+    """Return (positions in rep_keys, mask of keys present in rep_keys)."""
+    if not len(rep_keys):
+        return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+    positions = np.searchsorted(rep_keys, keys)
+    positions[positions == len(rep_keys)] = 0
+    return positions, rep_keys[positions] == keys
+
+
+def batch_distances(rep, packed, genome_config, rows=None):
+    """Compute DefaultGenome.distance between rep and many genomes at once.
+
+    Args:
+        rep: GenomeArrays of the representative
+        packed: PackedGenomes of the candidates
+        genome_config: The genome config holding the compatibility coefficients
+        rows: Optional boolean mask of the packed rows to compute (others are NaN)
+
+    Returns:
+        A float64 array with one distance per packed row
+    """
+    disjoint_coefficient = genome_config.compatibility_disjoint_coefficient
+    weight_coefficient = genome_config.compatibility_weight_coefficient
+    size = packed.size
+
+    def component(rep_keys, keys, owner, counts, homologous_cost):
+        if rows is not None:
+            selected = rows[owner]
+            keys, owner = keys[selected], owner[selected]
+        else:
+            selected = None
+        positions, matched = _match(rep_keys, keys)
+        matched_owner = owner[matched]
+        matches = np.bincount(matched_owner, minlength=size)
+        homologous = np.bincount(matched_owner, weights=homologous_cost(positions[matched], selected, matched), minlength=size)
+        rep_count = len(rep_keys)
+        disjoint = counts + rep_count - 2 * matches
+        largest = np.maximum(counts, rep_count)
+        result = np.zeros(size)
+        present = largest > 0
+        result[present] = (homologous[present] * weight_coefficient +
+                           disjoint_coefficient * disjoint[present]) / largest[present]
+        return result
+
+    def node_cost(rep_positions, selected, matched):
+        values = packed.node_values if selected is None else packed.node_values[selected]
+        codes = packed.node_codes if selected is None else packed.node_codes[selected]
+        values, codes = values[matched], codes[matched]
+        cost = np.abs(values - rep.node_values[rep_positions]).sum(axis=1)
+        return cost + (codes != rep.node_codes[rep_positions]).sum(axis=1)
+
+    def conn_cost(rep_positions, selected, matched):
+        weights = packed.conn_weights if selected is None else packed.conn_weights[selected]
+        enabled = packed.conn_enabled if selected is None else packed.conn_enabled[selected]
+        cost = np.abs(weights[matched] - rep.conn_weights[rep_positions])
+        return cost + (enabled[matched] != rep.conn_enabled[rep_positions])
+
+    distances = (component(rep.node_keys, packed.node_keys, packed.node_owner, packed.node_counts, node_cost) +
+                 component(rep.conn_keys, packed.conn_keys, packed.conn_owner, packed.conn_counts, conn_cost))
+    if rows is not None:
+        distances[~rows] = np.nan
+    return distances
+
+
+class ArraySpeciesSet(DefaultSpeciesSet):
+    """Drop-in DefaultSpeciesSet that computes compatibility distances in numpy batches.
+
+    Genomes are encoded once as sorted gene-key arrays (GenomeArrays) and the
+    whole population is packed into flat arrays, so the distances from one
+    representative to every genome take a handful of vectorized operations
+    instead of a Python loop per genome pair. Distances are cached by genome
+    key pair across generations: neat never modifies a genome after it is
+    created, so pairs of surviving genomes (elites and representatives)
+    are not recomputed. Entries for genomes that left the population are
+    dropped each generation.
+
+    The speciation rules are those of DefaultSpeciesSet and it reads the same
+    [DefaultSpeciesSet] configuration section.
+    """
+
+    def __init__(self, config, reporters):
+        super().__init__(config, reporters)
+        self._codes = {}
+        self._encodings = {}
+        self._distances = {}  # representative key -> {genome key: distance}
+
+    def __getstate__(self):
+        # Caches are rebuilt on demand; keep checkpoints small
+        state = self.__dict__.copy()
+        state['_encodings'] = {}
+        state['_distances'] = {}
+        return state
+
+    def _encode(self, genome):
+        encoding = self._encodings.get(genome.key)
+        if encoding is None:
+            encoding = self._encodings[genome.key] = GenomeArrays(genome, self._codes)
+        return encoding
+
+    def _column(self, rep, row_of, gids, packed, genome_config, computed):
+        """Return the distances from rep to the genomes gids (an array aligned with gids)."""
+        cached = self._distances.setdefault(rep.key, {})
+        values = np.array([cached.get(gid, np.nan) for gid in gids], dtype=np.float64)
+        unknown = np.isnan(values)
+        if unknown.any():
+            missing = np.zeros(packed.size, dtype=bool)
+            positions = np.flatnonzero(unknown)
+            rows = np.array([row_of[gids[position]] for position in positions], dtype=np.int64)
+            missing[rows] = True
+            fresh = batch_distances(self._encode(rep), packed, genome_config, rows=missing)[rows]
+            values[positions] = fresh
+            cached.update(zip([gids[position] for position in positions], fresh.tolist()))
+        computed.extend(values.tolist())
+        return values
+
+    def speciate(self, config, population, generation):
+        """Place genomes into species by genetic similarity (see DefaultSpeciesSet.speciate)."""
+        assert isinstance(population, dict)
+
+        compatibility_threshold = self.species_set_config.compatibility_threshold
+        genome_config = config.genome_config
+
+        # Forget genomes that are gone, except the current representatives
+        alive = set(population)
+        alive.update(s.representative.key for s in self.species.values() if s.representative is not None)
+        self._encodings = {key: value for key, value in self._encodings.items() if key in alive}
+        self._distances = {
+            rep_key: {gid: d for gid, d in row.items() if gid in alive}
+            for rep_key, row in self._distances.items() if rep_key in alive
+        }
+
+        gids = sorted(population)
+        row_of = {gid: row for row, gid in enumerate(gids)}
+        packed = PackedGenomes([self._encode(population[gid]) for gid in gids])
+        computed = []
+
+        # Find the best representatives for each existing species
+        unspeciated = set(gids)
+        new_representatives = {}
+        new_members = {}
+        for sid, s in self.species.items():
+            candidates = sorted(unspeciated)
+            column = self._column(s.representative, row_of, candidates, packed, genome_config, computed)
+            # The new representative is the genome closest to the current representative
+            new_rid = candidates[int(np.argmin(column))]
+            new_representatives[sid] = new_rid
+            new_members[sid] = [new_rid]
+            unspeciated.remove(new_rid)
+
+        # Distances from every representative to every remaining genome, one
+        # column per representative, extended as new species appear
+        remaining = sorted(unspeciated)
+        remaining_rows = {gid: position for position, gid in enumerate(remaining)}
+        columns = {
+            sid: self._column(population[rid], row_of, remaining, packed, genome_config, computed)
+            for sid, rid in new_representatives.items()
+        }
+
+        # Partition population into species based on genetic similarity
+        for gid in remaining:
+            position = remaining_rows[gid]
+            best_sid, best_distance = None, None
+            for sid, column in columns.items():
+                d = column[position]
+                if d < compatibility_threshold and (best_distance is None or d < best_distance):
+                    best_sid, best_distance = sid, d
+
+            if best_sid is not None:
+                new_members[best_sid].append(gid)
+            else:
+                # No species is similar enough, create a new species, using
+                # this genome as its representative
+                sid = next(self.indexer)
+                new_representatives[sid] = gid
+                new_members[sid] = [gid]
+                columns[sid] = self._column(population[gid], row_of, remaining, packed, genome_config, computed)
+
+        # Update species collection based on new speciation
+        self.genome_to_species = {}
+        for sid, rid in new_representatives.items():
+            s = self.species.get(sid)
+            if s is None:
+                s = Species(sid, generation)
+                self.species[sid] = s
+
+            members = new_members[sid]
+            for gid in members:
+                self.genome_to_species[gid] = sid
+
+            member_dict = dict((gid, population[gid]) for gid in members)
+            s.update(population[rid], member_dict)
+
+        if computed:
+            self.reporters.info(
+                'Mean genetic distance {0:.3f}, standard deviation {1:.3f}'.format(mean(computed), stdev(computed)))
@@ -0,0 +1,190 @@
+import collections
+import copy
+import csv
+import json
+import os
+
+from neat.math_util import mean, median2, stdev
+from neat.reporting import BaseReporter
+
+
+class StreamingStatisticsReporter(BaseReporter):
+    """Generation statistics with bounded memory, streamed to an append-only file.
+
+    A replacement for neat.StatisticsReporter, which keeps a copy of every
+    generation's best genome and every genome's fitness for the whole run.
+    Here each generation is reduced to one summary record (best, mean,
+    stdev and median fitness, and the size and mean fitness of each
+    species) that is appended to a JSON lines file as soon as the
+    generation is evaluated. Only the last `window` records and copies of
+    the `keep_best` fittest genomes stay in memory; queries covering older
+    generations read them back from the file.
+    """
+
+    def __init__(self, path='statistics.jsonl', window=100, keep_best=10, append=False):
+        """Open the statistics file.
+
+        Args:
+            path: File the records are appended to, or None to keep only the window
+            window: Number of recent generation records held in memory
+            keep_best: Number of fittest genomes kept for best_genomes()
+            append: Continue an existing file (after restoring a checkpoint)
+                instead of starting a new one
+        """
+        BaseReporter.__init__(self)
+        self.path = path
+        self.window = window
+        self.keep_best = keep_best
+        self._recent = collections.deque(maxlen=window)
+        self._best = []  # Copies of the fittest genomes seen, best first
+        self._generation = 0
+        self._written = 0  # Records in the file
+        self._file = None
+        if path:
+            if append and os.path.exists(path):
+                with open(path) as f:
+                    self._written = sum(1 for _ in f)
+            self._file = open(path, 'a' if append else 'w')
+
+    def __getstate__(self):
+        """Return state for copying without the file handle.
+
+        Checkpoints deep-copy the species set, which holds the reporters; the
+        copy can still be queried but no longer writes.
+        """
+        state = self.__dict__.copy()
+        state['_file'] = None
+        return state
+
+    def start_generation(self, generation):
+        self._generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        scores = []
+        species_stats = {}
+        for sid, s in species.species.items():
+            fitnesses = [member.fitness for member in s.members.values()]
+            scores.extend(fitnesses)
+            species_stats[sid] = [len(fitnesses), mean(fitnesses) if fitnesses else None]
+
+        record = {
+            'generation': self._generation,
+            'best_fitness': best_genome.fitness,
+            'best_genome': best_genome.key,
+            'mean': mean(scores),
+            'stdev': stdev(scores),
+            'median': median2(scores),
+            'species': species_stats,
+        }
+        self._recent.append(record)
+        if self._file is not None:
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            self._written += 1
+
+        # Copy the genome only when it makes the top keep_best
+        best = self._best
+        if len(best) < self.keep_best or best_genome.fitness > best[-1].fitness:
+            best.append(copy.deepcopy(best_genome))
+            best.sort(key=lambda genome: genome.fitness, reverse=True)
+            del best[self.keep_best:]
+
+    def close(self):
+        """Close the statistics file; records in the window remain queryable."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def records(self):
+        """Yield the record of every generation still available, oldest first.
+
+        Without a file only the generations in the window are available.
+        """
+        recent = list(self._recent)
+        older = self._written - len(recent)
+        if self.path and older > 0:
+            if self._file is not None:
+                self._file.flush()
+            with open(self.path) as f:
+                for index, line in enumerate(f):
+                    if index >= older:
+                        break
+                    record = json.loads(line)
+                    record['species'] = {int(sid): stats for sid, stats in record['species'].items()}
+                    yield record
+        yield from recent
+
+    def get_fitness_mean(self):
+        """Get the per-generation mean fitness."""
+        return [record['mean'] for record in self.records()]
+
+    def get_fitness_stdev(self):
+        """Get the per-generation standard deviation of the fitness."""
+        return [record['stdev'] for record in self.records()]
+
+    def get_fitness_median(self):
+        """Get the per-generation median fitness."""
+        return [record['median'] for record in self.records()]
+
+    def get_fitness_best(self):
+        """Get the per-generation best fitness."""
+        return [record['best_fitness'] for record in self.records()]
+
+    def best_genomes(self, n):
+        """Returns the n most fit genomes seen (at most keep_best)."""
+        return self._best[:n]
+
+    def best_unique_genomes(self, n):
+        """Returns the n most fit genomes seen, with no duplication."""
+        unique = {}
+        for genome in self._best:
+            unique.setdefault(genome.key, genome)
+        return list(unique.values())[:n]
+
+    def best_genome(self):
+        """Returns the most fit genome seen."""
+        return self._best[0]
+
+    def get_species_sizes(self):
+        """Get per-generation species sizes, one column per species id from 1."""
+        max_species = max((max(record['species'], default=0) for record in self.records()), default=0)
+        return [[record['species'].get(sid, (0, None))[0] for sid in range(1, max_species + 1)]
+                for record in self.records()]
+
+    def get_species_fitness(self, null_value=''):
+        """Get per-generation species mean fitness, null_value where a species is absent."""
+        max_species = max((max(record['species'], default=0) for record in self.records()), default=0)
+        species_fitness = []
+        for record in self.records():
+            row = []
+            for sid in range(1, max_species + 1):
+                stats = record['species'].get(sid)
+                row.append(stats[1] if stats and stats[1] is not None else null_value)
+            species_fitness.append(row)
+        return species_fitness
+
+    def save(self):
+        self.save_genome_fitness()
+        self.save_species_count()
+        self.save_species_fitness()
+
+    def save_genome_fitness(self, delimiter=' ', filename='fitness_history.csv'):
+        """Saves the population's best and average fitness."""
+        with open(filename, 'w') as f:
+            w = csv.writer(f, delimiter=delimiter)
+            for record in self.records():
+                w.writerow([record['best_fitness'], record['mean']])
+
+    def save_species_count(self, delimiter=' ', filename='speciation.csv'):
+        """Log speciation throughout evolution."""
+        with open(filename, 'w') as f:
+            w = csv.writer(f, delimiter=delimiter)
+            for row in self.get_species_sizes():
+                w.writerow(row)
+
+    def save_species_fitness(self, delimiter=' ', null_value='NA', filename='species_fitness.csv'):
+        """Log species' average fitness throughout evolution."""
+        with open(filename, 'w') as f:
+            w = csv.writer(f, delimiter=delimiter)
+            for row in self.get_species_fitness(null_value):
+                w.writerow(row)
@@ -0,0 +1,357 @@
+import argparse
+import concurrent.futures
+import configparser
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import time
+
+DEFAULT_SIM_CONFIG = 'config/simulation-config.json'
+DEFAULT_NEAT_CONFIG = 'config/neat-config.ini'
+
+# Random-search distributions: {"uniform": [low, high]} and friends
+DISTRIBUTIONS = {
+    'uniform': lambda rng, low, high: rng.uniform(low, high),
+    'log_uniform': lambda rng, low, high: math.exp(rng.uniform(math.log(low), math.log(high))),
+    'int': lambda rng, low, high: rng.randint(low, high),
+}
+
+
+def _is_neat_key(name):
+    # "Section.key" names a neat-config.ini entry, anything else a simulation setting
+    return '.' in name
+
+
+def sample_value(values, rng):
+    """Draw one value from a list (uniform choice) or a distribution spec."""
+    if isinstance(values, list):
+        return rng.choice(values)
+    (kind, bounds), = values.items()
+    return DISTRIBUTIONS[kind](rng, *bounds)
+
+
+def expand_spec(spec):
+    """Return the parameter sets a sweep spec describes.
+
+    A spec is a dictionary (usually read from JSON):
+
+        {
+            "mode": "grid",                 # or "random"
+            "samples": 20,                  # random mode: number of parameter sets
+            "seed": 0,                      # random mode: sampling seed; also the first run seed
+            "repeats": 2,                   # runs of each parameter set, with seeds seed, seed + 1, ...
+            "fixed": {"num_generations": 30},
+            "parameters": {
+                "detection_radius": [100, 200],
+                "NEAT.pop_size": [50, 150],
+                "DefaultGenome.weight_mutate_rate": {"uniform": [0.4, 0.9]}
+            }
+        }
+
+    Names containing a dot are "Section.key" entries of neat-config.ini, the
+    rest simulation-config.json keys. Grid mode takes every combination of
+    the listed values; random mode draws each parameter from its list or
+    distribution (uniform, log_uniform, int).
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    parameters = spec.get('parameters') or {}
+    mode = spec.get('mode', 'grid')
+    for name, values in parameters.items():
+        if isinstance(values, list):
+            if not values:
+                raise ValueError(f"Parameter '{name}' has no values")
+            continue
+        if mode != 'random':
+            raise ValueError(f"Parameter '{name}': grid sweeps need a list of values")
+        if not isinstance(values, dict) or len(values) != 1 or next(iter(values)) not in DISTRIBUTIONS:
+            raise ValueError(f"Parameter '{name}': expected a list or one of {', '.join(DISTRIBUTIONS)}")
+
+    names = sorted(parameters)
+    if mode == 'grid':
+        return [dict(zip(names, combination))
+                for combination in itertools.product(*(parameters[name] for name in names))]
+    if mode == 'random':
+        rng = random.Random(spec.get('seed', 0))
+        return [{name: sample_value(parameters[name], rng) for name in names}
+                for _ in range(spec.get('samples', 10))]
+    raise ValueError(f"Unknown sweep mode '{mode}', expected 'grid' or 'random'")
+
+
+def job_id(params, seed):
+    """Return a stable id for a run, derived from its settings and seed."""
+    text = json.dumps({'params': params, 'seed': seed}, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def make_jobs(spec, sim_config, neat_config_path):
+    """Expand a spec into jobs, validating every variant before anything runs.
+
+    Args:
+        spec: Sweep spec (see expand_spec)
+        sim_config: Base simulation configuration dictionary
+        neat_config_path: Base neat-config.ini
+
+    Returns:
+        A list of job dictionaries with id, seed, params, sim_config and neat_settings
+
+    Raises:
+        ValueError: If a parameter names an unknown setting
+    """
+    from sim_params import HEADLESS, SimParams
+
+    base_neat = configparser.ConfigParser()
+    base_neat.read(neat_config_path)
+    fixed = spec.get('fixed') or {}
+    first_seed = spec.get('seed', 0)
+
+    jobs = []
+    for params in expand_spec(spec):
+        settings = dict(fixed, **params)
+        variant = dict(sim_config)
+        neat_settings = {}
+        for name, value in settings.items():
+            if _is_neat_key(name):
+                section, key = name.split('.', 1)
+                if not base_neat.has_option(section, key):
+                    raise ValueError(f"'{name}' is not a setting in {neat_config_path}")
+                neat_settings[name] = value
+            else:
+                variant[name] = value
+        variant.update(HEADLESS)
+        SimParams.from_config(variant)  # Raises ConfigError for unknown keys and bad types
+
+        for repeat in range(spec.get('repeats', 1)):
+            seed = first_seed + repeat
+            jobs.append({'id': job_id(settings, seed), 'seed': seed, 'params': params,
+                         'sim_config': variant, 'neat_settings': neat_settings})
+    return jobs
+
+
+def write_neat_config(base_path, settings, path):
+    """Write a copy of base_path with "Section.key" settings replaced."""
+    parser = configparser.ConfigParser()
+    parser.read(base_path)
+    for name, value in settings.items():
+        section, key = name.split('.', 1)
+        if isinstance(value, bool):
+            value = str(value)
+        parser.set(section, key, str(value))
+    with open(path, 'w') as f:
+        parser.write(f)
+
+
+def run_job(job, job_dir, base_neat_config):
+    """Run one headless evolution in job_dir and return its result record.
+
+    The simulation writes its usual files (best_koi.pkl, checkpoints) into
+    job_dir, and its output goes to job_dir/log.txt.
+    """
+    os.makedirs(job_dir, exist_ok=True)
+    neat_path = os.path.join(job_dir, 'neat-config.ini')
+    write_neat_config(base_neat_config, job['neat_settings'], neat_path)
+    with open(os.path.join(job_dir, 'simulation-config.json'), 'w') as f:
+        json.dump(job['sim_config'], f, indent=4)
+
+    record = {'id': job['id'], 'seed': job['seed'], 'params': job['params'], 'status': 'failed'}
+    started = time.time()
+    previous_dir = os.getcwd()
+    with open(os.path.join(job_dir, 'log.txt'), 'w') as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            from config_cache import load_neat_config
+            from simulation import Simulation
+            os.chdir(job_dir)
+            random.seed(job['seed'])
+            simulation = Simulation(load_neat_config(neat_path), dict(job['sim_config']))
+            winner = simulation.run()
+            if winner is not None:
+                population = simulation.population
+                nodes, connections = winner.size()
+                record.update(status='ok', best_fitness=winner.fitness, generations=population.generation,
+                              species=len(population.species.species), nodes=nodes, connections=connections)
+        except Exception as e:
+            record['error'] = str(e)
+            import traceback
+            traceback.print_exc()
+        finally:
+            os.chdir(previous_dir)
+    record['seconds'] = round(time.time() - started, 1)
+    return record
+
+
+def load_results(path):
+    """Return the latest result record of each job in a results file."""
+    results = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    results[record['id']] = record
+                except (ValueError, KeyError):
+                    continue  # Skip a line cut short by an interruption
+    return results
+
+
+def run_sweep(spec, sweep_dir, sim_config=DEFAULT_SIM_CONFIG, neat_config_path=DEFAULT_NEAT_CONFIG,
+              workers=None, retries=1):
+    """Run every job of a sweep that has not completed yet.
+
+    Each job runs in a fresh worker process in its own directory under
+    sweep_dir/jobs. Finished jobs are appended to sweep_dir/results.jsonl
+    as they complete, so an interrupted sweep picks up where it stopped and
+    completed jobs are never run twice. Failed jobs (including ones lost
+    to a crashed worker) are retried up to retries more times, and again on
+    the next invocation.
+
+    Args:
+        spec: Sweep spec dictionary or path to a JSON file (see expand_spec)
+        sweep_dir: Directory for job files, progress and the summary
+        sim_config: Base simulation configuration (path or dictionary)
+        neat_config_path: Base neat-config.ini
+        workers: Concurrent jobs (None for one per CPU, 1 to run in this process)
+        retries: Extra attempts for failed jobs within this invocation
+
+    Returns:
+        The summary rows (see summarize)
+    """
+    if isinstance(spec, str):
+        with open(spec) as f:
+            spec = json.load(f)
+    if isinstance(sim_config, str):
+        from config_cache import load_sim_config
+        sim_config = load_sim_config(sim_config)
+    neat_config_path = os.path.abspath(neat_config_path)
+    sweep_dir = os.path.abspath(sweep_dir)
+
+    jobs = make_jobs(spec, sim_config, neat_config_path)
+    os.makedirs(sweep_dir, exist_ok=True)
+    with open(os.path.join(sweep_dir, 'spec.json'), 'w') as f:
+        json.dump(spec, f, indent=4)
+
+    results_path = os.path.join(sweep_dir, 'results.jsonl')
+    results = load_results(results_path)
+
+    def record(result):
+        results[result['id']] = result
+        with open(results_path, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+        print(f"  Job {result['id']} {result['status']} in {result['seconds']}s: "
+              f"{result['params']} -> {result.get('best_fitness')}")
+
+    for attempt in range(retries + 1):
+        pending = [job for job in jobs if results.get(job['id'], {}).get('status') != 'ok']
+        if not pending:
+            break
+        print(f"Sweep: {len(jobs)} jobs, {len(jobs) - len(pending)} done, running {len(pending)}"
+              + (f" (retry {attempt})" if attempt else ""))
+        if workers == 1:
+            for job in pending:
+                record(run_job(job, os.path.join(sweep_dir, 'jobs', job['id']), neat_config_path))
+            continue
+        # One process per job, so memory and module state never carry over
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+            futures = {pool.submit(run_job, job, os.path.join(sweep_dir, 'jobs', job['id']), neat_config_path): job
+                       for job in pending}
+            for future in concurrent.futures.as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'id': job['id'], 'seed': job['seed'], 'params': job['params'],
+                              'status': 'failed', 'error': f"Worker failed: {e}", 'seconds': 0.0}
+                record(result)
+
+    rows = summarize([results[job['id']] for job in jobs if job['id'] in results])
+    write_summary(rows, os.path.join(sweep_dir, 'summary.csv'))
+    return rows
+
+
+def summarize(records):
+    """Aggregate job records into one row per parameter set, best mean fitness first."""
+    groups = {}
+    for record in records:
+        key = json.dumps(record['params'], sort_keys=True)
+        groups.setdefault(key, []).append(record)
+
+    rows = []
+    for group in groups.values():
+        done = [record for record in group if record['status'] == 'ok']
+        fitnesses = [record['best_fitness'] for record in done]
+        row = dict(group[0]['params'])
+        row.update(
+            runs=len(done),
+            failed=len(group) - len(done),
+            mean_best_fitness=statistics.fmean(fitnesses) if fitnesses else None,
+            stdev_best_fitness=statistics.stdev(fitnesses) if len(fitnesses) > 1 else 0.0,
+            max_best_fitness=max(fitnesses) if fitnesses else None,
+            mean_generations=statistics.fmean(record['generations'] for record in done) if done else None,
+            mean_seconds=statistics.fmean(record['seconds'] for record in group),
+        )
+        rows.append(row)
+    rows.sort(key=lambda row: (row['mean_best_fitness'] is not None, row['mean_best_fitness'] or 0.0), reverse=True)
+    return rows
+
+
+def write_summary(rows, path):
+    """Write summary rows as a CSV table."""
+    columns = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_summary(rows, limit=20):
+    """Return the best summary rows as a text table."""
+    if not rows:
+        return "No results"
+    columns = list(rows[0])
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+
+    def cell(value):
+        return f"{value:.3g}" if isinstance(value, float) else str(value)
+
+    table = [columns] + [[cell(row.get(column)) for column in columns] for row in rows[:limit]]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    return '\n'.join('  '.join(value.rjust(width) for value, width in zip(line, widths)) for line in table)
+
+
+def main():
+    """Run a parameter sweep from the command line."""
+    parser = argparse.ArgumentParser(description="Sweep simulation and NEAT settings with headless runs")
+    parser.add_argument('spec', help="Sweep spec JSON file")
+    parser.add_argument('--out', default='sweep', help="Directory for jobs, progress and the summary")
+    parser.add_argument('--workers', type=int, default=None, help="Concurrent jobs (default: one per CPU)")
+    parser.add_argument('--retries', type=int, default=1, help="Extra attempts for failed jobs")
+    parser.add_argument('--sim-config', default=DEFAULT_SIM_CONFIG, help="Base simulation configuration")
+    parser.add_argument('--neat-config', default=DEFAULT_NEAT_CONFIG, help="Base NEAT configuration")
+    parser.add_argument('--dry-run', action='store_true', help="List the jobs without running them")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        from config_cache import load_sim_config
+        with open(args.spec) as f:
+            spec = json.load(f)
+        for job in make_jobs(spec, load_sim_config(args.sim_config), args.neat_config):
+            print(f"{job['id']}  seed {job['seed']}  {job['params']}")
+        return
+
+    rows = run_sweep(args.spec, args.out, args.sim_config, args.neat_config, args.workers, args.retries)
+    print(format_summary(rows))
+    print(f"Summary written to {os.path.join(args.out, 'summary.csv')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+import glob
+import os
+import queue
+import re
+import threading
+
+import numpy as np
+
+# Number of network outputs stored per koi per step (matches the NEAT config)
+NUM_OUTPUTS = 5
+
+# Event kinds stored in the event_kind column
+EVENT_PAD_CONSUMED = 0
+EVENT_PAD_SPAWNED = 1
+
+# Chunk files are named after the generation and their position in it
+CHUNK_PATTERN = 'gen{generation:05d}_chunk{chunk:05d}.npz'
+CHUNK_REGEX = re.compile(r'gen(\d+)_chunk(\d+)\.npz$')
+
+# Consolidated replay caches built from a generation's chunks (see replay.py)
+CACHE_NAMES = ('frames', 'keyframes', 'pads')
+
+
+def cache_paths(directory, generation):
+    """Return the paths of a generation's replay caches, in CACHE_NAMES order."""
+    return [os.path.join(directory, f'gen{generation:05d}_{name}.npy') for name in CACHE_NAMES]
+
+
+def list_chunks(directory, generation=None):
+    """List recorded chunk files as sorted (generation, chunk, path) tuples.
+
+    Args:
+        directory: Telemetry directory written by a TrajectoryRecorder
+        generation: Only list chunks of this generation when given
+    """
+    chunks = []
+    for path in glob.glob(os.path.join(directory, 'gen*_chunk*.npz')):
+        match = CHUNK_REGEX.search(path)
+        if match:
+            chunk_generation, chunk = int(match.group(1)), int(match.group(2))
+            if generation is None or chunk_generation == generation:
+                chunks.append((chunk_generation, chunk, path))
+    return sorted(chunks)
+
+
+class TrajectoryRecorder:
+    """Opt-in recorder that streams per-step koi trajectories to disk.
+
+    The simulation thread only appends plain tuples to the current chunk. Full
+    chunks are handed to a background thread through a bounded queue, where they
+    are converted to column arrays and written as compressed .npz files. When
+    the writer falls behind, the queue applies back-pressure instead of letting
+    memory grow.
+
+    Each chunk holds these columns, one row per living koi per step:
+    step, koi_id (genome key), species_id, x, y, hunger, energy and outputs
+    (NUM_OUTPUTS network outputs), plus event_* columns with one row per lily
+    pad spawned or consumed: event_step, event_kind, event_koi_id (-1 for
+    spawns), event_x, event_y.
+    """
+
+    def __init__(self, directory, chunk_steps=100, max_pending_chunks=4):
+        """Create the recorder and start its writer thread.
+
+        Args:
+            directory: Directory the chunk files are written to
+            chunk_steps: Number of simulation steps per chunk file
+            max_pending_chunks: Chunks allowed to wait for the writer
+        """
+        self.directory = directory
+        self.chunk_steps = chunk_steps
+        os.makedirs(directory, exist_ok=True)
+
+        self.generation = 0
+        self._chunk_index = 0
+        self._chunk_step_count = 0
+        self._rows = []
+        self._events = []
+        self._koi_list = []
+
+        self._queue = queue.Queue(maxsize=max_pending_chunks)
+        self._error = None
+        self._writer = threading.Thread(target=self._write_loop, name='telemetry-writer', daemon=True)
+        self._writer.start()
+
+    def begin_generation(self, generation, koi_list):
+        """Start recording a new generation, flushing anything still buffered.
+
+        Replay caches left by an earlier recording of the same generation
+        are removed, so a replay consolidates the new chunks.
+
+        Args:
+            generation: Generation number used to name the chunk files
+            koi_list: Every koi of the generation; koi that die mid-step still
+                report the lily pads they ate on that step
+        """
+        self.flush()
+        self.generation = generation
+        self._chunk_index = 0
+        for path in cache_paths(self.directory, generation):
+            if os.path.exists(path):
+                os.remove(path)
+        self._koi_list = list(koi_list)
+
+    def record_spawn(self, step, lily_pads):
+        """Record lily pads that appeared before the given step."""
+        for lily_pad in lily_pads:
+            self._events.append((step, EVENT_PAD_SPAWNED, -1, lily_pad.position[0], lily_pad.position[1]))
+
+    def record_step(self, step, koi_list):
+        """Append the state of every living koi for one simulation step."""
+        rows = self._rows
+        for koi_fish in koi_list:
+            position = koi_fish.position
+            rows.append((
+                step, koi_fish.genome.key, koi_fish.species_id or 0, position[0], position[1],
+                koi_fish.hunger, koi_fish.energy, koi_fish.last_outputs
+            ))
+
+        events = self._events
+        for koi_fish in self._koi_list:
+            if koi_fish.eaten_lily_pads:
+                for lily_pad in koi_fish.eaten_lily_pads:
+                    events.append((step, EVENT_PAD_CONSUMED, koi_fish.genome.key,
+                                   lily_pad.position[0], lily_pad.position[1]))
+                koi_fish.eaten_lily_pads.clear()
+
+        self._chunk_step_count += 1
+        if self._chunk_step_count >= self.chunk_steps:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered steps to the writer thread as one chunk."""
+        if self._error is not None:
+            raise RuntimeError(f"Telemetry writer failed: {self._error}")
+        if self._chunk_step_count == 0:
+            return
+
+        filename = CHUNK_PATTERN.format(generation=self.generation, chunk=self._chunk_index)
+        self._queue.put((os.path.join(self.directory, filename), self._rows, self._events))
+        self._chunk_index += 1
+        self._chunk_step_count = 0
+        self._rows = []
+        self._events = []
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, rows, events = item
+                self._write_chunk(path, rows, events)
+            except Exception as e:
+                self._error = e
+                print(f"Error writing telemetry chunk: {e}")
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write_chunk(path, rows, events):
+        """Convert buffered rows to columns and write them compressed."""
+        count = len(rows)
+        columns = {
+            'step': np.empty(count, dtype=np.int32),
+            'koi_id': np.empty(count, dtype=np.int64),
+            'species_id': np.empty(count, dtype=np.int32),
+            'x': np.empty(count, dtype=np.float32),
+            'y': np.empty(count, dtype=np.float32),
+            'hunger': np.empty(count, dtype=np.float32),
+            'energy': np.empty(count, dtype=np.float32),
+            'outputs': np.zeros((count, NUM_OUTPUTS), dtype=np.float32),
+        }
+        if count:
+            step, koi_id, species_id, x, y, hunger, energy, outputs = zip(*rows)
+            columns['step'][:] = step
+            columns['koi_id'][:] = koi_id
+            columns['species_id'][:] = species_id
+            columns['x'][:] = x
+            columns['y'][:] = y
+            columns['hunger'][:] = hunger
+            columns['energy'][:] = energy
+            for row, koi_outputs in enumerate(outputs):
+                if koi_outputs is not None:
+                    columns['outputs'][row, :len(koi_outputs)] = koi_outputs[:NUM_OUTPUTS]
+
+        event_columns = np.array(events, dtype=np.float64).reshape(-1, 5)
+        columns['event_step'] = event_columns[:, 0].astype(np.int32)
+        columns['event_kind'] = event_columns[:, 1].astype(np.int8)
+        columns['event_koi_id'] = event_columns[:, 2].astype(np.int64)
+        columns['event_x'] = event_columns[:, 3].astype(np.float32)
+        columns['event_y'] = event_columns[:, 4].astype(np.float32)
+
+        # Write to a temporary name so readers never see a partial chunk
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(f, **columns)
+        os.replace(temp_path, path)
+
+    def close(self):
+        """Flush buffered steps and wait for the writer to finish."""
+        if not self._writer.is_alive():
+            return
+        self.flush()
+        self._koi_list = []
+        self._queue.put(None)
+        self._writer.join()
+
+
+def load_chunk(path):
+    """Load a chunk file into a dict of column arrays."""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
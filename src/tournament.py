@@ -0,0 +1,257 @@
+import argparse
+import concurrent.futures
+import contextlib
+import copy
+import hashlib
+import io
+import json
+import math
+import os
+import random
+import statistics
+import struct
+
+from inference_server import DEFAULT_NEAT_CONFIG, load_genome
+from sim_params import HEADLESS
+
+DEFAULT_SIM_CONFIG = 'config/simulation-config.json'
+DEFAULT_CACHE = 'tournament-cache.jsonl'
+
+# Two-sided 95% critical values of Student's t for 1-30 degrees of freedom
+T_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+def genome_hash(genome, config):
+    """Return a hex digest identifying what a genome's network computes.
+
+    The digest is taken over the exported network (see koi_brain.encode_genome)
+    with the genome key and fitness blanked, so copies of one genome saved in
+    different runs or checkpoints share cache entries.
+    """
+    from koi_brain import HEADER_FORMAT, encode_genome
+    data = encode_genome(genome, config)
+    header = list(struct.unpack_from(HEADER_FORMAT, data))
+    header[2], header[3] = 0, 0.0  # genome key, fitness
+    digest = hashlib.sha256(struct.pack(HEADER_FORMAT, *header))
+    digest.update(data[struct.calcsize(HEADER_FORMAT):])
+    return digest.hexdigest()
+
+
+def settings_hash(sim_config, copies, config):
+    """Return a digest of everything besides the genome that affects a match."""
+    sensors = getattr(config, 'koi_sensors', None)
+    settings = {
+        'sim_config': sim_config,
+        'copies': copies,
+        'sensors': sorted(vars(sensors).items()) if sensors is not None else None,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=repr).encode()).hexdigest()[:16]
+
+
+def headless_config(sim_config):
+    """Return a copy of sim_config suitable for unattended matches."""
+    sim_config = dict(sim_config)
+    sim_config.update(HEADLESS)
+    return sim_config
+
+
+def play_match(genome, config, sim_config, seed, copies):
+    """Run one match and return the fitness of each copy of the genome.
+
+    The pond is created from the seed, so every entrant playing that seed
+    starts from the same lily pads and starting positions. The simulation's
+    own progress output is discarded.
+
+    Args:
+        genome: The genome to evaluate
+        config: The NEAT config the genome belongs to
+        sim_config: Headless simulation configuration
+        seed: Seed for the pond layout and the simulation's randomness
+        copies: Number of koi driven by the genome
+
+    Returns:
+        A list with one fitness per copy
+    """
+    from simulation import Simulation
+    random.seed(seed)
+    genomes = [(index + 1, copy.deepcopy(genome)) for index in range(copies)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation = Simulation(config, dict(sim_config))
+        try:
+            simulation.eval_genomes(genomes, config)
+        finally:
+            simulation.cleanup()
+    return [member.fitness for _, member in genomes]
+
+
+def confidence_interval(scores):
+    """Return (mean, stdev, low, high) with a 95% t interval for the mean."""
+    mean = statistics.fmean(scores)
+    if len(scores) < 2:
+        return mean, 0.0, mean, mean
+    stdev = statistics.stdev(scores)
+    degrees = len(scores) - 1
+    t = T_95[degrees - 1] if degrees <= len(T_95) else 1.96
+    half_width = t * stdev / math.sqrt(len(scores))
+    return mean, stdev, mean - half_width, mean + half_width
+
+
+class ResultCache:
+    """Match results keyed by (settings, genome hash, seed), kept in an append-only JSON lines file."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        key = (entry['settings'], entry['genome'], entry['seed'])
+                        self.results[key] = entry['scores']
+                    except (ValueError, KeyError):
+                        continue  # Skip a line cut short by an interrupted run
+
+    def get(self, settings, genome, seed):
+        return self.results.get((settings, genome, seed))
+
+    def put(self, settings, genome, seed, scores):
+        self.results[(settings, genome, seed)] = scores
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps({'settings': settings, 'genome': genome,
+                                    'seed': seed, 'scores': scores}) + '\n')
+
+
+def run_tournament(paths, sim_config, seeds, copies=3, workers=None, cache_path=DEFAULT_CACHE,
+                   neat_config_path=DEFAULT_NEAT_CONFIG):
+    """Evaluate saved genomes on a set of seeded ponds and rank them.
+
+    Each entrant plays every seed; a match's score is the mean fitness of
+    its copies. Matches already in the cache are not played again, so
+    adding an entrant to a finished tournament only plays that entrant's
+    matches. Results are cached as they arrive, so an interrupted
+    tournament resumes where it stopped.
+
+    Args:
+        paths: Saved genomes (best_koi.pkl, or checkpoints, whose fittest genome enters)
+        sim_config: Simulation configuration (path or dictionary); rendering and
+            recording settings are switched off
+        seeds: Seeds of the ponds to play
+        copies: Koi per entrant in each pond
+        workers: Processes to run matches in (None for one per CPU, 1 to play in this process)
+        cache_path: Result cache file, or None for no cache
+        neat_config_path: NEAT config for files that do not carry one
+
+    Returns:
+        Report rows sorted best first, each a dictionary with rank, name, path,
+        genome, matches, mean, stdev, ci_low and ci_high
+    """
+    if isinstance(sim_config, str):
+        from config_cache import load_sim_config
+        sim_config = load_sim_config(sim_config)
+    sim_config = headless_config(sim_config)
+    seeds = list(seeds)
+
+    entrants = []
+    for path in paths:
+        genome, config = load_genome(path, neat_config_path)
+        entrants.append({
+            'name': os.path.basename(path),
+            'path': path,
+            'genome': genome,
+            'config': config,
+            'hash': genome_hash(genome, config),
+            'settings': settings_hash(sim_config, copies, config),
+        })
+
+    # Matches to play, once per distinct (settings, genome, seed)
+    cache = ResultCache(cache_path)
+    pending = {}
+    for entrant in entrants:
+        for seed in seeds:
+            key = (entrant['settings'], entrant['hash'], seed)
+            if cache.get(*key) is None and key not in pending:
+                pending[key] = entrant
+    print(f"Tournament: {len(entrants)} entrants, {len(seeds)} seeds, "
+          f"{len(pending)} matches to play ({len(entrants) * len(seeds) - len(pending)} cached)")
+
+    if pending:
+        if workers == 1:
+            for done, (key, entrant) in enumerate(pending.items(), 1):
+                scores = play_match(entrant['genome'], entrant['config'], sim_config, key[2], copies)
+                cache.put(*key, scores)
+                print(f"  Played {done}/{len(pending)}: {entrant['name']} on seed {key[2]}")
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(play_match, entrant['genome'], entrant['config'], sim_config, key[2], copies): (key, entrant)
+                    for key, entrant in pending.items()
+                }
+                for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                    key, entrant = futures[future]
+                    try:
+                        cache.put(*key, future.result())
+                        print(f"  Played {done}/{len(pending)}: {entrant['name']} on seed {key[2]}")
+                    except Exception as e:
+                        print(f"  Match for {entrant['name']} on seed {key[2]} failed: {e}")
+
+    rows = []
+    for entrant in entrants:
+        scores = []
+        for seed in seeds:
+            result = cache.get(entrant['settings'], entrant['hash'], seed)
+            if result is not None:
+                scores.append(statistics.fmean(result))
+        mean, stdev, low, high = confidence_interval(scores) if scores else (float('nan'),) * 4
+        rows.append({'name': entrant['name'], 'path': entrant['path'], 'genome': entrant['hash'][:12],
+                     'matches': len(scores), 'mean': mean, 'stdev': stdev, 'ci_low': low, 'ci_high': high})
+
+    rows.sort(key=lambda row: row['mean'] if row['matches'] else float('-inf'), reverse=True)
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = rank
+    return rows
+
+
+def format_report(rows):
+    """Return the ranked report as a text table."""
+    lines = [f"{'Rank':>4}  {'Entrant':<28} {'Genome':<12} {'Matches':>7} {'Mean':>10} {'Stdev':>9}  95% CI"]
+    for row in rows:
+        lines.append(f"{row['rank']:>4}  {row['name'][:28]:<28} {row['genome']:<12} {row['matches']:>7} "
+                     f"{row['mean']:>10.2f} {row['stdev']:>9.2f}  [{row['ci_low']:.2f}, {row['ci_high']:.2f}]")
+    return '\n'.join(lines)
+
+
+def main():
+    """Rank saved genomes from the command line."""
+    parser = argparse.ArgumentParser(description="Rank saved koi genomes on shared seeded ponds")
+    parser.add_argument('genomes', nargs='+', help="best_koi.pkl files or checkpoints")
+    parser.add_argument('--seeds', type=int, default=10, help="Number of ponds to play")
+    parser.add_argument('--first-seed', type=int, default=0, help="Seed of the first pond")
+    parser.add_argument('--copies', type=int, default=3, help="Koi per entrant in each pond")
+    parser.add_argument('--steps', type=int, default=None, help="Override simulation_steps")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help="Result cache file ('' to disable)")
+    parser.add_argument('--sim-config', default=DEFAULT_SIM_CONFIG, help="Simulation configuration")
+    parser.add_argument('--config', default=DEFAULT_NEAT_CONFIG, help="NEAT configuration for pickled genomes")
+    parser.add_argument('--output', default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    from config_cache import load_sim_config
+    sim_config = dict(load_sim_config(args.sim_config))
+    if args.steps is not None:
+        sim_config['simulation_steps'] = args.steps
+
+    rows = run_tournament(args.genomes, sim_config, range(args.first_seed, args.first_seed + args.seeds),
+                          copies=args.copies, workers=args.workers, cache_path=args.cache or None,
+                          neat_config_path=args.config)
+    print(format_report(rows))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"Wrote the report to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
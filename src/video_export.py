@@ -0,0 +1,91 @@
+import os
+import queue
+import threading
+
+import pygame
+
+
+class FrameExporter:
+    """Write rendered frames to disk as an image sequence from a background thread.
+
+    The renderer hands over its surface after drawing each frame. Every
+    stride-th frame is copied (and optionally rescaled) on the calling thread,
+    which is a fast C-level blit, and the encoding happens on a writer thread
+    behind a bounded queue. Frames land in <directory>/gen<N>/frame<M>.png, one
+    folder per generation, ready for tools such as ffmpeg.
+    """
+
+    def __init__(self, directory, stride=1, size=None, image_format='png', max_pending=8):
+        """Create the exporter and start its encoding thread.
+
+        Args:
+            directory: Root directory of the exported frames
+            stride: Export one frame out of every stride frames
+            size: Optional (width, height) to rescale frames to
+            image_format: File extension understood by pygame.image.save
+            max_pending: Frames allowed to wait for the encoder
+        """
+        self.directory = directory
+        self.stride = max(1, stride)
+        self.size = tuple(size) if size else None
+        self.image_format = image_format
+        os.makedirs(directory, exist_ok=True)
+
+        self.frames_seen = 0
+        self.frames_written = 0
+        self._generation = None
+        self._generation_frame = 0
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._writer = threading.Thread(target=self._encode_loop, name='frame-encoder', daemon=True)
+        self._writer.start()
+
+    def submit(self, surface, generation=0):
+        """Offer a freshly rendered frame; only every stride-th one is kept."""
+        if self._error is not None:
+            raise RuntimeError(f"Frame encoder failed: {self._error}")
+
+        if generation != self._generation:
+            self._generation = generation
+            self._generation_frame = 0
+            os.makedirs(self._generation_dir(generation), exist_ok=True)
+
+        index = self._generation_frame
+        self._generation_frame += 1
+        self.frames_seen += 1
+        if index % self.stride:
+            return
+
+        if self.size and self.size != surface.get_size():
+            frame = pygame.transform.smoothscale(surface, self.size)
+        else:
+            frame = surface.copy()
+        path = os.path.join(self._generation_dir(generation), f'frame{index // self.stride:06d}.{self.image_format}')
+        self._queue.put((path, frame))
+
+    def _generation_dir(self, generation):
+        return os.path.join(self.directory, f'gen{generation:05d}')
+
+    def _encode_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, frame = item
+                pygame.image.save(frame, path)
+                self.frames_written += 1
+            except Exception as e:
+                self._error = e
+                print(f"Error encoding frame: {e}")
+            finally:
+                self._queue.task_done()
+
+    def close(self):
+        """Wait for queued frames to be written and stop the encoder."""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join()
+        print(f"Exported {self.frames_written} frames to {self.directory}")
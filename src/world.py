@@ -0,0 +1,261 @@
+import math
+import random
+
+from food import LilyPad
+from spatial_index import SpatialHash
+
+
+class Chunk:
+    """Bookkeeping for one square tile of the pond.
+
+    The pads and koi a chunk owns live in the world's spatial layers; the
+    chunk itself only records whether its lily pads exist yet and when it
+    was last active.
+    """
+
+    __slots__ = ('key', 'left', 'top', 'right', 'bottom', 'generated', 'last_active_step')
+
+    def __init__(self, key, chunk_size):
+        self.key = key
+        self.left = key[0] * chunk_size
+        self.top = key[1] * chunk_size
+        self.right = self.left + chunk_size
+        self.bottom = self.top + chunk_size
+        self.generated = False
+        self.last_active_step = None
+
+
+class TiledWorld:
+    """A pond divided into square chunks that own their lily pads and resident koi.
+
+    Chunks are the cells of two SpatialHash layers, `pads` and `koi`, built
+    with the chunk size, so an object belongs to the chunk it is filed in and
+    neighbour queries only visit the chunks they overlap. A chunk is active
+    while a koi is inside it or close enough to see into it (within `halo`).
+
+    With lazy=True a chunk's lily pads are only created the first time it
+    becomes active, so huge ponds cost nothing where no koi swims. The pad
+    count is split between the chunks up front (see _chunk_pad_count) and
+    the pads are drawn from a per-chunk random stream, so a chunk's layout
+    does not depend on the order in which chunks are visited.
+    """
+
+    def __init__(self, width, height, chunk_size, halo=None, lazy=False):
+        """Create an empty world.
+
+        Args:
+            width: Pond width in world units
+            height: Pond height in world units
+            chunk_size: Width and height of a chunk in world units
+            halo: How far koi see beyond their own chunk (defaults to chunk_size)
+            lazy: Create lily pads only when their chunk first becomes active
+        """
+        self.width = width
+        self.height = height
+        self.chunk_size = float(chunk_size)
+        self.halo = self.chunk_size if halo is None else halo
+        self.lazy = lazy
+
+        self.pads = SpatialHash(chunk_size)
+        self.koi = SpatialHash(chunk_size)
+        self.chunks = {}
+
+        self._pad_count = 0
+        self._pad_phase = 0.0
+        self._pad_seed = 0
+        self._pad_factory = LilyPad
+
+    @property
+    def columns(self):
+        """Number of chunk columns covering the pond."""
+        return max(1, math.ceil(self.width / self.chunk_size))
+
+    @property
+    def rows(self):
+        """Number of chunk rows covering the pond."""
+        return max(1, math.ceil(self.height / self.chunk_size))
+
+    def chunk(self, key):
+        """Return the Chunk for a (column, row) key, creating it on first use."""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = Chunk(key, self.chunk_size)
+        return chunk
+
+    def chunk_at(self, position):
+        """Return the Chunk containing a world position."""
+        return self.chunk(self.pads.cell_key(position))
+
+    def spawn_pads(self, count, rng=random, pad_factory=LilyPad):
+        """Start a new layout of count lily pads, replacing the current one.
+
+        Eager worlds place every pad now, uniformly over the pond (using rng
+        the way the simulation always has). Lazy worlds only remember the
+        density; pads appear as chunks are activated by activate().
+
+        Args:
+            count: Number of lily pads in the pond
+            rng: Random source for positions (and for lazy chunk seeds)
+            pad_factory: Callable building a pad from x, y
+
+        Returns:
+            The lily pads created now
+        """
+        self.pads.clear()
+        self.chunks = {}
+        self._pad_factory = pad_factory
+
+        if self.lazy:
+            self._pad_count = count
+            self._pad_seed = rng.getrandbits(32)
+            self._pad_phase = random.Random(self._pad_seed).random()
+            return []
+
+        lily_pads = []
+        for _ in range(count):
+            x = rng.randint(0, self.width)
+            y = rng.randint(0, self.height)
+            lily_pads.append(pad_factory(x, y))
+        self.pads.rebuild(lily_pads)
+        for key in self.pads.occupied_cells():
+            self.chunk(key).generated = True
+        return lily_pads
+
+    def _pads_before(self, index):
+        """Return how many lazy pads belong to the chunks before a row-major chunk index.
+
+        The pads are spread in proportion to area: the chunks before index
+        cover some fraction of the pond and get that fraction of the pad
+        count, rounded down after adding a random phase. A chunk's count is
+        the difference between its own and the next index, so the counts
+        always add up to exactly the pad count, and each one is known
+        without generating any other chunk.
+        """
+        row, column = divmod(index, self.columns)
+        top = min(row * self.chunk_size, float(self.height))
+        row_height = min(self.chunk_size, self.height - top)
+        left = min(column * self.chunk_size, float(self.width))
+        area = top * self.width + row_height * left
+        return math.floor(self._pad_count * area / (self.width * self.height) + self._pad_phase)
+
+    def _chunk_pad_count(self, key):
+        """Return the number of lazy pads a chunk inside the pond holds."""
+        index = key[1] * self.columns + key[0]
+        return self._pads_before(index + 1) - self._pads_before(index)
+
+    def _generate_chunk(self, chunk):
+        """Create a lazy chunk's share of the lily pads."""
+        chunk.generated = True
+        left, top = max(0.0, chunk.left), max(0.0, chunk.top)
+        right, bottom = min(float(self.width), chunk.right), min(float(self.height), chunk.bottom)
+        if right <= left or bottom <= top:
+            return []
+
+        rng = random.Random(hash((self._pad_seed, chunk.key[0], chunk.key[1])))
+        lily_pads = []
+        for _ in range(self._chunk_pad_count(chunk.key)):
+            lily_pad = self._pad_factory(rng.uniform(left, right), rng.uniform(top, bottom))
+            lily_pads.append(lily_pad)
+            self.pads.insert(lily_pad)
+        return lily_pads
+
+    def add_pad(self, lily_pad):
+        """File a lily pad in the chunk under it."""
+        self.pads.insert(lily_pad)
+
+    def remove_pad(self, lily_pad):
+        """Remove a lily pad from its chunk."""
+        self.pads.remove(lily_pad)
+
+    def place_koi(self, koi_list):
+        """Replace the resident koi of every chunk with koi_list."""
+        self.koi.rebuild(koi_list)
+
+    def move_koi(self, koi, old_position):
+        """Move a koi to the chunk under its new position if it crossed a border."""
+        self.koi.move(koi, old_position)
+
+    def remove_koi(self, koi):
+        """Remove a koi from its chunk."""
+        self.koi.remove(koi)
+
+    def active_keys(self):
+        """Return the keys of the chunks holding koi or within halo of one."""
+        reach = math.ceil(self.halo / self.chunk_size)
+        active = set()
+        for cx, cy in self.koi.occupied_cells():
+            for dx in range(-reach, reach + 1):
+                for dy in range(-reach, reach + 1):
+                    active.add((cx + dx, cy + dy))
+        return active
+
+    def activate(self, step):
+        """Mark the chunks around the koi active and create any pads they still lack.
+
+        A chunk that was already active on the previous step only has its
+        step updated. Only chunks that have just become active are checked
+        for pads to create, so the work grows with the chunks the koi reach
+        rather than with all the chunks they are in.
+
+        Args:
+            step: Current simulation step, stored on each active chunk
+
+        Returns:
+            The lily pads created by this call (always empty for eager worlds)
+        """
+        entered = []
+        for key in self.active_keys():
+            chunk = self.chunk(key)
+            if chunk.last_active_step != step - 1:
+                entered.append(key)
+            chunk.last_active_step = step
+        if not self.lazy:
+            return []
+
+        created = []
+        for key in sorted(entered):
+            chunk = self.chunks[key]
+            if not chunk.generated:
+                created.extend(self._generate_chunk(chunk))
+        return created
+
+    def partition(self, num_workers):
+        """Split the active chunks between workers.
+
+        Chunks are taken column by column so every worker owns a contiguous
+        vertical band, and bands are cut to balance the number of resident
+        koi. A worker also needs read access to the halo_keys() of its band.
+
+        Args:
+            num_workers: Number of workers to split the chunks between
+
+        Returns:
+            A list of num_workers lists of chunk keys (some may be empty)
+        """
+        keys = sorted(self.active_keys())
+        loads = [len(self.koi.cell(key)) + 1 for key in keys]
+        total = sum(loads)
+
+        shards = [[] for _ in range(num_workers)]
+        worker = 0
+        running = 0
+        for key, load in zip(keys, loads):
+            # Move on once this worker has its share, never past the last one
+            while worker < num_workers - 1 and running >= total * (worker + 1) / num_workers:
+                worker += 1
+            shards[worker].append(key)
+            running += load
+        return shards
+
+    def halo_keys(self, keys):
+        """Return the chunks outside keys that koi inside keys can see."""
+        reach = math.ceil(self.halo / self.chunk_size)
+        owned = set(keys)
+        halo = set()
+        for cx, cy in owned:
+            for dx in range(-reach, reach + 1):
+                for dy in range(-reach, reach + 1):
+                    neighbour = (cx + dx, cy + dy)
+                    if neighbour not in owned:
+                        halo.add(neighbour)
+        return halo
@@ -0,0 +1,159 @@
+import unittest
+import copy
+import pickle
+import random
+import sys
+import os
+
+import neat
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from array_genome import ArrayGenome
+from reproduction import BatchReproduction
+from speciation import ArraySpeciesSet
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+
+def load_config():
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       CONFIG_PATH)
+
+
+def make_genome(config, key, mutations=10):
+    genome = ArrayGenome(key)
+    genome.configure_new(config.genome_config)
+    for _ in range(mutations):
+        genome.mutate(config.genome_config)
+    genome.fitness = float(key)
+    return genome
+
+
+def is_sorted(values):
+    return all(a < b for a, b in zip(values, values[1:]))
+
+
+class TestArrayGenome(unittest.TestCase):
+    """Tests for the ArrayGenome class."""
+
+    def setUp(self):
+        random.seed(5)
+        self.config = load_config()
+        self.genome_config = self.config.genome_config
+
+    def test_round_trip_through_default_genome(self):
+        """Converting to a DefaultGenome and back keeps every gene."""
+        genome = make_genome(self.config, 1)
+        default = genome.to_genome(self.genome_config)
+        again = ArrayGenome.from_genome(default, self.genome_config)
+        self.assertEqual(genome.distance(again, self.genome_config), 0.0)
+        self.assertEqual(set(default.nodes), set(genome.node_keys.tolist()))
+        self.assertEqual(len(default.connections), len(genome.conn_in))
+
+    def test_distance_matches_default_genome(self):
+        """Distances equal DefaultGenome.distance on the converted genomes."""
+        genomes = [make_genome(self.config, key) for key in range(1, 6)]
+        defaults = [genome.to_genome(self.genome_config) for genome in genomes]
+        for a, da in zip(genomes, defaults):
+            for b, db in zip(genomes, defaults):
+                self.assertAlmostEqual(a.distance(b, self.genome_config), da.distance(db, self.genome_config), places=5)
+
+    def test_network_matches_neat(self):
+        """The network built from the arrays computes what neat's builder does."""
+        genome = make_genome(self.config, 1, mutations=30)
+        ours = genome.feed_forward_network(self.config)
+        reference = neat.nn.FeedForwardNetwork.create(genome.to_genome(self.genome_config), self.config)
+        for _ in range(5):
+            inputs = [random.uniform(-1, 1) for _ in range(self.genome_config.num_inputs)]
+            for a, b in zip(ours.activate(inputs), reference.activate(inputs)):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_structural_mutations_keep_arrays_sorted(self):
+        """Adding and deleting genes keeps node and connection keys sorted and consistent."""
+        genome = make_genome(self.config, 1, mutations=0)
+        for _ in range(50):
+            genome.mutate_add_node(self.genome_config)
+            genome.mutate_add_connection(self.genome_config)
+            if random.random() < 0.3:
+                genome.mutate_delete_node(self.genome_config)
+            if random.random() < 0.3:
+                genome.mutate_delete_connection()
+
+        self.assertTrue(is_sorted(genome.node_keys.tolist()))
+        self.assertTrue(is_sorted(genome.connection_keys().tolist()))
+        nodes = set(genome.node_keys.tolist()) | set(self.genome_config.input_keys)
+        for i, o in zip(genome.conn_in.tolist(), genome.conn_out.tolist()):
+            self.assertIn(i, nodes)
+            self.assertIn(o, nodes)
+        for name in ('biases', 'responses', 'activations', 'aggregations'):
+            self.assertEqual(len(getattr(genome, name)), len(genome.node_keys))
+        for name in ('conn_out', 'weights', 'enabled'):
+            self.assertEqual(len(getattr(genome, name)), len(genome.conn_in))
+
+    def test_add_node_splits_a_connection(self):
+        """A new node replaces a connection with two enabled ones."""
+        genome = make_genome(self.config, 1, mutations=0)
+        nodes, enabled = genome.size()
+        genome.mutate_add_node(self.genome_config)
+        self.assertEqual(genome.size(), (nodes + 1, enabled + 1))
+
+    def test_crossover_inherits_from_fitter_parent(self):
+        """Children have the fitter parent's genes, with attributes from either parent."""
+        parent1, parent2 = make_genome(self.config, 1), make_genome(self.config, 2)
+        child = ArrayGenome(3)
+        child.configure_crossover(parent1, parent2, self.genome_config)
+
+        self.assertEqual(child.node_keys.tolist(), parent2.node_keys.tolist())
+        self.assertEqual(child.connection_keys().tolist(), parent2.connection_keys().tolist())
+        options = {}
+        for parent in (parent1, parent2):
+            for key, weight in zip(parent.connection_keys().tolist(), parent.weights.tolist()):
+                options.setdefault(key, set()).add(weight)
+        for key, weight in zip(child.connection_keys().tolist(), child.weights.tolist()):
+            self.assertIn(weight, options[key])
+
+    def test_serialization(self):
+        """Byte strings, pickles and deep copies reproduce the genome."""
+        genome = make_genome(self.config, 7)
+        restored = ArrayGenome.from_bytes(genome.to_bytes())
+        self.assertEqual(restored.key, 7)
+        self.assertEqual(restored.fitness, 7.0)
+        self.assertEqual(genome.distance(restored, self.genome_config), 0.0)
+
+        unpickled = pickle.loads(pickle.dumps(genome))
+        self.assertEqual(genome.distance(unpickled, self.genome_config), 0.0)
+
+        duplicate = copy.deepcopy(genome)
+        duplicate.weights[:] = 0
+        self.assertNotEqual(genome.weights.tolist(), duplicate.weights.tolist())
+
+        genome.fitness = None
+        self.assertIsNone(ArrayGenome.from_bytes(genome.to_bytes()).fitness)
+        with self.assertRaises(ValueError):
+            ArrayGenome.from_bytes(b'XXXX' + genome.to_bytes()[4:])
+
+    def test_population_runs_with_each_class_set(self):
+        """neat.Population evolves ArrayGenomes with the default and the batch classes."""
+        def evaluate(genomes, config):
+            for _, genome in genomes:
+                genome.fitness = float(genome.weights.sum())
+
+        for reproduction_type, species_set_type in ((neat.DefaultReproduction, neat.DefaultSpeciesSet),
+                                                    (BatchReproduction, ArraySpeciesSet)):
+            config = load_config()
+            config.genome_type = ArrayGenome
+            config.reproduction_type = reproduction_type
+            config.species_set_type = species_set_type
+            population = neat.Population(config)
+            population.run(evaluate, 3)
+            self.assertEqual(population.generation, 3)
+            for genome in population.population.values():
+                self.assertIsInstance(genome, ArrayGenome)
+
+
+if __name__ == '__main__':
+    unittest.main()
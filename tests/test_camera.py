@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from camera import Camera
+
+
+class TestCamera(unittest.TestCase):
+    """Tests for the Camera class."""
+
+    def setUp(self):
+        """A 100x100 viewport over a 1000x500 pond."""
+        self.camera = Camera(100, 100, 1000, 500)
+
+    def test_starts_fitting_the_pond(self):
+        """The whole pond is visible at first, centred along the short side."""
+        camera = self.camera
+        self.assertAlmostEqual(camera.zoom, 0.1)
+        self.assertEqual(camera.min_zoom, camera.zoom)
+        left, top, right, bottom = camera.visible_rect()
+        self.assertAlmostEqual(left, 0)
+        self.assertAlmostEqual(right, 1000)
+        self.assertAlmostEqual(top, -250)
+        self.assertAlmostEqual(bottom, 750)
+
+    def test_screen_and_world_round_trip(self):
+        camera = self.camera
+        camera.zoom_at(4)
+        for point in ((0, 0), (37.5, 80), (100, 100)):
+            world = camera.screen_to_world(point)
+            screen = camera.world_to_screen(world)
+            self.assertAlmostEqual(screen[0], point[0])
+            self.assertAlmostEqual(screen[1], point[1])
+
+    def test_zoom_keeps_the_anchor_fixed(self):
+        """The world point under the cursor stays under it while zooming."""
+        camera = self.camera
+        camera.zoom_at(5)
+        anchor = camera.screen_to_world((20, 70))
+        camera.zoom_at(2, (20, 70))
+        self.assertAlmostEqual(camera.zoom, 1.0)
+        after = camera.screen_to_world((20, 70))
+        self.assertAlmostEqual(after[0], anchor[0])
+        self.assertAlmostEqual(after[1], anchor[1])
+
+    def test_zoom_is_limited(self):
+        camera = self.camera
+        camera.zoom_at(1000)
+        self.assertEqual(camera.zoom, camera.max_zoom)
+        camera.zoom_at(0.0001)
+        self.assertEqual(camera.zoom, camera.min_zoom)
+
+    def test_pan_is_in_screen_pixels_and_clamped(self):
+        """Panning moves by viewport pixels and stops at the pond's edges."""
+        camera = self.camera
+        camera.zoom_at(10)  # 1 pixel per world unit
+        camera.center_on((500, 250))
+        camera.pan(30, -20)
+        self.assertAlmostEqual(camera.x, 480)
+        self.assertAlmostEqual(camera.y, 180)
+
+        camera.pan(-10000, -10000)
+        self.assertEqual((camera.x, camera.y), (0.0, 0.0))
+        camera.pan(10000, 10000)
+        self.assertAlmostEqual(camera.x, 900)
+        self.assertAlmostEqual(camera.y, 400)
+
+    def test_small_world_is_centred(self):
+        """A pond smaller than the view stays centred whatever the pan."""
+        camera = Camera(100, 100, 50, 50, min_zoom=1.0)
+        self.assertEqual(camera.zoom, 2.0)
+        camera.zoom_at(0.5)
+        camera.pan(30, 30)
+        self.assertAlmostEqual(camera.x, -25)
+        self.assertAlmostEqual(camera.y, -25)
+
+
+if __name__ == '__main__':
+    unittest.main()
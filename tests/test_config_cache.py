@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+import config_cache
+
+class TestConfigCache(unittest.TestCase):
+    """Tests for the configuration cache."""
+
+    def setUp(self):
+        """Write a small simulation config to a temporary file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'simulation-config.json')
+        with open(self.path, 'w') as f:
+            json.dump({'num_lily_pads': 5}, f)
+        config_cache.clear()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        config_cache.clear()
+        self.temp_dir.cleanup()
+
+    def test_sim_config_copies_are_independent(self):
+        """Each caller gets its own copy of the cached settings."""
+        first = config_cache.load_sim_config(self.path)
+        first['num_lily_pads'] = 99
+        self.assertEqual(config_cache.load_sim_config(self.path)['num_lily_pads'], 5)
+
+    def test_changed_file_is_parsed_again(self):
+        """Editing the file invalidates the cached settings."""
+        config_cache.load_sim_config(self.path)
+        with open(self.path, 'w') as f:
+            json.dump({'num_lily_pads': 500}, f)
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1000000))
+        self.assertEqual(config_cache.load_sim_config(self.path)['num_lily_pads'], 500)
+
+    def test_neat_config_copies_are_independent(self):
+        """The NEAT configuration is parsed once, and each caller gets its own copy."""
+        path = os.path.join(os.path.dirname(__file__), '../config/neat-config.ini')
+        first = config_cache.load_neat_config(path)
+        first.genome_config.get_new_node_key({0: None})
+        first.genome_type = object
+        second = config_cache.load_neat_config(path)
+        self.assertIsNot(first, second)
+        self.assertIsNone(second.genome_config.node_indexer)
+        self.assertIsNot(second.genome_type, object)
+        self.assertEqual(second.pop_size, first.pop_size)
+
+if __name__ == '__main__':
+    unittest.main()
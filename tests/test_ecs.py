@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from ecs import EntityRegistry, SystemSchedule
+
+
+class TestEntityRegistry(unittest.TestCase):
+    """Tests for the EntityRegistry class."""
+
+    def test_despawn_is_deferred_until_flush(self):
+        """Marked entities keep their rows until flush, which fills the gaps from the end."""
+        registry = EntityRegistry(components=('name',))
+        handles = [registry.spawn(name=name) for name in 'abcde']
+
+        registry.despawn(handles[1])
+        registry.despawn(handles[4])
+        self.assertEqual(len(registry), 5)
+        self.assertTrue(registry.is_despawning(1))
+        self.assertEqual(registry.live('name'), ['a', 'c', 'd'])
+
+        self.assertEqual(registry.flush(), 2)
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(sorted(registry.column('name')), ['a', 'c', 'd'])
+        for handle, name in zip((handles[0], handles[2], handles[3]), 'acd'):
+            self.assertEqual(registry.get(handle, 'name'), name)
+            self.assertEqual(registry.handle(registry.row(handle)), handle)
+
+    def test_stale_handles(self):
+        """A handle to a removed entity stays dead after its slot is reused."""
+        registry = EntityRegistry(components=('name',))
+        old = registry.spawn(name='old')
+        registry.despawn(old)
+        registry.flush()
+        new = registry.spawn(name='new')
+
+        self.assertNotEqual(old, new)
+        self.assertFalse(registry.is_alive(old))
+        self.assertTrue(registry.is_alive(new))
+        with self.assertRaises(KeyError):
+            registry.row(old)
+        registry.despawn(old)  # Ignored
+        self.assertEqual(registry.flush(), 0)
+        self.assertEqual(registry.get(new, 'name'), 'new')
+
+    def test_unknown_component(self):
+        registry = EntityRegistry(components=('name',))
+        with self.assertRaises(KeyError):
+            registry.spawn(colour='red')
+        with self.assertRaises(KeyError):
+            registry.column('colour')
+
+
+class TestSystemSchedule(unittest.TestCase):
+    """Tests for the SystemSchedule class."""
+
+    def test_systems_run_in_phase_order_then_flush(self):
+        """Phases run in order whatever order systems were added in, and despawns apply after the step."""
+        registry = EntityRegistry(components=('name',))
+        handle = registry.spawn(name='koi')
+        schedule = SystemSchedule(registry)
+        calls = []
+
+        def score(registry, step):
+            calls.append(('score', step, len(registry)))
+
+        def think(registry, step):
+            calls.append(('think', step, len(registry)))
+            registry.despawn(handle)
+
+        schedule.add('score', score)
+        schedule.add('think', think)
+        schedule.run(7)
+
+        self.assertEqual(calls, [('think', 7, 1), ('score', 7, 1)])
+        self.assertFalse(registry.is_alive(handle))
+        self.assertEqual(schedule.systems(), [('think', think), ('score', score)])
+
+        schedule.remove(think)
+        self.assertEqual(schedule.systems(), [('score', score)])
+
+    def test_unknown_phase(self):
+        schedule = SystemSchedule(EntityRegistry())
+        with self.assertRaises(ValueError):
+            schedule.add('swim', lambda registry, step: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import random
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from food import FoodDynamics
+from sim_params import SimParams
+from world import TiledWorld
+
+def make_pad(x, y):
+    return SimpleNamespace(position=(x, y))
+
+class TestFoodDynamics(unittest.TestCase):
+    """Tests for the FoodDynamics class."""
+
+    def make_food(self, **settings):
+        """Create a world of 100 pads and a food model for it."""
+        params = SimParams.from_config(dict(
+            environment_width=1000, environment_height=1000, detection_radius=100, **settings
+        ))
+        world = TiledWorld(1000, 1000, 100)
+        food = FoodDynamics(world, params, rng=random.Random(2), pad_factory=make_pad)
+        lily_pads = world.spawn_pads(100, rng=random.Random(2), pad_factory=make_pad)
+        food.reset(lily_pads)
+        return world, food, lily_pads
+
+    def test_regrowth_refills_up_to_capacity(self):
+        """Eaten pads grow back into the index, never beyond the original count."""
+        world, food, lily_pads = self.make_food(food_regrowth_rate=20)
+        for lily_pad in lily_pads[:60]:
+            world.remove_pad(lily_pad)
+        self.assertEqual(food.step(0, 100), [])
+
+        alive = 40
+        for step in range(200):
+            regrown = food.step(step, alive)
+            alive += len(regrown)
+            self.assertLessEqual(alive, 100)
+        self.assertGreater(alive, 90)
+        self.assertEqual(len(world.pads), alive)
+
+    def test_depletion_blocks_regrowth_until_recovered(self):
+        """A depleted chunk regrows less, and recovers over time."""
+        world, food, lily_pads = self.make_food(food_depletion=1.0, food_recovery=0.1)
+        food.consume(make_pad(150, 150), step=0)
+        self.assertEqual(food.fertility((1, 1), 0), 0.0)
+        self.assertAlmostEqual(food.fertility((1, 1), 10), 1 - 0.9 ** 10)
+        self.assertEqual(food.fertility((5, 5), 10), 1.0)
+
+    def test_clustered_spawn(self):
+        """Clustered pads gather around the cluster centres."""
+        world, food, _ = self.make_food(food_clusters=2, food_cluster_spread=10)
+        food.reset()
+        lily_pads = food.spawn(200)
+        self.assertEqual(len(lily_pads), 200)
+        self.assertEqual(food.capacity, 200)
+        for lily_pad in lily_pads:
+            distance = min(
+                ((lily_pad.position[0] - cx) ** 2 + (lily_pad.position[1] - cy) ** 2) ** 0.5
+                for cx, cy in food.cluster_centres
+            )
+            self.assertLess(distance, 60)
+
+if __name__ == '__main__':
+    unittest.main()
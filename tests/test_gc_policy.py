@@ -0,0 +1,100 @@
+import unittest
+import copy
+import gc
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from gc_policy import GCPolicy
+
+
+class TestGCPolicy(unittest.TestCase):
+    """Tests for the GCPolicy class."""
+
+    def setUp(self):
+        self.threshold = gc.get_threshold()
+
+    def tearDown(self):
+        gc.set_threshold(*self.threshold)
+        gc.unfreeze()
+
+    def make_policy(self, mode='tuned'):
+        policy = GCPolicy(mode, episode_threshold=12345)
+        self.addCleanup(policy.close)
+        return policy
+
+    def test_tuned_mode_freezes_and_raises_threshold(self):
+        """Startup objects are frozen and episodes collect less often, until close."""
+        policy = self.make_policy()
+        policy.startup()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        policy.begin_episode()
+        self.assertEqual(gc.get_threshold(), (12345,) + self.threshold[1:])
+        policy.end_episode()
+        self.assertEqual(gc.get_threshold(), self.threshold)
+
+        policy.begin_episode()
+        policy.close()
+        self.assertEqual(gc.get_threshold(), self.threshold)
+        self.assertEqual(gc.get_freeze_count(), 0)
+        self.assertNotIn(policy._on_collect, gc.callbacks)
+
+    def test_default_mode_leaves_the_collector_alone(self):
+        """Default mode only times collections."""
+        policy = self.make_policy('default')
+        policy.startup()
+        policy.begin_episode()
+        self.assertEqual(gc.get_freeze_count(), 0)
+        self.assertEqual(gc.get_threshold(), self.threshold)
+
+    def test_pauses_are_timed(self):
+        """Collections are recorded per collector generation and summarized."""
+        policy = self.make_policy('default')
+        policy.install()
+        gc.collect(0)
+        gc.collect()
+        summary = policy.summary()
+        self.assertGreaterEqual(summary['collections'], 2)
+        self.assertGreaterEqual(summary['by_generation'][0], 1)
+        self.assertGreaterEqual(summary['by_generation'][2], 1)
+        self.assertGreaterEqual(summary['total_pause'], summary['max_pause'])
+        self.assertEqual(policy.summary()['collections'], 0)
+
+    def test_end_generation_collects_cycles(self):
+        """The collection between generations frees cyclic garbage and ends the episode."""
+        policy = self.make_policy()
+        policy.startup()
+        policy.begin_episode()
+
+        class Node:
+            pass
+        node = Node()
+        node.self = node
+        del node
+        before = sum(isinstance(obj, Node) for obj in gc.get_objects())
+        policy.end_generation(None, {}, None)
+        self.assertEqual(before, 1)
+        self.assertEqual(sum(isinstance(obj, Node) for obj in gc.get_objects()), 0)
+        self.assertEqual(gc.get_threshold(), self.threshold)
+        self.assertIsNotNone(policy.last_summary)
+
+    def test_copies_are_inert(self):
+        """Checkpoint copies are not installed, so closing them changes nothing."""
+        policy = self.make_policy()
+        policy.startup()
+        duplicate = copy.deepcopy(policy)
+        duplicate.close()
+        self.assertGreater(gc.get_freeze_count(), 0)
+        self.assertIn(policy._on_collect, gc.callbacks)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            GCPolicy('aggressive')
+
+
+if __name__ == '__main__':
+    unittest.main()
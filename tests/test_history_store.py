@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+import history_store
+from history_store import HistoryStore
+
+class TestHistoryStore(unittest.TestCase):
+    """Tests for the HistoryStore class."""
+
+    def setUp(self):
+        """Create a fresh history file in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'history.koih')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _fill(self, store, generations, species=(1, 2, 3)):
+        for generation in range(generations):
+            for species_id in species:
+                store.append(generation, species_id, best_fitness=generation * species_id,
+                             mean_fitness=generation, size=species_id, population=10,
+                             food_consumed=generation)
+
+    def test_range_queries(self):
+        """Species and generation range queries return the matching records."""
+        store = HistoryStore(self.path)
+        self._fill(store, 20)
+
+        records = store.query(species_id=2, start=5, stop=10)
+        self.assertEqual(list(records['generation']), [5, 6, 7, 8, 9])
+        self.assertEqual(list(records['best_fitness']), [10.0, 12.0, 14.0, 16.0, 18.0])
+
+        generation_slice = store.query(start=18)
+        self.assertEqual(len(generation_slice), 6)
+        self.assertEqual(store.species_ids(), [1, 2, 3])
+        store.close()
+
+    def test_grows_past_initial_capacity(self):
+        """Appends keep working when the file has to be extended."""
+        store = HistoryStore(self.path)
+        self._fill(store, history_store.INITIAL_CAPACITY, species=(7,))
+        store.append(history_store.INITIAL_CAPACITY, 7, 1.0, 1.0, 1, 1, 0)
+
+        self.assertEqual(len(store), history_store.INITIAL_CAPACITY + 1)
+        self.assertEqual(len(store.query(species_id=7)), history_store.INITIAL_CAPACITY + 1)
+        store.close()
+
+    def test_persists_across_runs(self):
+        """Reopening the file keeps old runs and starts a new run id."""
+        store = HistoryStore(self.path)
+        self._fill(store, 3)
+        store.close()
+
+        store = HistoryStore(self.path)
+        self.assertEqual(store.run, 1)
+        self._fill(store, 2, species=(4,))
+
+        self.assertEqual(len(store.query(run=0)), 9)
+        self.assertEqual(len(store.query()), 2)
+        self.assertEqual(list(store.query(species_id=3, run=0)['generation']), [0, 1, 2])
+        store.close()
+
+    def test_rejects_out_of_order_generations(self):
+        """History must be appended in generation order."""
+        store = HistoryStore(self.path)
+        store.append(5, 1, 1.0, 1.0, 1, 1, 0)
+        with self.assertRaises(ValueError):
+            store.append(4, 1, 1.0, 1.0, 1, 1, 0)
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+import asyncio
+import gzip
+import json
+import pickle
+import random
+import shutil
+import tempfile
+import sys
+import os
+
+import neat
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from inference_server import InferenceServer, InferenceClient, load_brain
+from koi_brain import KoiBrain, export_genome
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+
+class TestInferenceServer(unittest.TestCase):
+    """Tests for the batched inference server."""
+
+    def setUp(self):
+        random.seed(4)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  CONFIG_PATH)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_genome(self, key, fitness=1.0):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(self.config.genome_config)
+        for _ in range(30):
+            genome.mutate(self.config.genome_config)
+        genome.fitness = fitness
+        return genome
+
+    def export(self, genome, name='best.kbrain'):
+        path = os.path.join(self.temp_dir, name)
+        export_genome(genome, self.config, path)
+        return path
+
+    def observations(self, count, seed=0):
+        inputs = self.config.genome_config.num_inputs
+        return np.random.default_rng(seed).uniform(-1, 1, (count, inputs))
+
+    def test_load_brain_formats(self):
+        """Exported brains, pickled genomes and both checkpoint kinds load."""
+        best = self.make_genome(7, fitness=10.0)
+        population = {1: self.make_genome(1, fitness=2.0), 7: best, 3: self.make_genome(3, fitness=None)}
+        expected = KoiBrain.load(self.export(best)).activate_batch(self.observations(4))
+
+        genome_path = os.path.join(self.temp_dir, 'best_koi.pkl')
+        with open(genome_path, 'wb') as f:
+            pickle.dump(best, f)
+        reporter_path = os.path.join(self.temp_dir, 'checkpoint-3.pkl')
+        with open(reporter_path, 'wb') as f:
+            pickle.dump((population, None, 3), f)
+        neat_path = os.path.join(self.temp_dir, 'neat-checkpoint-3')
+        with gzip.open(neat_path, 'wb') as f:
+            pickle.dump((3, self.config, population, None, random.getstate()), f)
+
+        for path in (self.export(best), genome_path, reporter_path, neat_path):
+            brain = load_brain(path, CONFIG_PATH)
+            self.assertEqual(brain.key, 7)
+            np.testing.assert_allclose(brain.activate_batch(self.observations(4)), expected)
+
+    def test_concurrent_requests_are_batched(self):
+        """Concurrent queries share activate_batch calls and get their own rows back."""
+        path = self.export(self.make_genome(1))
+        brain = KoiBrain.load(path)
+        observations = self.observations(40)
+        expected = brain.activate_batch(observations)
+
+        async def scenario():
+            server = InferenceServer({'best': path}, CONFIG_PATH, max_delay=0.05)
+            socket_path = os.path.join(self.temp_dir, 'koi.sock')
+            await server.start(socket_path=socket_path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                for i, row in enumerate(observations.tolist()):
+                    writer.write(json.dumps({'id': i, 'inputs': row}).encode() + b'\n')
+                await writer.drain()
+                responses = [json.loads(await reader.readline()) for _ in observations]
+                writer.close()
+                return responses, server.models['best'].batches
+            finally:
+                await server.close()
+
+        responses, batches = asyncio.run(scenario())
+        self.assertLess(batches, len(observations))
+        for response in responses:
+            np.testing.assert_allclose(response['outputs'], expected[response['id']])
+
+    def test_errors_and_model_listing(self):
+        """Bad requests get error responses; the TCP client lists and queries models."""
+        paths = {'a': self.export(self.make_genome(1), 'a.kbrain'),
+                 'b': self.export(self.make_genome(2), 'b.kbrain')}
+        batch = self.observations(3)
+
+        async def scenario():
+            server = InferenceServer(paths, CONFIG_PATH)
+            host, port = await server.start(port=0)
+
+            def client_calls():
+                client = InferenceClient(host=host, port=port)
+                try:
+                    results = {'models': client.models(), 'batch': client.query(batch.tolist(), model='b')}
+                    for request in ({'inputs': batch[0].tolist()},
+                                    {'model': 'c', 'inputs': batch[0].tolist()},
+                                    {'model': 'a', 'inputs': [1.0, 2.0]}):
+                        with self.assertRaises(RuntimeError):
+                            client.request(request)
+                    return results
+                finally:
+                    client.close()
+
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, client_calls)
+            finally:
+                await server.close()
+
+        results = asyncio.run(scenario())
+        self.assertEqual(set(results['models']), {'a', 'b'})
+        self.assertEqual(results['models']['b']['genome'], 2)
+        np.testing.assert_allclose(results['batch'], KoiBrain.load(paths['b']).activate_batch(batch))
+
+    def test_hot_reload(self):
+        """Replacing the model file swaps the brain; a broken file keeps the old one."""
+        path = self.export(self.make_genome(1))
+        replacement = self.make_genome(2)
+
+        async def scenario():
+            server = InferenceServer({'best': path}, CONFIG_PATH, reload_interval=3600)
+            await server.start(socket_path=os.path.join(self.temp_dir, 'koi.sock'))
+            model = server.models['best']
+            try:
+                self.assertFalse(await model.check_reload())
+                export_genome(replacement, self.config, path)
+                os.utime(path, ns=(0, 10 ** 18))
+                self.assertTrue(await model.check_reload())
+                reloaded = model.brain.key
+
+                with open(path, 'wb') as f:
+                    f.write(b'not a model')
+                self.assertFalse(await model.check_reload())
+                return reloaded, model.brain.key, model.version
+            finally:
+                await server.close()
+
+        reloaded, kept, version = asyncio.run(scenario())
+        self.assertEqual(reloaded, 2)
+        self.assertEqual(kept, 2)
+        self.assertEqual(version, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from interactions import InteractionSystem
+from sim_params import SimParams
+from spatial_index import SpatialHash
+
+def make_koi(position, aggression, hunger=50.0):
+    return SimpleNamespace(position=position, aggression=aggression, hunger=hunger,
+                           food_consumed=0, eaten_lily_pads=[])
+
+class TestInteractionSystem(unittest.TestCase):
+    """Tests for the InteractionSystem class."""
+
+    def setUp(self):
+        """Interactions within 20 units, with simple round numbers."""
+        params = SimParams.from_config({
+            'environment_width': 1000, 'environment_height': 1000, 'detection_radius': 100,
+            'interaction_radius': 20, 'aggression_cost': 0.0, 'contest_transfer': 10.0,
+            'nudge_distance': 4.0, 'lily_pad_value': 30
+        })
+        self.system = InteractionSystem(params)
+
+    def resolve(self, koi_list, pads=()):
+        koi_index = SpatialHash(20)
+        koi_index.rebuild(koi_list)
+        pad_index = SpatialHash(20)
+        pad_index.rebuild(pads)
+        return self.system.resolve(koi_list, koi_index, pad_index), koi_index
+
+    def test_only_close_pairs_interact(self):
+        """Pairs come from the index and only within the radius."""
+        koi_list = [make_koi((100, 100), 1), make_koi((110, 100), 0), make_koi((500, 500), 1)]
+        koi_index = SpatialHash(20)
+        koi_index.rebuild(koi_list)
+        self.assertEqual(self.system.find_pairs(koi_list, koi_index), [(0, 1)])
+
+    def test_contest_transfers_hunger_nudges_and_claims_pad(self):
+        """The aggressive koi gains, pushes the loser away and wins the pad."""
+        bully, victim = make_koi((100, 100), 0.9), make_koi((110, 100), 0.4)
+        pad = SimpleNamespace(position=(105, 102))
+        eaten, koi_index = self.resolve([bully, victim], [pad])
+
+        self.assertEqual(eaten, [pad])
+        self.assertEqual(bully.eaten_lily_pads, [pad])
+        self.assertAlmostEqual(bully.hunger, 50 - 5 - 30)
+        self.assertAlmostEqual(victim.hunger, 55)
+        self.assertAlmostEqual(victim.position[0], 110 + 3.6)
+        self.assertIn(victim, koi_index.query_radius(victim.position, 1))
+
+    def test_result_does_not_depend_on_list_order(self):
+        """Effects are applied in batch, so reordering koi changes nothing but ties."""
+        def run(order):
+            koi_list = [make_koi((100 + 8 * k, 100), 0.1 * (k + 1)) for k in range(5)]
+            pads = [SimpleNamespace(position=(112, 100))]
+            self.resolve([koi_list[k] for k in order], pads)
+            return [(fish.position, fish.hunger, len(fish.eaten_lily_pads)) for fish in koi_list]
+        self.assertEqual(run([0, 1, 2, 3, 4]), run([4, 2, 0, 3, 1]))
+
+if __name__ == '__main__':
+    unittest.main()
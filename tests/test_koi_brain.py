@@ -0,0 +1,128 @@
+import unittest
+import random
+import shutil
+import tempfile
+import sys
+import os
+
+import neat
+import numpy as np
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from koi_brain import KoiBrain, export_genome, ACTIVATION_NAMES, AGGREGATION_NAMES
+from array_genome import ArrayGenome
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+
+class TestKoiBrain(unittest.TestCase):
+    """Tests for exporting genomes and the KoiBrain runtime."""
+
+    def setUp(self):
+        random.seed(9)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  CONFIG_PATH)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_genome(self, key=1, mutations=40):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(self.config.genome_config)
+        for _ in range(mutations):
+            genome.mutate(self.config.genome_config)
+        genome.fitness = 12.5
+        return genome
+
+    def export(self, genome, name='brain.kbrain'):
+        path = os.path.join(self.temp_dir, name)
+        export_genome(genome, self.config, path)
+        return path
+
+    def assert_matches_neat(self, genome, brain, samples=20):
+        network = neat.nn.FeedForwardNetwork.create(genome, self.config)
+        observations = np.random.default_rng(0).uniform(-2, 2, (samples, brain.num_inputs))
+        batch = brain.activate_batch(observations)
+        for row, observation in zip(batch, observations.tolist()):
+            np.testing.assert_allclose(row, network.activate(observation), rtol=1e-9, atol=1e-12)
+
+    def test_matches_feed_forward_network(self):
+        """Batched outputs equal neat's for many genomes and function mixes."""
+        for key in range(1, 11):
+            genome = self.make_genome(key)
+            self.assert_matches_neat(genome, KoiBrain.load(self.export(genome)))
+
+    def test_every_builtin_function(self):
+        """Each activation and aggregation matches its neat counterpart."""
+        genome = self.make_genome(mutations=60)
+        nodes = list(genome.nodes.values())
+        for activation in ACTIVATION_NAMES:
+            for node in nodes:
+                node.activation = activation
+            self.assert_matches_neat(genome, KoiBrain.load(self.export(genome)))
+        for aggregation in AGGREGATION_NAMES:
+            for node in nodes:
+                node.activation = 'tanh'
+                node.aggregation = aggregation
+            self.assert_matches_neat(genome, KoiBrain.load(self.export(genome)))
+
+    def test_header_and_single_activation(self):
+        """The file keeps the genome key and fitness; activate works on one observation."""
+        genome = self.make_genome(key=42)
+        brain = KoiBrain.load(self.export(genome))
+        self.assertEqual(brain.key, 42)
+        self.assertEqual(brain.fitness, 12.5)
+        self.assertEqual(brain.num_inputs, self.config.genome_config.num_inputs)
+        self.assertEqual(brain.num_outputs, self.config.genome_config.num_outputs)
+
+        inputs = [0.1] * brain.num_inputs
+        expected = neat.nn.FeedForwardNetwork.create(genome, self.config).activate(inputs)
+        np.testing.assert_allclose(brain.activate(inputs), expected)
+        brain.close()
+
+    def test_from_bytes_and_bad_files(self):
+        """Contents load without a file; foreign data is rejected."""
+        genome = self.make_genome()
+        with open(self.export(genome), 'rb') as f:
+            data = f.read()
+        self.assert_matches_neat(genome, KoiBrain.from_bytes(data))
+
+        with self.assertRaises(ValueError):
+            KoiBrain.from_bytes(b'XXXX' + data[4:])
+        with self.assertRaises(ValueError):
+            KoiBrain.from_bytes(b'short')
+        with self.assertRaises(ValueError):
+            KoiBrain.from_bytes(data).activate_batch(np.zeros((2, 3)))
+
+    def test_unconnected_outputs_are_zero(self):
+        """Outputs without a path from the inputs read 0, as in neat."""
+        genome = self.make_genome(mutations=0)
+        genome.connections = {}
+        brain = KoiBrain.load(self.export(genome))
+        np.testing.assert_array_equal(brain.activate_batch(np.ones((3, brain.num_inputs))),
+                                      np.zeros((3, brain.num_outputs)))
+
+    def test_array_genome_export(self):
+        """ArrayGenomes export the same network as their DefaultGenome form."""
+        genome = self.make_genome()
+        array_genome = ArrayGenome.from_genome(genome, self.config.genome_config)
+        brain = KoiBrain.load(self.export(array_genome))
+        self.assert_matches_neat(array_genome.to_genome(self.config.genome_config), brain)
+
+    def test_unknown_function_is_rejected(self):
+        """Custom activation functions cannot be exported."""
+        self.config.genome_config.add_activation('custom', lambda z: z * 2)
+        genome = self.make_genome()
+        for node in genome.nodes.values():
+            node.activation = 'custom'
+        with self.assertRaises(ValueError):
+            self.export(genome)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+
+# Draw without a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from renderer import Renderer, LOD_FULL, LOD_SILHOUETTE, LOD_DOT
+
+
+class TestLevelOfDetail(unittest.TestCase):
+    """Tests for the renderer's level-of-detail selection."""
+
+    def setUp(self):
+        """Create an offscreen renderer; frame budget tests switch it to windowed behaviour."""
+        self.renderer = Renderer(200, offscreen=True)
+        self.budget = 1.0 / self.renderer.target_fps
+
+    def test_koi_count_thresholds(self):
+        """Detail drops to silhouettes and then dots as the koi count passes the budgets."""
+        renderer = self.renderer
+        self.assertEqual(renderer.select_lod(0), LOD_FULL)
+        self.assertEqual(renderer.select_lod(60), LOD_FULL)
+        self.assertEqual(renderer.select_lod(61), LOD_SILHOUETTE)
+        self.assertEqual(renderer.select_lod(400), LOD_SILHOUETTE)
+        self.assertEqual(renderer.select_lod(401), LOD_DOT)
+
+    def test_small_koi_are_silhouettes(self):
+        """Koi too small on screen for their patterns are drawn as silhouettes."""
+        renderer = self.renderer
+        renderer.camera.min_zoom = 0.1
+        renderer.camera.zoom_at(0.5)
+        self.assertLess(10 * renderer.zoom, renderer.lod_min_full_radius)
+        self.assertEqual(renderer.select_lod(5), LOD_SILHOUETTE)
+        self.assertEqual(renderer.select_lod(401), LOD_DOT)
+
+    def test_bias_coarsens_but_never_past_dots(self):
+        renderer = self.renderer
+        renderer.lod_bias = 1
+        self.assertEqual(renderer.select_lod(5), LOD_SILHOUETTE)
+        self.assertEqual(renderer.select_lod(100), LOD_DOT)
+        self.assertEqual(renderer.select_lod(500), LOD_DOT)
+
+    def test_slow_frames_coarsen_then_recover(self):
+        """Over-budget frames raise the bias once per cooldown; fast frames lower it again."""
+        renderer = self.renderer
+        renderer.offscreen = False
+
+        renderer._update_frame_budget(2 * self.budget)
+        self.assertEqual(renderer.lod_bias, 1)
+        for _ in range(30):
+            renderer._update_frame_budget(2 * self.budget)
+        self.assertEqual(renderer.lod_bias, 1)  # Still cooling down
+        renderer._update_frame_budget(2 * self.budget)
+        self.assertEqual(renderer.lod_bias, 2)
+        for _ in range(31):
+            renderer._update_frame_budget(2 * self.budget)
+        self.assertEqual(renderer.lod_bias, LOD_DOT)  # Already as coarse as it gets
+
+        # Recovers once the average falls under half the budget
+        for _ in range(200):
+            renderer._update_frame_budget(0.1 * self.budget)
+        self.assertLess(renderer.frame_time, 0.5 * self.budget)
+        self.assertEqual(renderer.lod_bias, 0)
+        self.assertEqual(renderer.select_lod(5), LOD_FULL)
+
+    def test_frames_within_budget_keep_the_bias(self):
+        renderer = self.renderer
+        renderer.offscreen = False
+        renderer.lod_bias = 1
+        for _ in range(100):
+            renderer._update_frame_budget(0.75 * self.budget)
+        self.assertEqual(renderer.lod_bias, 1)
+
+    def test_offscreen_detail_is_stable(self):
+        """Offscreen frames are not real time, so their timing never changes the detail."""
+        renderer = self.renderer
+        for _ in range(100):
+            renderer._update_frame_budget(10 * self.budget)
+        self.assertEqual(renderer.lod_bias, 0)
+        self.assertGreater(renderer.frame_time, self.budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
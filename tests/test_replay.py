@@ -0,0 +1,184 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from replay import ReplayFile, ReplayEngine, NEVER_CONSUMED
+from telemetry import TrajectoryRecorder
+
+
+def make_koi(key):
+    return SimpleNamespace(genome=SimpleNamespace(key=key), species_id=key % 2, position=(0, 0),
+                           hunger=1.0, energy=90.0, last_outputs=[0.0] * 5, eaten_lily_pads=[])
+
+
+def record(directory, generation=0, steps=5, offset=0):
+    """Record a small generation and return the recorded lily pads.
+
+    Koi 4 swims for every step and koi 5 dies after step 2. At step s koi k
+    is at (k + s + offset, 2k). Pad a (7, 8) is spawned before step 0 and
+    eaten by koi 5 during step 1; pad c spawns at the same position before
+    step 2 and is never eaten; pad b (1, 1) spawns before step 3.
+    """
+    pads = {'a': SimpleNamespace(position=(7, 8)), 'b': SimpleNamespace(position=(1, 1)),
+            'c': SimpleNamespace(position=(7, 8))}
+    koi = [make_koi(4), make_koi(5)]
+    recorder = TrajectoryRecorder(directory, chunk_steps=2)
+    try:
+        recorder.begin_generation(generation, koi)
+        recorder.record_spawn(0, [pads['a']])
+        for step in range(steps):
+            if step == 2:
+                recorder.record_spawn(step, [pads['c']])
+            if step == 3:
+                recorder.record_spawn(step, [pads['b']])
+            if step == 1:
+                koi[1].eaten_lily_pads.append(pads['a'])
+            living = koi if step <= 2 else koi[:1]
+            for fish in living:
+                fish.position = (fish.genome.key + step + offset, 2 * fish.genome.key)
+            recorder.record_step(step, living)
+    finally:
+        recorder.close()
+    return pads
+
+
+class TestReplayFile(unittest.TestCase):
+    """Tests for the ReplayFile class."""
+
+    def setUp(self):
+        """Record a generation into a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        record(self.temp_dir.name)
+        self.replay_file = ReplayFile(self.temp_dir.name, 0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_keyframes_index_every_step(self):
+        """Each step's rows are found through the keyframe index; steps outside the recording are empty."""
+        replay_file = self.replay_file
+        self.assertEqual(replay_file.first_step, 0)
+        self.assertEqual(replay_file.num_steps, 5)
+        self.assertEqual(list(replay_file.keyframes), [0, 2, 4, 6, 7, 8])
+        self.assertEqual(list(replay_file.rows_for_step(2)['koi_id']), [4, 5])
+        self.assertEqual(list(replay_file.rows_for_step(3)['koi_id']), [4])
+        self.assertEqual(len(replay_file.rows_for_step(-1)), 0)
+        self.assertEqual(len(replay_file.rows_for_step(5)), 0)
+
+    def test_koi_at(self):
+        """Koi carry their previous position for interpolation, or their own on the first step."""
+        koi = self.replay_file.koi_at(1)
+        self.assertEqual([fish.position for fish in koi], [(5.0, 8.0), (6.0, 10.0)])
+        self.assertEqual([fish.last_position for fish in koi], [(4.0, 8.0), (5.0, 10.0)])
+        self.assertEqual([fish.species_id for fish in koi], [0, 1])
+        first = self.replay_file.koi_at(0)
+        self.assertEqual([fish.last_position for fish in first], [fish.position for fish in first])
+
+    def test_pad_lifetimes(self):
+        """Consumptions are paired with the earliest living pad at their position."""
+        pads = sorted(self.replay_file.pads.tolist(), key=lambda pad: pad[2])
+        self.assertEqual(pads, [(7.0, 8.0, 0, 1), (7.0, 8.0, 2, NEVER_CONSUMED), (1.0, 1.0, 3, NEVER_CONSUMED)])
+
+        def visible(step):
+            return sorted(pad.position for pad in self.replay_file.lily_pads_at(step))
+
+        self.assertEqual(visible(0), [(7.0, 8.0)])
+        self.assertEqual(visible(1), [])
+        self.assertEqual(visible(2), [(7.0, 8.0)])
+        self.assertEqual(visible(4), [(1.0, 1.0), (7.0, 8.0)])
+
+    def test_caches_follow_a_new_recording(self):
+        """Recording a generation again replaces what an earlier replay consolidated."""
+        record(self.temp_dir.name, offset=100)
+        replay_file = ReplayFile(self.temp_dir.name, 0)
+        self.assertEqual(replay_file.koi_at(0)[0].position, (104.0, 8.0))
+
+    def test_stale_caches_are_rebuilt(self):
+        """Chunks newer than the caches are consolidated again."""
+        chunk = os.path.join(self.temp_dir.name, 'gen00000_chunk00000.npz')
+        frames = os.path.join(self.temp_dir.name, 'gen00000_frames.npy')
+        os.utime(frames, ns=(0, os.stat(chunk).st_mtime_ns - 1))
+        ReplayFile(self.temp_dir.name, 0)
+        rebuilt = os.stat(frames).st_mtime_ns
+        self.assertGreater(rebuilt, os.stat(chunk).st_mtime_ns)
+
+        # Fresh caches are mapped as they are
+        ReplayFile(self.temp_dir.name, 0)
+        self.assertEqual(os.stat(frames).st_mtime_ns, rebuilt)
+
+    def test_missing_generation(self):
+        with self.assertRaises(FileNotFoundError):
+            ReplayFile(self.temp_dir.name, 7)
+
+
+class FakeRenderer:
+    """Records the first koi's x position of every rendered frame."""
+
+    def __init__(self, frames_before_close=None):
+        self.key_handlers = {}
+        self.generation = None
+        self.rendered = []
+        self.frames_before_close = frames_before_close
+
+    def set_generation(self, generation):
+        self.generation = generation
+
+    def render(self, koi, lily_pads):
+        self.rendered.append(koi[0].position[0] - 4)
+        return self.frames_before_close is None or len(self.rendered) < self.frames_before_close
+
+
+class TestReplayEngine(unittest.TestCase):
+    """Tests for the ReplayEngine class."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        record(self.temp_dir.name, generation=3)
+        self.replay_file = ReplayFile(self.temp_dir.name, 3)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_seek_is_clamped(self):
+        engine = ReplayEngine(FakeRenderer(), self.replay_file)
+        engine.seek(100)
+        self.assertEqual(engine.step, 4)
+        engine.seek(-5)
+        self.assertEqual(engine.step, 0)
+
+    def test_speed_and_frame_skip(self):
+        """Fractional speeds accumulate, and skipped frames are not rendered."""
+        renderer = FakeRenderer()
+        self.assertTrue(ReplayEngine(renderer, self.replay_file, speed=1.5).play())
+        self.assertEqual(renderer.rendered, [0, 1, 3, 4])
+        self.assertEqual(renderer.generation, 3)
+
+        renderer = FakeRenderer()
+        ReplayEngine(renderer, self.replay_file, frame_skip=1).play(start_step=1)
+        self.assertEqual(renderer.rendered, [1, 3])
+
+    def test_controls_and_closing(self):
+        """The arrow keys seek and change speed; closing the window stops playback."""
+        import pygame
+        renderer = FakeRenderer(frames_before_close=2)
+        engine = ReplayEngine(renderer, self.replay_file)
+        self.assertFalse(engine.play())
+        self.assertEqual(renderer.rendered, [0, 1])
+
+        engine.seek(0)
+        renderer.key_handlers[pygame.K_RIGHT]()
+        self.assertEqual(engine.step, 4)
+        renderer.key_handlers[pygame.K_UP]()
+        self.assertEqual(engine.speed, 2)
+        renderer.key_handlers[pygame.K_SPACE]()
+        self.assertTrue(engine.paused)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import copy
+import random
+import sys
+import os
+
+import neat
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from reproduction import BatchReproduction, mutate_structure
+from speciation import ArraySpeciesSet
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+
+def load_config():
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         CONFIG_PATH)
+    config.reproduction_type = BatchReproduction
+    config.species_set_type = ArraySpeciesSet
+    return config
+
+
+def make_genomes(config, count):
+    genomes = []
+    for key in range(count):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(config.genome_config)
+        genomes.append(genome)
+    return genomes
+
+
+def weights(genomes):
+    return [gene.weight for genome in genomes for _, gene in sorted(genome.connections.items())]
+
+
+class TestBatchReproduction(unittest.TestCase):
+    """Tests for the BatchReproduction class."""
+
+    def setUp(self):
+        random.seed(3)
+        self.config = load_config()
+        self.reproduction = BatchReproduction(self.config.reproduction_config,
+                                              neat.reporting.ReporterSet(),
+                                              neat.DefaultStagnation(self.config.stagnation_config,
+                                                                     neat.reporting.ReporterSet()))
+
+    def test_zero_rates_leave_attributes(self):
+        """With every attribute rate at zero nothing changes."""
+        genome_config = copy.copy(self.config.genome_config)
+        for name in ('weight', 'bias', 'response'):
+            setattr(genome_config, f'{name}_mutate_rate', 0.0)
+            setattr(genome_config, f'{name}_replace_rate', 0.0)
+        for name in ('enabled', 'activation', 'aggregation'):
+            setattr(genome_config, f'{name}_mutate_rate', 0.0)
+
+        genomes = make_genomes(self.config, 10)
+        before = copy.deepcopy(genomes)
+        self.reproduction.mutate_attributes(genomes, genome_config)
+        for old, new in zip(before, genomes):
+            self.assertEqual(old.distance(new, genome_config), 0.0)
+
+    def test_full_rate_perturbs_and_clamps(self):
+        """With weight_mutate_rate 1 every weight moves and stays within bounds."""
+        genome_config = copy.copy(self.config.genome_config)
+        genome_config.weight_mutate_rate = 1.0
+        genome_config.weight_mutate_power = 100.0
+
+        genomes = make_genomes(self.config, 10)
+        before = weights(genomes)
+        self.reproduction.mutate_attributes(genomes, genome_config)
+        after = weights(genomes)
+
+        self.assertTrue(all(a != b for a, b in zip(before, after)))
+        self.assertTrue(all(genome_config.weight_min_value <= w <= genome_config.weight_max_value for w in after))
+        self.assertTrue(all(isinstance(w, float) for w in after))
+
+    def test_string_attributes_come_from_options(self):
+        """Re-drawn activation functions are valid options."""
+        genome_config = copy.copy(self.config.genome_config)
+        genome_config.activation_mutate_rate = 1.0
+
+        genomes = make_genomes(self.config, 20)
+        self.reproduction.mutate_attributes(genomes, genome_config)
+        activations = {gene.activation for genome in genomes for gene in genome.nodes.values()}
+        self.assertTrue(activations <= set(genome_config.activation_options))
+        self.assertGreater(len(activations), 1)
+
+    def test_seeded_runs_match(self):
+        """Seeding the random module makes the batch mutation reproducible."""
+        results = []
+        for _ in range(2):
+            random.seed(11)
+            genomes = make_genomes(self.config, 5)
+            self.reproduction.mutate_attributes(genomes, self.config.genome_config)
+            results.append(weights(genomes))
+        self.assertEqual(results[0], results[1])
+
+    def test_mutate_structure_only_touches_structure(self):
+        """The structural pass leaves the weights of existing connections alone."""
+        genome_config = copy.copy(self.config.genome_config)
+        genome_config.node_add_prob = 0.0
+        genome_config.conn_delete_prob = 0.0
+        genome_config.node_delete_prob = 0.0
+        genome_config.conn_add_prob = 1.0
+
+        genome = make_genomes(self.config, 1)[0]
+        before = {key: gene.weight for key, gene in genome.connections.items()}
+        mutate_structure(genome, genome_config)
+        for key, weight in before.items():
+            self.assertEqual(genome.connections[key].weight, weight)
+
+    def test_population_evolves(self):
+        """A population runs several generations with the batch classes."""
+        population = neat.Population(self.config)
+        self.assertIsInstance(population.reproduction, BatchReproduction)
+
+        def evaluate(genomes, config):
+            for _, genome in genomes:
+                genome.fitness = sum(gene.weight for gene in genome.connections.values())
+
+        population.run(evaluate, 3)
+        self.assertEqual(population.generation, 3)
+        for genome in population.population.values():
+            self.assertIsInstance(genome, neat.DefaultGenome)
+            neat.nn.FeedForwardNetwork.create(genome, self.config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import time
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from scoreboard import Scoreboard, ScoreboardService
+
+class TestScoreboard(unittest.TestCase):
+    """Tests for the Scoreboard rankings."""
+
+    def setUp(self):
+        """Start every test from an empty scoreboard."""
+        Scoreboard.initialize()
+        self.koi = MagicMock()
+        self.koi.get_radius.return_value = 10
+
+    def tearDown(self):
+        """Leave the class-level state clean."""
+        Scoreboard.reset()
+
+    def _record(self, species_id, fitness, generation):
+        Scoreboard.record_species(species_id, self.koi, fitness, generation, config=None)
+
+    def test_top_species_by_fitness(self):
+        """Top species follow the latest recorded fitness of each species."""
+        self._record('1', 10, 0)
+        self._record('2', 30, 0)
+        self._record('3', 20, 1)
+        self._record('1', 40, 2)
+
+        top = Scoreboard.get_top_species(2)
+        self.assertEqual([species_id for species_id, _ in top], ['1', '2'])
+        self.assertEqual(top[0][1]['highest_fitness'], 40)
+        self.assertEqual(list(top[0][1]['generation_history']), [(0, 10), (2, 40)])
+
+    def test_alternative_rankings(self):
+        """Recent and longevity rankings order by generation data."""
+        self._record('1', 10, 0)
+        self._record('2', 30, 3)
+        self._record('1', 5, 5)
+        self._record('3', 50, 4)
+
+        recent = [species_id for species_id, _ in Scoreboard.get_top_species(3, ranking='recent')]
+        self.assertEqual(recent, ['1', '3', '2'])
+        longest = Scoreboard.get_top_species(1, ranking='longevity')
+        self.assertEqual(longest[0][0], '1')
+
+        with self.assertRaises(ValueError):
+            Scoreboard.get_top_species(1, ranking='unknown')
+
+    def test_pagination(self):
+        """Pages split the ranking and clamp out-of-range page numbers."""
+        for species_id in range(12):
+            self._record(str(species_id), species_id, 0)
+
+        page, page_count = Scoreboard.get_species_page(1, page_size=5)
+        self.assertEqual(page_count, 3)
+        self.assertEqual([species_id for species_id, _ in page], ['6', '5', '4', '3', '2'])
+
+        last_page, _ = Scoreboard.get_species_page(10, page_size=5)
+        self.assertEqual([species_id for species_id, _ in last_page], ['1', '0'])
+
+class TestScoreboardService(unittest.TestCase):
+    """Tests for the instance-based ScoreboardService."""
+
+    def setUp(self):
+        """Create an independent service."""
+        self.service = ScoreboardService()
+        self.koi = MagicMock()
+        self.koi.get_radius.return_value = 10
+
+    def test_instances_are_independent(self):
+        """Two services never share records."""
+        other = ScoreboardService()
+        self.service.record_species('1', self.koi, 10, 0)
+
+        self.assertEqual(len(self.service.get_records()), 1)
+        self.assertEqual(len(other.get_records()), 0)
+
+    def test_queued_submissions_apply_in_one_batch(self):
+        """Client submissions only become visible after drain()."""
+        client = self.service.client()
+        client.record_species('1', 15.0, 2, 20)
+        client.record_species('2', 25.0, 2, 20)
+        client.set_current_generation(3)
+
+        # multiprocessing queues hand items to a feeder thread, wait for them
+        deadline = time.monotonic() + 30
+        applied = self.service.drain()
+        while applied < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            applied += self.service.drain()
+
+        self.assertEqual(applied, 3)
+        self.assertEqual(self.service.get_current_generation(), 3)
+        self.assertEqual(self.service.get_top_species(1)[0][0], '2')
+
+    def test_snapshots_are_isolated(self):
+        """A snapshot keeps its view after later updates."""
+        self.service.record_species('1', self.koi, 10, 0)
+        snapshot = self.service.snapshot()
+        self.assertIs(self.service.snapshot(), snapshot)
+
+        self.service.record_species('1', self.koi, 30, 1)
+        self.service.record_species('2', self.koi, 20, 1)
+
+        self.assertEqual(len(snapshot.get_records()), 1)
+        self.assertEqual(snapshot.get_species_record('1')['highest_fitness'], 10)
+        self.assertEqual(snapshot.get_species_record('1')['generation_history'], ((0, 10),))
+        self.assertEqual(len(self.service.snapshot().get_records()), 2)
+
+    def test_snapshots_copy_only_changed_species(self):
+        """Unchanged records are shared between snapshots and histories are not copied."""
+        self.service.record_species('1', self.koi, 10, 0)
+        self.service.record_species('2', self.koi, 20, 0)
+        first = self.service.snapshot()
+
+        self.service.record_species('2', self.koi, 25, 1)
+        second = self.service.snapshot()
+        self.assertIs(second.get_species_record('1'), first.get_species_record('1'))
+        self.assertIsNot(second.get_species_record('2'), first.get_species_record('2'))
+        self.assertEqual(first.get_species_record('2')['generation_history'], ((0, 20),))
+        self.assertEqual(list(second.get_species_record('2')['generation_history']), [(0, 20), (1, 25)])
+        self.assertEqual(second.get_species_record('2')['generation_history'][-1], (1, 25))
+        self.assertEqual(second.get_top_species(1)[0][0], '2')
+
+        # A generation change alone keeps the records
+        self.service.set_current_generation(2)
+        third = self.service.snapshot()
+        self.assertIs(third.get_records(), second.get_records())
+        self.assertEqual(third.get_current_generation(), 2)
+
+    def test_reset_starts_empty_snapshots(self):
+        self.service.record_species('1', self.koi, 10, 0)
+        before = self.service.snapshot()
+        self.service.reset()
+        self.assertEqual(self.service.get_records(), {})
+        self.assertEqual(len(before.get_records()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
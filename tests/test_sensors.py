@@ -0,0 +1,94 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import math
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from sensors import VisionSensor, SensorConfig, load_sensor_config
+from spatial_index import SpatialHash
+
+def make_koi(position, heading=(1, 0), species_id=1):
+    return SimpleNamespace(
+        position=position,
+        last_position=(position[0] - heading[0], position[1] - heading[1]),
+        species_id=species_id
+    )
+
+class TestVisionSensor(unittest.TestCase):
+    """Tests for the VisionSensor class."""
+
+    def setUp(self):
+        """A sensor with the default 80 unit, 120 degree cone."""
+        self.sensor = VisionSensor()
+
+    def sense(self, koi_list, pads):
+        pad_index = SpatialHash(100)
+        pad_index.rebuild(pads)
+        koi_index = SpatialHash(100)
+        koi_index.rebuild(koi_list)
+        return self.sensor.sense(koi_list, pad_index, koi_index)
+
+    def test_cone_visibility(self):
+        """Only targets in front of the koi and within reach are seen."""
+        koi = make_koi((500, 500))
+        pads = [
+            SimpleNamespace(position=(540, 500)),   # Ahead, 40 away
+            SimpleNamespace(position=(520, 520)),   # 45 degrees left of the heading, visible
+            SimpleNamespace(position=(470, 500)),   # Behind
+            SimpleNamespace(position=(500, 560)),   # 90 degrees off the heading
+            SimpleNamespace(position=(600, 500)),   # Too far
+        ]
+        inputs = self.sense([koi], pads)[0]
+        self.assertAlmostEqual(inputs[0], 28.2842712 / 80, places=5)
+        self.assertAlmostEqual(inputs[1], 0.25, places=5)
+        self.assertAlmostEqual(inputs[2], 0.2)
+        self.assertEqual(list(inputs[3:]), [1.0, 0.0, 0.0])
+
+    def test_matches_per_pair_trigonometry(self):
+        """Batch results agree with the per-pair atan2 formulation."""
+        import random
+        rng = random.Random(4)
+        koi_list = [make_koi((rng.uniform(0, 400), rng.uniform(0, 400)),
+                             (rng.uniform(-1, 1), rng.uniform(-1, 1))) for _ in range(40)]
+        pads = [SimpleNamespace(position=(rng.uniform(0, 400), rng.uniform(0, 400))) for _ in range(200)]
+        inputs = self.sense(koi_list, pads)
+
+        for fish, row in zip(koi_list, inputs):
+            heading = math.degrees(math.atan2(fish.position[1] - fish.last_position[1],
+                                              fish.position[0] - fish.last_position[0]))
+            best = None
+            for pad in pads:
+                dx, dy = pad.position[0] - fish.position[0], pad.position[1] - fish.position[1]
+                distance = math.hypot(dx, dy)
+                difference = (math.degrees(math.atan2(dy, dx)) - heading + 180) % 360 - 180
+                if distance < 80 and abs(difference) <= 60 and (best is None or distance < best[0]):
+                    best = (distance, difference / 180)
+            if best is None:
+                self.assertEqual(row[0], 1.0)
+            else:
+                self.assertAlmostEqual(row[0], best[0] / 80, places=6)
+                self.assertAlmostEqual(row[1], best[1], places=6)
+
+    def test_input_mode_from_neat_config(self):
+        """The input mode is read from [KoiSensors] and checked against num_inputs."""
+        with tempfile.NamedTemporaryFile('w', suffix='.ini', delete=False) as f:
+            f.write("[NEAT]\n\n[KoiSensors]\ninput_mode = vision\nvision_angle = 90\n")
+        try:
+            config = load_sensor_config(f.name)
+            self.assertEqual(config.num_inputs, 26)
+            self.assertEqual(config.create_sensor().angle, 90)
+
+            neat_config = SimpleNamespace(genome_config=SimpleNamespace(num_inputs=20))
+            with self.assertRaises(ValueError):
+                load_sensor_config(f.name, neat_config)
+        finally:
+            os.unlink(f.name)
+        self.assertIsNone(SensorConfig().create_sensor())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from shared_state import SharedPondState
+
+class TestSharedPondState(unittest.TestCase):
+    """Tests for the SharedPondState class."""
+
+    def setUp(self):
+        """Create a small shared block and some koi-like objects."""
+        self.state = SharedPondState.create(max_koi=3, max_pads=4)
+        self.koi_list = [
+            SimpleNamespace(position=(10.0, 20.0), last_position=(9.0, 19.0), hunger=5.0,
+                            energy=98.0, species_id=2, highest_fitness=40.0,
+                            food_consumed=1, steps_taken=7)
+            for _ in range(3)
+        ]
+        self.pads = [SimpleNamespace(position=(i * 10, i * 20)) for i in range(4)]
+
+    def tearDown(self):
+        """Release the shared block."""
+        self.state.close()
+
+    def test_attach_sees_published_state(self):
+        """A second handle attached by name reads the same memory."""
+        self.state.load_koi(self.koi_list)
+        self.state.load_pads(self.pads)
+        self.state.set_step(12, generation=3)
+
+        other = SharedPondState.attach(self.state.name)
+        try:
+            self.assertEqual(other.max_koi, 3)
+            self.assertEqual(other.step, 12)
+            self.assertEqual(other.generation, 3)
+            self.assertEqual(len(other.koi_views()), 3)
+            self.assertEqual(other.koi_views()[0].position, (10.0, 20.0))
+            self.assertEqual(other.koi_views()[0].species_id, 2)
+            self.assertEqual([p.position for p in other.pad_views()][2], (20.0, 40.0))
+
+            # Writes from the attached handle are visible to the owner
+            other.koi[1, 0] = 55.0
+            self.assertEqual(self.state.koi_views()[1].position[0], 55.0)
+        finally:
+            other.close()
+
+    def test_alive_flags_follow_survivors(self):
+        """Dead koi and eaten pads disappear from the views."""
+        self.state.load_koi(self.koi_list)
+        self.state.load_pads(self.pads)
+
+        self.state.publish_koi(self.koi_list[1:])
+        self.state.publish_pads(self.pads[:2])
+
+        self.assertEqual(len(self.state.koi_views()), 2)
+        self.assertEqual(len(self.state.pad_views()), 2)
+
+    def test_apply_to_koi(self):
+        """Rows written by a worker are copied back onto the koi objects."""
+        self.state.load_koi(self.koi_list)
+        self.state.koi[0, 4] = 77.0  # hunger column
+
+        self.state.apply_to_koi(self.koi_list)
+
+        self.assertEqual(self.koi_list[0].hunger, 77.0)
+
+    def test_capacity_is_enforced(self):
+        """Loading more koi than reserved raises a clear error."""
+        with self.assertRaises(ValueError):
+            self.state.load_koi(self.koi_list * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import json
+import pickle
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from sim_params import SimParams, ConfigError
+
+class TestSimParams(unittest.TestCase):
+    """Tests for the SimParams class."""
+
+    def setUp(self):
+        """Minimal valid configuration."""
+        self.config = {
+            'environment_width': 800,
+            'environment_height': 600,
+            'detection_radius': 100
+        }
+
+    def test_defaults_and_attributes(self):
+        """Configured values and defaults are plain attributes."""
+        params = SimParams.from_config(dict(self.config, swimming_cost=0.2))
+        self.assertEqual(params.environment_width, 800)
+        self.assertEqual(params.swimming_cost, 0.2)
+        self.assertEqual(params.lily_pad_value, 30)
+        self.assertEqual(params.max_hunger, 200)
+
+    def test_read_only(self):
+        """Parameters cannot be changed once compiled."""
+        params = SimParams.from_config(self.config)
+        with self.assertRaises(AttributeError):
+            params.detection_radius = 5
+        self.assertEqual(params.replace(detection_radius=5).detection_radius, 5)
+        self.assertEqual(params.detection_radius, 100)
+
+    def test_unknown_key(self):
+        """Unknown keys are rejected with a suggestion."""
+        with self.assertRaises(ConfigError) as context:
+            SimParams.from_config(dict(self.config, detection_radiu=4))
+        self.assertIn("did you mean 'detection_radius'", str(context.exception))
+
+    def test_missing_key(self):
+        """Required keys must be present."""
+        del self.config['detection_radius']
+        with self.assertRaises(ConfigError) as context:
+            SimParams.from_config(self.config)
+        self.assertIn('detection_radius', str(context.exception))
+
+    def test_wrong_type(self):
+        """Values of the wrong type are rejected."""
+        with self.assertRaises(ConfigError):
+            SimParams.from_config(dict(self.config, num_lily_pads='many'))
+        with self.assertRaises(ConfigError):
+            SimParams.from_config(dict(self.config, max_speed=True))
+
+    def test_shipped_config_and_pickling(self):
+        """The shipped configuration is valid and survives pickling."""
+        path = os.path.join(os.path.dirname(__file__), '../config/simulation-config.json')
+        with open(path) as f:
+            params = SimParams.from_config(json.load(f))
+        self.assertEqual(pickle.loads(pickle.dumps(params)), params)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -88,7 +88,7 @@ class TestSimulation(unittest.TestCase):
 
     @patch('neat.Population')
     @patch('neat.StdOutReporter')
-    @patch('neat.StatisticsReporter')
+    @patch('simulation.StreamingStatisticsReporter')
     @patch('neat.Checkpointer')
     @patch('simulation.LilyPad')
     @patch('builtins.open', new_callable=mock_open)
@@ -117,12 +117,17 @@ class TestSimulation(unittest.TestCase):
             # Run the method
             sim.run()
             
-            # Verify Population was created with neat_config
-            mock_population.assert_called_once_with(self.neat_config)
+            # Verify Population was created with a copy of neat_config
+            mock_population.assert_called_once()
+            run_config = mock_population.call_args[0][0]
+            self.assertIsNot(run_config, self.neat_config)
+            self.assertEqual(run_config.species_set_type.__name__, 'DefaultSpeciesSet')
+            self.assertEqual(run_config.reproduction_type.__name__, 'DefaultReproduction')
             
             # Verify reporters were added
             mock_pop_instance.add_reporter.assert_any_call(mock_stdout_reporter.return_value)
             mock_pop_instance.add_reporter.assert_any_call(mock_stats_reporter.return_value)
+            mock_stats_reporter.assert_called_once_with(None, window=100)
             
             # Verify our custom checkpoint reporter was added (not the NEAT default)
             mock_pop_instance.add_reporter.assert_any_call(mock_reporter_instance)
@@ -133,6 +138,42 @@ class TestSimulation(unittest.TestCase):
             # Verify best genome was saved
             self.assertEqual(mock_pickle_dump.call_count, 1)
 
+    def test_generation_display_drains_scoreboard_submissions(self):
+        """Results queued by scoreboard clients are applied at the end of a generation."""
+        import time
+        sim = Simulation(self.neat_config, self.sim_config)
+        sim.scoreboard.client().record_species('7', 12.0, 1, 20)
+        
+        # multiprocessing queues hand items over through a feeder thread, so
+        # keep ending the generation until the record arrives
+        deadline = time.monotonic() + 30
+        sim.update_generation_display(2)
+        while sim.scoreboard.get_species_record('7') is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+            sim.update_generation_display(2)
+        self.assertEqual(sim.scoreboard.get_species_record('7')['highest_fitness'], 12.0)
+        self.assertEqual(sim.scoreboard.get_current_generation(), 2)
+
+    def test_build_neat_config_does_not_leak(self):
+        """Each run sets its classes on its own copy, so an earlier choice does not carry over."""
+        import neat
+        from config_cache import load_neat_config
+        neat_config = load_neat_config(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+        array_settings = dict(self.sim_config, speciation='array', reproduction='batch', genome='array')
+        default_settings = dict(self.sim_config, speciation='default', reproduction='default', genome='default')
+        
+        array_config = Simulation(neat_config, array_settings).build_neat_config()
+        default_config = Simulation(neat_config, default_settings).build_neat_config()
+        
+        self.assertEqual(array_config.genome_type.__name__, 'ArrayGenome')
+        self.assertIs(default_config.species_set_type, neat.DefaultSpeciesSet)
+        self.assertIs(default_config.reproduction_type, neat.DefaultReproduction)
+        self.assertIs(default_config.genome_type, neat.DefaultGenome)
+        self.assertIs(neat_config.genome_type, neat.DefaultGenome)
+        
+        with self.assertRaises(ValueError):
+            Simulation(neat_config, dict(self.sim_config, genome='graph')).build_neat_config()
+
     def test_evaluate_generation(self):
         """Test evaluate_generation method."""
         # Create mock koi fish
@@ -163,5 +204,56 @@ class TestSimulation(unittest.TestCase):
         # Check renderer call
         sim.renderer.set_generation.assert_called_once_with(1)
 
+
+class TestSimulationRun(unittest.TestCase):
+    """Headless runs of the real simulation."""
+
+    def setUp(self):
+        """Run in a temporary directory, since a run writes its outputs to the working directory."""
+        import tempfile
+        from config_cache import load_neat_config
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.neat_config = load_neat_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../config/neat-config.ini'))
+        self.neat_config.pop_size = 10
+        self.sim_config = {
+            'environment_width': 400,
+            'environment_height': 400,
+            'num_lily_pads': 10,
+            'detection_radius': 100,
+            'simulation_steps': 20,
+            'num_generations': 2,
+            'render': False,
+            'genome': 'array'
+        }
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def test_run_with_array_genomes(self):
+        """Evolution with ArrayGenome completes; per-run state is not stored on the genomes."""
+        from array_genome import ArrayGenome
+        random.seed(3)
+        winner = Simulation(self.neat_config, self.sim_config).run()
+        self.assertIsInstance(winner, ArrayGenome)
+        self.assertIsNotNone(winner.fitness)
+        self.assertTrue(os.path.exists('best_koi.pkl'))
+
+    def test_eval_genomes_with_array_genomes(self):
+        """Every genome gets a fitness from one evaluation."""
+        import neat
+        random.seed(3)
+        simulation = Simulation(self.neat_config, self.sim_config)
+        config = simulation.build_neat_config()
+        genomes = list(neat.Population(config).population.items())
+        try:
+            simulation.eval_genomes(genomes, config)
+        finally:
+            simulation.cleanup()
+        self.assertTrue(all(genome.fitness is not None for _, genome in genomes))
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,58 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import random
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from spatial_index import SpatialHash
+
+class TestSpatialHash(unittest.TestCase):
+    """Tests for the SpatialHash class."""
+
+    def setUp(self):
+        """Index a reproducible cloud of points."""
+        rng = random.Random(7)
+        self.items = [SimpleNamespace(position=(rng.uniform(-50, 1050), rng.uniform(-50, 1050))) for _ in range(300)]
+        self.index = SpatialHash(100)
+        self.index.rebuild(self.items)
+
+    def _brute_radius(self, position, radius):
+        return {
+            id(item) for item in self.items
+            if (item.position[0] - position[0]) ** 2 + (item.position[1] - position[1]) ** 2 < radius ** 2
+        }
+
+    def test_radius_query_matches_brute_force(self):
+        """Radius queries return exactly the items inside the circle."""
+        for position, radius in [((500, 500), 150), ((0, 0), 80), ((1000, 20), 260), ((333, 777), 5)]:
+            found = {id(item) for item in self.index.query_radius(position, radius)}
+            self.assertEqual(found, self._brute_radius(position, radius))
+
+    def test_rect_query(self):
+        """Rectangle queries return the items inside the rectangle."""
+        found = {id(item) for item in self.index.query_rect(100, 200, 450, 300)}
+        expected = {
+            id(item) for item in self.items
+            if 100 <= item.position[0] <= 450 and 200 <= item.position[1] <= 300
+        }
+        self.assertEqual(found, expected)
+        self.assertEqual(len(self.index.query_rect(-1e6, -1e6, 1e6, 1e6)), len(self.items))
+
+    def test_move_and_remove(self):
+        """Moved items are found at their new position, removed items nowhere."""
+        item = self.items[0]
+        old_position = item.position
+        item.position = (2000.0, 2000.0)
+        self.index.move(item, old_position)
+        self.assertIn(item, self.index.query_radius((2000, 2000), 1))
+
+        self.index.remove(item)
+        self.assertNotIn(item, self.index.query_radius((2000, 2000), 1))
+        self.assertEqual(len(self.index), len(self.items) - 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+import pickle
+import random
+import sys
+import os
+
+import neat
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+import speciation
+from speciation import ArraySpeciesSet, GenomeArrays, PackedGenomes, batch_distances
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+
+def make_population(config, count, mutations=5, seed=1):
+    """Create genomes with varied structure and weights."""
+    random.seed(seed)
+    population = {}
+    for key in range(1, count + 1):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+        population[key] = genome
+    return population
+
+
+class TestArraySpeciesSet(unittest.TestCase):
+    """Tests for the ArraySpeciesSet class and its distance kernel."""
+
+    def setUp(self):
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  CONFIG_PATH)
+        self.population = make_population(self.config, 40)
+
+    def make_species_set(self):
+        return ArraySpeciesSet(self.config.species_set_config, neat.reporting.ReporterSet())
+
+    def test_batch_distances_match_genome_distance(self):
+        """Every batched distance equals DefaultGenome.distance."""
+        genome_config = self.config.genome_config
+        codes = {}
+        gids = sorted(self.population)
+        packed = PackedGenomes([GenomeArrays(self.population[gid], codes) for gid in gids])
+        for rep_gid in gids[:5]:
+            rep = self.population[rep_gid]
+            distances = batch_distances(GenomeArrays(rep, codes), packed, genome_config)
+            for row, gid in enumerate(gids):
+                self.assertAlmostEqual(distances[row], rep.distance(self.population[gid], genome_config), places=9)
+
+    def test_row_mask(self):
+        """Rows outside the mask are NaN, the others are unchanged."""
+        genome_config = self.config.genome_config
+        codes = {}
+        gids = sorted(self.population)
+        packed = PackedGenomes([GenomeArrays(self.population[gid], codes) for gid in gids])
+        rep = GenomeArrays(self.population[gids[0]], codes)
+        full = batch_distances(rep, packed, genome_config)
+        rows = speciation.np.zeros(len(gids), dtype=bool)
+        rows[::3] = True
+        masked = batch_distances(rep, packed, genome_config, rows=rows)
+        self.assertTrue(speciation.np.isnan(masked[~rows]).all())
+        speciation.np.testing.assert_allclose(masked[rows], full[rows])
+
+    def test_speciate_assigns_every_genome(self):
+        """Every genome gets a species, within the threshold of its representative."""
+        species_set = self.make_species_set()
+        species_set.speciate(self.config, self.population, 0)
+
+        self.assertEqual(set(species_set.genome_to_species), set(self.population))
+        threshold = self.config.species_set_config.compatibility_threshold
+        genome_config = self.config.genome_config
+        for species in species_set.species.values():
+            for genome in species.members.values():
+                if genome is not species.representative:
+                    self.assertLess(species.representative.distance(genome, genome_config), threshold)
+
+    def test_matches_default_species_set_count(self):
+        """The same population is split into as many species as DefaultSpeciesSet makes."""
+        ours = self.make_species_set()
+        ours.speciate(self.config, self.population, 0)
+        reference = neat.DefaultSpeciesSet(self.config.species_set_config, neat.reporting.ReporterSet())
+        reference.speciate(self.config, self.population, 0)
+        self.assertEqual(len(ours.species), len(reference.species))
+
+    def test_unchanged_pairs_are_cached(self):
+        """Speciating the same genomes again computes no new distances."""
+        species_set = self.make_species_set()
+        species_set.speciate(self.config, self.population, 0)
+
+        with patch('speciation.batch_distances', wraps=batch_distances) as mock_batch:
+            species_set.speciate(self.config, self.population, 1)
+            mock_batch.assert_not_called()
+
+    def test_cache_forgets_removed_genomes(self):
+        """Genomes that left the population are dropped from the caches."""
+        species_set = self.make_species_set()
+        species_set.speciate(self.config, self.population, 0)
+
+        representatives = {s.representative.key for s in species_set.species.values()}
+        survivors = {gid: genome for gid, genome in self.population.items() if gid <= 20 or gid in representatives}
+        species_set.speciate(self.config, survivors, 1)
+
+        alive = set(survivors) | representatives
+        self.assertTrue(set(species_set._encodings) <= alive)
+        for rep_key, row in species_set._distances.items():
+            self.assertIn(rep_key, alive)
+            self.assertTrue(set(row) <= alive)
+
+    def test_pickle_drops_caches(self):
+        """Checkpoints do not carry the distance caches."""
+        species_set = self.make_species_set()
+        species_set.speciate(self.config, self.population, 0)
+
+        restored = pickle.loads(pickle.dumps(species_set))
+        self.assertEqual(restored._distances, {})
+        self.assertEqual(restored._encodings, {})
+        self.assertEqual(set(restored.genome_to_species), set(self.population))
+
+
+if __name__ == '__main__':
+    unittest.main()
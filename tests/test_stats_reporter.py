@@ -0,0 +1,134 @@
+import unittest
+import copy
+import random
+import shutil
+import tempfile
+import sys
+import os
+
+import neat
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from stats_reporter import StreamingStatisticsReporter
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+
+def evaluate(genomes, config):
+    for _, genome in genomes:
+        genome.fitness = sum(connection.weight for connection in genome.connections.values())
+
+
+class TestStreamingStatisticsReporter(unittest.TestCase):
+    """Tests for the StreamingStatisticsReporter class."""
+
+    def setUp(self):
+        random.seed(8)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  CONFIG_PATH)
+        self.config.pop_size = 30
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'statistics.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def evolve(self, reporters, generations=12):
+        population = neat.Population(self.config)
+        for reporter in reporters:
+            population.add_reporter(reporter)
+        population.run(evaluate, generations)
+        return population
+
+    def test_matches_neat_statistics_reporter(self):
+        """Queries answer what neat's reporter does, though only a window is in memory."""
+        reference = neat.StatisticsReporter()
+        streaming = StreamingStatisticsReporter(self.path, window=3, keep_best=4)
+        self.evolve([reference, streaming])
+
+        self.assertEqual(len(streaming._recent), 3)
+        self.assertEqual(streaming.get_fitness_mean(), reference.get_fitness_mean())
+        self.assertEqual(streaming.get_fitness_stdev(), reference.get_fitness_stdev())
+        self.assertEqual(streaming.get_fitness_median(), reference.get_fitness_median())
+        self.assertEqual(streaming.get_fitness_best(), [g.fitness for g in reference.most_fit_genomes])
+        self.assertEqual(streaming.get_species_sizes(), reference.get_species_sizes())
+        # neat's get_species_fitness averages genome keys, so compare with its raw data
+        species_ids = range(1, len(reference.get_species_sizes()[0]) + 1)
+        expected = [[sum(stats[sid].values()) / len(stats[sid]) if stats.get(sid) else 'NA' for sid in species_ids]
+                    for stats in reference.generation_statistics]
+        for row, expected_row in zip(streaming.get_species_fitness('NA'), expected):
+            for value, expected_value in zip(row, expected_row):
+                if expected_value == 'NA':
+                    self.assertEqual(value, 'NA')
+                else:
+                    self.assertAlmostEqual(value, expected_value)
+
+        self.assertEqual(streaming.best_genome().fitness, reference.best_genome().fitness)
+        self.assertEqual([g.fitness for g in streaming.best_genomes(4)],
+                         [g.fitness for g in reference.best_genomes(4)])
+        self.assertLessEqual(len(streaming.best_unique_genomes(10)), 4)
+
+        # Queries still work after the file is closed
+        streaming.close()
+        self.assertEqual(streaming.get_fitness_mean(), reference.get_fitness_mean())
+
+    def test_save_writes_the_same_files(self):
+        """save() produces neat's fitness and speciation CSV files."""
+        reference = neat.StatisticsReporter()
+        streaming = StreamingStatisticsReporter(self.path, window=2)
+        self.evolve([reference, streaming], generations=5)
+
+        outputs = {}
+        for name, reporter in (('reference', reference), ('streaming', streaming)):
+            directory = os.path.join(self.temp_dir, name)
+            os.mkdir(directory)
+            previous = os.getcwd()
+            os.chdir(directory)
+            try:
+                reporter.save()
+            finally:
+                os.chdir(previous)
+            outputs[name] = {}
+            for filename in ('fitness_history.csv', 'speciation.csv'):
+                with open(os.path.join(directory, filename)) as f:
+                    outputs[name][filename] = f.read()
+        self.assertEqual(outputs['streaming'], outputs['reference'])
+
+    def test_append_continues_the_file(self):
+        """A reporter opened with append keeps the earlier generations."""
+        first = StreamingStatisticsReporter(self.path, window=2)
+        self.evolve([first], generations=4)
+        first.close()
+
+        second = StreamingStatisticsReporter(self.path, window=2, append=True)
+        self.evolve([second], generations=3)
+        self.assertEqual(len(second.get_fitness_mean()), 7)
+        self.assertEqual(second.get_fitness_mean()[:4], first.get_fitness_mean())
+
+        fresh = StreamingStatisticsReporter(self.path, window=2)
+        self.assertEqual(fresh.get_fitness_mean(), [])
+
+    def test_checkpoint_copies_leave_the_file_open(self):
+        """Deep copies (made for checkpoints) answer queries without the file handle."""
+        reporter = StreamingStatisticsReporter(self.path, window=2)
+        population = self.evolve([reporter], generations=4)
+        duplicate = copy.deepcopy(population.species)
+        self.assertEqual(duplicate.reporters.reporters[-1].get_fitness_mean(), reporter.get_fitness_mean())
+
+        self.evolve([reporter], generations=1)
+        self.assertEqual(len(reporter.get_fitness_mean()), 5)
+
+    def test_without_file_only_the_window_remains(self):
+        """With no path the reporter answers for the generations in its window."""
+        reporter = StreamingStatisticsReporter(None, window=3)
+        self.evolve([reporter], generations=6)
+        records = list(reporter.records())
+        self.assertEqual([record['generation'] for record in records], [3, 4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import configparser
+import json
+import random
+import shutil
+import tempfile
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from sweep import expand_spec, make_jobs, run_sweep, load_results, format_summary
+from sim_params import ConfigError
+
+NEAT_CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+SIM_CONFIG = {
+    'environment_width': 300,
+    'environment_height': 300,
+    'num_lily_pads': 10,
+    'simulation_steps': 20,
+    'detection_radius': 100,
+    'num_generations': 2,
+    'render': True,  # Switched off by the sweep
+    'shared_memory': True,  # Likewise
+    'history_file': None,
+}
+
+
+class TestSweep(unittest.TestCase):
+    """Tests for the parameter sweep runner."""
+
+    def setUp(self):
+        random.seed(6)
+        self.temp_dir = tempfile.mkdtemp()
+        self.sweep_dir = os.path.join(self.temp_dir, 'sweep')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_grid_and_random_expansion(self):
+        """Grids take every combination; random sweeps draw reproducibly within bounds."""
+        grid = expand_spec({'parameters': {'a': [1, 2], 'NEAT.pop_size': [10, 20, 30]}})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({'a': 2, 'NEAT.pop_size': 30}, grid)
+
+        spec = {'mode': 'random', 'samples': 25, 'seed': 3, 'parameters': {
+            'rate': {'uniform': [0.1, 0.5]},
+            'scale': {'log_uniform': [0.01, 1.0]},
+            'count': {'int': [1, 3]},
+            'choice': ['x', 'y'],
+        }}
+        samples = expand_spec(spec)
+        self.assertEqual(samples, expand_spec(spec))
+        self.assertEqual(len(samples), 25)
+        for sample in samples:
+            self.assertTrue(0.1 <= sample['rate'] <= 0.5)
+            self.assertTrue(0.01 <= sample['scale'] <= 1.0)
+            self.assertIn(sample['count'], (1, 2, 3))
+            self.assertIn(sample['choice'], ('x', 'y'))
+
+        with self.assertRaises(ValueError):
+            expand_spec({'parameters': {'rate': {'uniform': [0, 1]}}})
+        with self.assertRaises(ValueError):
+            expand_spec({'mode': 'random', 'parameters': {'rate': {'normal': [0, 1]}}})
+        with self.assertRaises(ValueError):
+            expand_spec({'mode': 'annealing', 'parameters': {}})
+
+    def test_jobs_are_validated_up_front(self):
+        """Unknown settings are rejected before any job runs; repeats get their own seeds."""
+        jobs = make_jobs({'repeats': 2, 'seed': 5, 'parameters': {'NEAT.pop_size': [8], 'num_lily_pads': [4]}},
+                         SIM_CONFIG, NEAT_CONFIG_PATH)
+        self.assertEqual([job['seed'] for job in jobs], [5, 6])
+        self.assertEqual(len({job['id'] for job in jobs}), 2)
+        self.assertEqual(jobs[0]['sim_config']['num_lily_pads'], 4)
+        self.assertFalse(jobs[0]['sim_config']['render'])
+        self.assertFalse(jobs[0]['sim_config']['shared_memory'])
+        self.assertEqual(jobs[0]['neat_settings'], {'NEAT.pop_size': 8})
+
+        with self.assertRaises(ValueError):
+            make_jobs({'parameters': {'NEAT.pop_sise': [8]}}, SIM_CONFIG, NEAT_CONFIG_PATH)
+        with self.assertRaises(ConfigError):
+            make_jobs({'parameters': {'num_lily_padz': [8]}}, SIM_CONFIG, NEAT_CONFIG_PATH)
+
+    def test_sweep_runs_and_resumes(self):
+        """Jobs write their own files; a second run skips completed jobs."""
+        spec = {'parameters': {'NEAT.pop_size': [6, 8], 'num_lily_pads': [5]}}
+        rows = run_sweep(spec, self.sweep_dir, SIM_CONFIG, NEAT_CONFIG_PATH, workers=1)
+
+        self.assertEqual(len(rows), 2)
+        for row in rows:
+            self.assertEqual((row['runs'], row['failed'], row['mean_generations']), (1, 0, 2))
+        self.assertGreaterEqual(rows[0]['mean_best_fitness'], rows[1]['mean_best_fitness'])
+        self.assertTrue(os.path.exists(os.path.join(self.sweep_dir, 'summary.csv')))
+        self.assertIn('mean_best_fitness', format_summary(rows))
+
+        results = load_results(os.path.join(self.sweep_dir, 'results.jsonl'))
+        for job_id in results:
+            job_dir = os.path.join(self.sweep_dir, 'jobs', job_id)
+            self.assertTrue(os.path.exists(os.path.join(job_dir, 'best_koi.pkl')))
+            parser = configparser.ConfigParser()
+            parser.read(os.path.join(job_dir, 'neat-config.ini'))
+            self.assertEqual(parser.getint('NEAT', 'pop_size'), results[job_id]['params']['NEAT.pop_size'])
+
+        with open(os.path.join(self.sweep_dir, 'results.jsonl')) as f:
+            lines = len(f.readlines())
+        self.assertEqual(run_sweep(spec, self.sweep_dir, SIM_CONFIG, NEAT_CONFIG_PATH, workers=1), rows)
+        with open(os.path.join(self.sweep_dir, 'results.jsonl')) as f:
+            self.assertEqual(len(f.readlines()), lines)
+
+    def test_failed_jobs_are_retried_and_reported(self):
+        """A job that cannot run is retried, recorded as failed and kept out of the means."""
+        spec = {'parameters': {'NEAT.pop_size': [6, 'many']}}
+        rows = run_sweep(spec, self.sweep_dir, SIM_CONFIG, NEAT_CONFIG_PATH, workers=1, retries=1)
+
+        with open(os.path.join(self.sweep_dir, 'results.jsonl')) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['status'] for record in records], ['ok', 'failed', 'failed'])
+        failed = next(row for row in rows if row['NEAT.pop_size'] == 'many')
+        self.assertEqual((failed['runs'], failed['failed'], failed['mean_best_fitness']), (0, 1, None))
+        self.assertEqual(rows[-1], failed)
+
+    def test_process_pool(self):
+        """Jobs also run in worker processes."""
+        rows = run_sweep({'parameters': {'num_lily_pads': [4, 8]}, 'fixed': {'NEAT.pop_size': 6}},
+                         self.sweep_dir, SIM_CONFIG, NEAT_CONFIG_PATH, workers=2)
+        self.assertEqual(sorted(row['num_lily_pads'] for row in rows), [4, 8])
+        self.assertTrue(all(row['runs'] == 1 for row in rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import tempfile
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from telemetry import TrajectoryRecorder, list_chunks, load_chunk, EVENT_PAD_CONSUMED, EVENT_PAD_SPAWNED
+
+class TestTrajectoryRecorder(unittest.TestCase):
+    """Tests for the TrajectoryRecorder class."""
+
+    def setUp(self):
+        """Create a recorder writing to a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.recorder = TrajectoryRecorder(self.temp_dir.name, chunk_steps=2)
+        self.koi_list = [
+            SimpleNamespace(genome=SimpleNamespace(key=key), species_id=1, position=(key, 2 * key),
+                            hunger=3.0, energy=99.0, last_outputs=[0.1, 0.2, 0.3, 0.4, 0.5],
+                            eaten_lily_pads=[])
+            for key in (4, 5)
+        ]
+
+    def tearDown(self):
+        """Stop the writer and remove the directory."""
+        self.recorder.close()
+        self.temp_dir.cleanup()
+
+    def test_chunks_hold_steps_and_events(self):
+        """Steps are split into chunks with trajectory rows and pad events."""
+        pads = [SimpleNamespace(position=(7, 8))]
+        self.recorder.begin_generation(3, self.koi_list)
+        self.recorder.record_spawn(0, pads)
+        for step in range(3):
+            if step == 1:
+                self.koi_list[1].eaten_lily_pads.append(pads[0])
+            self.recorder.record_step(step, self.koi_list)
+        self.recorder.close()
+
+        chunks = list_chunks(self.temp_dir.name)
+        self.assertEqual([(generation, chunk) for generation, chunk, _ in chunks], [(3, 0), (3, 1)])
+
+        first = load_chunk(chunks[0][2])
+        self.assertEqual(list(first['step']), [0, 0, 1, 1])
+        self.assertEqual(list(first['koi_id']), [4, 5, 4, 5])
+        self.assertAlmostEqual(float(first['outputs'][0, 4]), 0.5, places=5)
+        self.assertEqual(list(first['event_kind']), [EVENT_PAD_SPAWNED, EVENT_PAD_CONSUMED])
+        self.assertEqual(list(first['event_koi_id']), [-1, 5])
+        self.assertEqual(self.koi_list[1].eaten_lily_pads, [])
+
+        second = load_chunk(chunks[1][2])
+        self.assertEqual(list(second['step']), [2, 2])
+        self.assertEqual(len(second['event_step']), 0)
+
+if __name__ == '__main__':
+    unittest.main()
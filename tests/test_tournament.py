@@ -0,0 +1,127 @@
+import unittest
+import copy
+import json
+import pickle
+import random
+import shutil
+import tempfile
+import sys
+import os
+
+import neat
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from tournament import (run_tournament, play_match, genome_hash, confidence_interval,
+                        headless_config, format_report)
+
+CONFIG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/neat-config.ini'))
+
+SIM_CONFIG = {
+    'environment_width': 400,
+    'environment_height': 400,
+    'num_lily_pads': 15,
+    'simulation_steps': 60,
+    'detection_radius': 100,
+    'render': True,  # Switched off by the tournament
+    'history_file': 'never_written.koih',
+}
+
+
+class TestTournament(unittest.TestCase):
+    """Tests for the tournament harness."""
+
+    def setUp(self):
+        random.seed(2)
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  CONFIG_PATH)
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'cache.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def save_genome(self, key):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(self.config.genome_config)
+        for _ in range(20):
+            genome.mutate(self.config.genome_config)
+        path = os.path.join(self.temp_dir, f'genome-{key}.pkl')
+        with open(path, 'wb') as f:
+            pickle.dump(genome, f)
+        return path, genome
+
+    def cached_matches(self):
+        with open(self.cache_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_matches_are_reproducible(self):
+        """A seed fixes the pond, so replaying a match gives the same scores."""
+        _, genome = self.save_genome(1)
+        sim_config = headless_config(SIM_CONFIG)
+        first = play_match(genome, self.config, sim_config, 3, copies=2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(play_match(genome, self.config, sim_config, 3, copies=2), first)
+
+    def test_genome_hash_ignores_key_and_fitness(self):
+        """Copies of a genome share a hash; a changed weight does not."""
+        _, genome = self.save_genome(1)
+        duplicate = copy.deepcopy(genome)
+        duplicate.key, duplicate.fitness = 99, 12.0
+        self.assertEqual(genome_hash(genome, self.config), genome_hash(duplicate, self.config))
+
+        connection = next(c for c in duplicate.connections.values() if c.enabled)
+        connection.weight += 1.0
+        self.assertNotEqual(genome_hash(genome, self.config), genome_hash(duplicate, self.config))
+
+    def test_results_are_cached_per_genome_and_seed(self):
+        """Re-runs play nothing; a new entrant plays only its own matches."""
+        first_path, _ = self.save_genome(1)
+        second_path, _ = self.save_genome(2)
+
+        rows = run_tournament([first_path, second_path], SIM_CONFIG, range(3), copies=2, workers=1,
+                              cache_path=self.cache_path, neat_config_path=CONFIG_PATH)
+        self.assertEqual(len(self.cached_matches()), 6)
+        self.assertEqual([row['rank'] for row in rows], [1, 2])
+        self.assertGreaterEqual(rows[0]['mean'], rows[1]['mean'])
+        for row in rows:
+            self.assertEqual(row['matches'], 3)
+            self.assertLessEqual(row['ci_low'], row['mean'])
+            self.assertGreaterEqual(row['ci_high'], row['mean'])
+        self.assertIn('genome-1.pkl', format_report(rows))
+        self.assertFalse(os.path.exists('never_written.koih'))
+
+        again = run_tournament([first_path, second_path], SIM_CONFIG, range(3), copies=2, workers=1,
+                               cache_path=self.cache_path, neat_config_path=CONFIG_PATH)
+        self.assertEqual(again, rows)
+        self.assertEqual(len(self.cached_matches()), 6)
+
+        third_path, _ = self.save_genome(3)
+        run_tournament([first_path, second_path, third_path], SIM_CONFIG, range(3), copies=2, workers=1,
+                       cache_path=self.cache_path, neat_config_path=CONFIG_PATH)
+        self.assertEqual(len(self.cached_matches()), 9)
+
+    def test_process_pool_matches_in_process_results(self):
+        """Matches played by worker processes score the same as in-process ones."""
+        path, _ = self.save_genome(1)
+        pooled = run_tournament([path], SIM_CONFIG, range(2), copies=2, workers=2,
+                                cache_path=None, neat_config_path=CONFIG_PATH)
+        local = run_tournament([path], SIM_CONFIG, range(2), copies=2, workers=1,
+                               cache_path=None, neat_config_path=CONFIG_PATH)
+        self.assertEqual(pooled, local)
+
+    def test_confidence_interval(self):
+        """The interval is the t interval of the mean."""
+        mean, stdev, low, high = confidence_interval([1.0, 2.0, 3.0])
+        self.assertEqual(mean, 2.0)
+        self.assertEqual(stdev, 1.0)
+        self.assertAlmostEqual(high - mean, 4.303 / 3 ** 0.5)
+        self.assertAlmostEqual(mean - low, high - mean)
+        self.assertEqual(confidence_interval([5.0]), (5.0, 0.0, 5.0, 5.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
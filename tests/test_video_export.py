@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Draw without a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pygame
+
+# Import the module under test
+from video_export import FrameExporter
+from renderer import Renderer
+from replay import ReplayKoi, ReplayLilyPad
+
+
+def list_frames(directory, generation):
+    return sorted(os.listdir(os.path.join(directory, f'gen{generation:05d}')))
+
+
+class TestFrameExporter(unittest.TestCase):
+    """Tests for the FrameExporter class."""
+
+    def setUp(self):
+        """Create a temporary directory for the frames."""
+        pygame.init()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.surface = pygame.Surface((40, 30))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stride_and_generations(self):
+        """Every stride-th frame is written, numbered from zero within each generation."""
+        exporter = FrameExporter(self.temp_dir.name, stride=3)
+        for _ in range(7):
+            exporter.submit(self.surface, generation=1)
+        for _ in range(2):
+            exporter.submit(self.surface, generation=2)
+        exporter.close()
+
+        self.assertEqual(exporter.frames_seen, 9)
+        self.assertEqual(exporter.frames_written, 4)
+        self.assertEqual(list_frames(self.temp_dir.name, 1), ['frame000000.png', 'frame000001.png', 'frame000002.png'])
+        self.assertEqual(list_frames(self.temp_dir.name, 2), ['frame000000.png'])
+
+    def test_frames_are_rescaled(self):
+        exporter = FrameExporter(self.temp_dir.name, size=(20, 15))
+        exporter.submit(self.surface)
+        exporter.close()
+        image = pygame.image.load(os.path.join(self.temp_dir.name, 'gen00000', 'frame000000.png'))
+        self.assertEqual(image.get_size(), (20, 15))
+
+    def test_close_drains_the_queue_and_stops_the_encoder(self):
+        """Frames still queued when close is called are written before the thread exits."""
+        exporter = FrameExporter(self.temp_dir.name, max_pending=2)
+        for _ in range(6):
+            exporter.submit(self.surface)
+        exporter.close()
+        self.assertFalse(exporter._writer.is_alive())
+        self.assertEqual(exporter.frames_written, 6)
+        self.assertEqual(len(list_frames(self.temp_dir.name, 0)), 6)
+        exporter.close()  # Closing twice is harmless
+
+    def test_encoder_errors_are_raised(self):
+        """A failed write stops later submissions."""
+        # A directory in the way of the first frame
+        os.makedirs(os.path.join(self.temp_dir.name, 'gen00000', 'frame000000.png'))
+        exporter = FrameExporter(self.temp_dir.name)
+        exporter.submit(self.surface)
+        exporter._queue.join()
+        with self.assertRaises(RuntimeError):
+            exporter.submit(self.surface)
+        exporter.close()
+
+
+class TestOffscreenRenderer(unittest.TestCase):
+    """The renderer's offscreen path, feeding a FrameExporter."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_offscreen_frames_are_exported(self):
+        """Offscreen frames include the scoreboard and reach the exporter at the requested stride."""
+        exporter = FrameExporter(self.temp_dir.name, stride=2)
+        renderer = Renderer(200, offscreen=True, frame_sink=exporter)
+        renderer.set_generation(4)
+        koi = [ReplayKoi((50.0, 60.0), (48.0, 60.0), 1, 10.0, 90.0)]
+        lily_pads = [ReplayLilyPad((120.0, 80.0))]
+        try:
+            for _ in range(5):
+                self.assertTrue(renderer.render(koi, lily_pads))
+        finally:
+            exporter.close()
+
+        self.assertEqual(renderer.screen.get_size(), (200 + renderer.scoreboard_width, 200))
+        self.assertEqual(list_frames(self.temp_dir.name, 4), ['frame000000.png', 'frame000001.png', 'frame000002.png'])
+        image = pygame.image.load(os.path.join(self.temp_dir.name, 'gen00004', 'frame000000.png'))
+        self.assertEqual(image.get_size(), renderer.screen.get_size())
+
+
+if __name__ == '__main__':
+    unittest.main()
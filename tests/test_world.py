@@ -0,0 +1,121 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import random
+
+# Add the src directory to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+# Import the module under test
+from world import TiledWorld
+
+def make_pad(x, y):
+    return SimpleNamespace(position=(x, y))
+
+class TestTiledWorld(unittest.TestCase):
+    """Tests for the TiledWorld class."""
+
+    def test_eager_spawn_fills_the_pond(self):
+        """Eager worlds place every pad up front in the chunk under it."""
+        world = TiledWorld(1000, 800, 100)
+        pads = world.spawn_pads(50, rng=random.Random(1), pad_factory=make_pad)
+        self.assertEqual(len(pads), 50)
+        self.assertEqual(len(world.pads), 50)
+        for pad in pads:
+            self.assertIn(pad, world.pads.cell(world.chunk_at(pad.position).key))
+
+        koi = SimpleNamespace(position=(500, 400))
+        world.place_koi([koi])
+        self.assertEqual(world.activate(0), [])
+        self.assertEqual(world.chunk_at(koi.position).last_active_step, 0)
+
+    def test_lazy_chunks_generate_on_first_visit(self):
+        """Lazy worlds only create pads around koi, reproducibly per chunk."""
+        world = TiledWorld(100000, 100000, 200, lazy=True)
+        self.assertEqual(world.spawn_pads(1000000, rng=random.Random(3), pad_factory=make_pad), [])
+
+        koi = SimpleNamespace(position=(50000, 50000))
+        world.place_koi([koi])
+        created = world.activate(0)
+        self.assertEqual(len(world.active_keys()), 9)
+        self.assertEqual(len(created), 36)  # 9 chunks of 40000 square units, 4 pads each
+        self.assertEqual(world.activate(1), [])
+
+        # Same seed, different approach path: the shared chunk has the same pads
+        other = TiledWorld(100000, 100000, 200, lazy=True)
+        other.spawn_pads(1000000, rng=random.Random(3), pad_factory=make_pad)
+        other.place_koi([SimpleNamespace(position=(50400, 50000))])
+        other.activate(0)
+        key = (251, 250)  # Seen by both koi
+        self.assertEqual(
+            sorted(pad.position for pad in world.pads.cell(key)),
+            sorted(pad.position for pad in other.pads.cell(key))
+        )
+
+    def test_partition_balances_koi_in_bands(self):
+        """Active chunks are split into contiguous bands with similar koi counts."""
+        world = TiledWorld(2000, 2000, 100, halo=0)
+        rng = random.Random(5)
+        world.place_koi([SimpleNamespace(position=(rng.uniform(0, 2000), rng.uniform(0, 2000))) for _ in range(400)])
+
+        shards = world.partition(4)
+        self.assertEqual(len(shards), 4)
+        self.assertEqual(sorted(key for shard in shards for key in shard), sorted(world.active_keys()))
+        loads = [sum(len(world.koi.cell(key)) for key in shard) for shard in shards]
+        self.assertTrue(max(loads) - min(loads) < 60)
+        for first, second in zip(shards, shards[1:]):
+            self.assertLessEqual(max(first), min(second))
+
+    def test_halo_keys_surround_a_band(self):
+        """The halo is every chunk within reach of the band that the band does not own."""
+        world = TiledWorld(1000, 1000, 100, halo=150)  # Reaches two chunks
+        band = [(3, 3), (3, 4)]
+        halo = world.halo_keys(band)
+        expected = {(x, y) for x in range(1, 6) for y in range(1, 7)} - set(band)
+        self.assertEqual(halo, expected)
+
+        # Without a halo koi see only their own chunk
+        self.assertEqual(TiledWorld(1000, 1000, 100, halo=0).halo_keys(band), set())
+
+    def test_lazy_pad_count_is_split_up_front(self):
+        """Every chunk's share is fixed in advance, so any visiting order yields the same pads in total."""
+        def visit(positions):
+            world = TiledWorld(1050, 730, 100, halo=0, lazy=True)
+            world.spawn_pads(37, rng=random.Random(9), pad_factory=make_pad)
+            koi = SimpleNamespace(position=positions[0])
+            world.place_koi([koi])
+            for step, position in enumerate(positions):
+                old_position, koi.position = koi.position, position
+                world.move_koi(koi, old_position)
+                world.activate(step)
+            return {key: sorted(pad.position for pad in world.pads.cell(key)) for key in world.chunks}
+
+        positions = [(x * 100 + 50, y * 100 + 50) for y in range(8) for x in range(11)]
+        forward = visit(positions)
+        backward = visit(positions[::-1])
+        self.assertEqual(forward, backward)
+        self.assertEqual(sum(len(pads) for pads in forward.values()), 37)
+
+    def test_only_newly_active_chunks_are_checked(self):
+        """Chunks that stay active are skipped; chunks that come back are checked again."""
+        world = TiledWorld(1000, 1000, 100, halo=0, lazy=True)
+        world.spawn_pads(100, rng=random.Random(2), pad_factory=make_pad)
+        koi = SimpleNamespace(position=(150, 150))
+        world.place_koi([koi])
+
+        self.assertEqual(len(world.activate(0)), len(world.pads.cell((1, 1))))
+        checked = []
+        world._generate_chunk = lambda chunk: checked.append(chunk.key) or []
+        world.activate(1)
+        self.assertEqual(checked, [])
+        self.assertEqual(world.chunk((1, 1)).last_active_step, 1)
+
+        old_position, koi.position = koi.position, (250, 150)
+        world.move_koi(koi, old_position)
+        world.activate(2)
+        self.assertEqual(checked, [(2, 1)])
+        self.assertEqual(world.chunk((1, 1)).last_active_step, 1)
+
+if __name__ == '__main__':
+    unittest.main()